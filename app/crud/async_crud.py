@@ -0,0 +1,131 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import crud
+from app.schemas import schemas
+from app.utils.filters import MaintenanceFilters
+from app.utils.fieldsets import Fieldset
+from app.utils.serialization import attach_children, attach_parent, records
+
+# Async twins of crud.py. Reads run the same statement builders on the async session;
+# writes reuse the sync functions through run_sync so rollup/cache upkeep stays in one place.
+# The *_rows readers return response-shaped dicts for the JSON fast path.
+
+async def _records(db: AsyncSession, stmt) -> list:
+    return records(await db.execute(stmt))
+
+async def _resource_rows(db: AsyncSession, name: str, stmt, fieldset: Fieldset = None) -> list:
+    # One projected statement for the page, then one IN query per requested relation
+    resource = crud.RESOURCES[name]
+    fieldset = fieldset or Fieldset(include=resource.default_include)
+    fields, hidden = fieldset.fields, set()
+    if fields is not None:
+        # Join keys of to-one relations are read even when not asked for, then dropped
+        hidden = {resource.relations[r].key for r in fieldset.include} - fields
+        fields = fields | hidden
+    rows = await _records(db, crud.as_columns(stmt, resource.schema, fields))
+    for include in fieldset.include:
+        relation = resource.relations[include]
+        keys = list({row[relation.key] for row in rows if row[relation.key] is not None})
+        related = await _records(db, crud.relation_query(relation, keys)) if keys else []
+        (attach_children if relation.many else attach_parent)(rows, relation.key, include, related)
+    for row in rows:
+        for key in hidden:
+            del row[key]
+    return rows
+
+# -----------------------------
+# Sites
+# -----------------------------
+
+async def get_sites(db: AsyncSession, limit: int = None, after: str = None):
+    return (await db.scalars(crud.sites_query(limit, after))).all()
+
+async def get_site_rows(db: AsyncSession, limit: int = None, after: str = None, fieldset: Fieldset = None):
+    return await _resource_rows(db, "site", crud.sites_query(limit, after), fieldset)
+
+async def create_site(db: AsyncSession, site: schemas.SiteCreate):
+    return await db.run_sync(crud.create_site, site)
+
+# -----------------------------
+# Turbines
+# -----------------------------
+
+async def get_turbines(db: AsyncSession, site_id: str = None, limit: int = None, after: str = None):
+    return (await db.scalars(crud.turbines_query(site_id, limit, after))).all()
+
+async def get_turbine_rows(db: AsyncSession, site_id: str = None, limit: int = None, after: str = None,
+                           fieldset: Fieldset = None):
+    return await _resource_rows(db, "turbine", crud.turbines_query(site_id, limit, after), fieldset)
+
+async def create_turbine(db: AsyncSession, turbine: schemas.TurbineCreate):
+    return await db.run_sync(crud.create_turbine, turbine)
+
+# -----------------------------
+# Blades
+# -----------------------------
+
+async def get_blades(db: AsyncSession, turbine_id: str = None, site_id: str = None, limit: int = None,
+                     after: str = None, with_maintenance: bool = False):
+    return (await db.scalars(crud.blades_query(turbine_id, site_id, limit, after, with_maintenance))).all()
+
+async def get_blade_rows(db: AsyncSession, turbine_id: str = None, site_id: str = None, limit: int = None,
+                         after: str = None, fieldset: Fieldset = None):
+    # By default two statements whatever the page size: the blades, then all their maintenance
+    return await _resource_rows(db, "blade", crud.blades_query(turbine_id, site_id, limit, after), fieldset)
+
+async def create_blade(db: AsyncSession, blade: schemas.BladeCreate):
+    return await db.run_sync(crud.create_blade, blade)
+
+async def update_blade(db: AsyncSession, blade_id: str, updates: schemas.BladeUpdate):
+    return await db.run_sync(crud.update_blade, blade_id, updates)
+
+async def bulk_create_blades(db: AsyncSession, blades: list):
+    return await db.run_sync(crud.bulk_create_blades, blades)
+
+# -----------------------------
+# Maintenance
+# -----------------------------
+
+async def get_maintenance_records(db: AsyncSession, filters: MaintenanceFilters = None, limit: int = None,
+                                  after=None, newest_first: bool = False):
+    return (await db.scalars(crud.maintenance_query(filters, limit, after, newest_first))).all()
+
+async def get_maintenance_rows(db: AsyncSession, filters: MaintenanceFilters = None, limit: int = None,
+                               after=None, newest_first: bool = False):
+    stmt = crud.maintenance_query(filters, limit, after, newest_first)
+    return await _records(db, crud.as_columns(stmt, schemas.MaintenanceResponse))
+
+async def create_maintenance(db: AsyncSession, entry: schemas.MaintenanceCreate):
+    return await db.run_sync(crud.create_maintenance, entry)
+
+async def update_maintenance(db: AsyncSession, maintenance_id: int, updates: schemas.MaintenanceUpdate):
+    return await db.run_sync(crud.update_maintenance, maintenance_id, updates)
+
+async def bulk_create_maintenance(db: AsyncSession, entries: list):
+    return await db.run_sync(crud.bulk_create_maintenance, entries)
+
+async def bulk_update_maintenance(db: AsyncSession, updates: list):
+    return await db.run_sync(crud.bulk_update_maintenance, updates)
+
+# -----------------------------
+# Blade state
+# -----------------------------
+
+async def get_blade_states(db: AsyncSession, due_before=None, open_only: bool = False, site_id: str = None,
+                           limit: int = None, after=None, order_by: str = "next_due_date"):
+    return (await db.scalars(crud.blade_state_query(due_before, open_only, site_id, limit, after, order_by))).all()
+
+# -----------------------------
+# Technician profiles
+# -----------------------------
+
+async def get_technician_profiles(db: AsyncSession, technician: str = None, date_from=None, date_to=None) -> dict:
+    stmt = crud.technician_profile_query(db.get_bind().dialect.name, technician, date_from, date_to)
+    return crud.technician_profiles((await db.execute(stmt)).all())
+
+# -----------------------------
+# Hierarchy rollup
+# -----------------------------
+
+async def get_hierarchy_rollup(db: AsyncSession, level: str, site_id: str = None, turbine_id: str = None,
+                               sort: str = "maintenance_count", descending: bool = True, limit: int = None):
+    return (await db.execute(crud.hierarchy_rollup_query(level, site_id, turbine_id, sort, descending, limit))).all()
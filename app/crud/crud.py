@@ -1,119 +1,564 @@
-from sqlalchemy.orm import Session
+from collections import Counter
+from typing import NamedTuple
+from sqlalchemy import and_, case, func, insert, literal, literal_column, or_, select, tuple_, update
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from app.models import models
 from app.schemas import schemas
-from app.utils.utils import ensure_exists
+from app.utils import blade_state, columnar, rollups, table_versions
+from app.utils.cache import result_cache
+from app.utils.filters import MaintenanceFilters, apply_maintenance_filters
+from app.utils.utils import dialect_insert, integrity_http_error
+
+# Largest body accepted by the /bulk endpoints
+BULK_MAX_ITEMS = 5000
+def _check_bulk_size(items: list):
+    if not items:
+        raise HTTPException(status_code=400, detail="❌ No records to write.")
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"❌ At most {BULK_MAX_ITEMS} records per request.")
+
+def _bulk_response(results: list) -> dict:
+    failed = sum(1 for r in results if r["error"])
+    return {"succeeded": len(results) - failed, "failed": failed, "results": results}
+
+# Single-row writes are one INSERT/UPDATE ... RETURNING plus the commit; the returned row is
+# the response, so nothing is re-read after the commit. Parent checks are left to the FKs.
+
+def _insert_returning(db: Session, model, values: dict) -> dict:
+    table = model.__table__
+    return dict(db.execute(insert(table).values(**values).returning(*table.c)).mappings().one())
+
+def _update_returning(db: Session, model, key: str, key_value, values: dict, old_columns: tuple = ()):
+    # Returns (updated row, pre-update values of old_columns), or (None, None) if no row matched.
+    # PostgreSQL reads the old values in the same statement from a locked FROM subquery; SQLite
+    # can't return FROM-clause columns, so there they come from a SELECT in the same transaction.
+    table = model.__table__
+    match = table.c[key] == key_value
+    if not values:
+        row = db.execute(select(*table.c).where(match)).mappings().first()
+        return (dict(row), {c: row[c] for c in old_columns}) if row else (None, None)
+
+    stmt = update(table).values(**values)
+    if old_columns and db.get_bind().dialect.name == "postgresql":
+        old = select(table.c[key], *[table.c[c] for c in old_columns]).where(match).with_for_update().subquery("old")
+        stmt = stmt.where(table.c[key] == old.c[key])
+        row = db.execute(stmt.returning(*table.c, *[old.c[c].label(f"old_{c}") for c in old_columns])).mappings().first()
+        if row is None:
+            return None, None
+        return {c.name: row[c.name] for c in table.c}, {c: row[f"old_{c}"] for c in old_columns}
+
+    old_values = {}
+    if old_columns:
+        current = db.execute(select(*[table.c[c] for c in old_columns]).where(match)).mappings().first()
+        if current is None:
+            return None, None
+        old_values = dict(current)
+    row = db.execute(stmt.where(match).returning(*table.c)).mappings().first()
+    return (dict(row), old_values) if row else (None, None)
+
 # -----------------------------
 # Sites
 # -----------------------------
 
-def get_sites(db: Session):
-    return db.query(models.Site).all()
+def sites_query(limit: int = None, after: str = None):
+    stmt = select(models.Site).order_by(models.Site.site_id)
+    if after is not None:
+        stmt = stmt.where(models.Site.site_id > after)
+    return stmt.limit(limit) if limit else stmt
+
+def get_sites(db: Session, limit: int = None, after: str = None):
+    return db.scalars(sites_query(limit, after)).all()
 
 def create_site(db: Session, site: schemas.SiteCreate):
-    db_site = models.Site(**site.dict())
     try:
-        db.add(db_site)
+        created = _insert_returning(db, models.Site, site.dict())
+        table_versions.bump(db, "sites")
         db.commit()
-        db.refresh(db_site)
-        return db_site
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=400, detail=f"❌ Site with ID '{site.site_id}' already exists.")
+    result_cache.invalidate("sites")
+    return created
 
 # -----------------------------
 # Turbines
 # -----------------------------
 
-def get_turbines(db: Session):
-    return db.query(models.Turbine).all()
+def turbines_query(site_id: str = None, limit: int = None, after: str = None):
+    stmt = select(models.Turbine).order_by(models.Turbine.turbine_id)
+    if site_id:
+        stmt = stmt.where(models.Turbine.site_id == site_id)
+    if after is not None:
+        stmt = stmt.where(models.Turbine.turbine_id > after)
+    return stmt.limit(limit) if limit else stmt
+
+def get_turbines(db: Session, site_id: str = None, limit: int = None, after: str = None):
+    return db.scalars(turbines_query(site_id, limit, after)).all()
 
 def get_turbines_by_site(db: Session, site_id: str):
     return db.query(models.Turbine).filter(models.Turbine.site_id == site_id).all()
 
 def create_turbine(db: Session, turbine: schemas.TurbineCreate):
-    ensure_exists(db, models.Site, "site_id", turbine.site_id, "Site")
-
-    db_turbine = models.Turbine(**turbine.dict())
     try:
-        db.add(db_turbine)
+        created = _insert_returning(db, models.Turbine, turbine.dict())
+        table_versions.bump(db, "turbines")
         db.commit()
-        db.refresh(db_turbine)
-        return db_turbine
-    except IntegrityError:
+    except IntegrityError as e:
         db.rollback()
-        raise HTTPException(status_code=400, detail=f"❌ Turbine with ID '{turbine.turbine_id}' already exists.")
+        raise integrity_http_error(
+            e,
+            duplicate=f"❌ Turbine with ID '{turbine.turbine_id}' already exists.",
+            missing=f"❌ Site '{turbine.site_id}' does not exist.",
+        )
+    result_cache.invalidate("turbines")
+    return created
 
 def update_turbine(db: Session, turbine_id: str, updates: schemas.TurbineUpdate):
-    turbine = db.query(models.Turbine).filter_by(turbine_id=turbine_id).first()
-    if not turbine:
-        raise HTTPException(status_code=404, detail=f"❌ Turbine '{turbine_id}' not found.")
-    for key, value in updates.dict(exclude_unset=True).items():
-        setattr(turbine, key, value)
-    db.commit()
-    db.refresh(turbine)
+    values = updates.dict(exclude_unset=True)
+    try:
+        turbine, old = _update_returning(db, models.Turbine, "turbine_id", turbine_id, values, ("site_id",))
+        if turbine is None:
+            raise HTTPException(status_code=404, detail=f"❌ Turbine '{turbine_id}' not found.")
+        if turbine["site_id"] != old["site_id"]:
+            rollups.refresh_site_issue(db, {old["site_id"], turbine["site_id"]})
+            blade_state.refresh(db, models.Blade.turbine_id == turbine_id)
+        table_versions.bump(db, "turbines")
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise integrity_http_error(e, duplicate=f"❌ Turbine '{turbine_id}' could not be updated.",
+                                   missing=f"❌ Site '{values.get('site_id')}' does not exist.")
+    result_cache.invalidate("turbines")
     return turbine
 
 # -----------------------------
 # Blades
 # -----------------------------
 
-def get_blades(db: Session):
-    return db.query(models.Blade).all()
+def blades_query(turbine_id: str = None, site_id: str = None, limit: int = None, after: str = None,
+                 with_maintenance: bool = False):
+    stmt = select(models.Blade).order_by(models.Blade.blade_id)
+    if turbine_id:
+        stmt = stmt.where(models.Blade.turbine_id == turbine_id)
+    if site_id:
+        stmt = stmt.join(models.Turbine).where(models.Turbine.site_id == site_id)
+    if after is not None:
+        stmt = stmt.where(models.Blade.blade_id > after)
+    if with_maintenance:
+        # selectinload keeps LIMIT on blades; a joinedload would multiply rows by history
+        stmt = stmt.options(selectinload(models.Blade.maintenance))
+    return stmt.limit(limit) if limit else stmt
+
+def get_blades(db: Session, turbine_id: str = None, site_id: str = None, limit: int = None, after: str = None,
+               with_maintenance: bool = False):
+    return db.scalars(blades_query(turbine_id, site_id, limit, after, with_maintenance)).all()
 
 def get_blades_by_turbine(db: Session, turbine_id: str):
-    return db.query(models.Blade).filter(models.Blade.turbine_id == turbine_id).all()
+    return get_blades(db, turbine_id=turbine_id, with_maintenance=True)
 
 def create_blade(db: Session, blade: schemas.BladeCreate):
-    ensure_exists(db, models.Turbine, "turbine_id", blade.turbine_id, "Turbine")
-    db_blade = models.Blade(**blade.dict())
     try:
-        db.add(db_blade)
+        created = _insert_returning(db, models.Blade, blade.dict())
+        blade_state.refresh_blades(db, [blade.blade_id])
+        table_versions.bump(db, "blades")
         db.commit()
-        db.refresh(db_blade)
-        return db_blade
-    except IntegrityError:
+    except IntegrityError as e:
         db.rollback()
-        raise HTTPException(status_code=400, detail=f"❌ Blade with ID '{blade.blade_id}' already exists.")
+        raise integrity_http_error(
+            e,
+            duplicate=f"❌ Blade with ID '{blade.blade_id}' already exists.",
+            missing=f"❌ Turbine '{blade.turbine_id}' does not exist.",
+        )
+    result_cache.invalidate("blades")
+    # A new blade has no history yet
+    return {**created, "maintenance": []}
 
 def update_blade(db: Session, blade_id: str, updates: schemas.BladeUpdate):
-    blade = db.query(models.Blade).filter_by(blade_id=blade_id).first()
-    if not blade:
-        raise HTTPException(status_code=404, detail=f"❌ Blade '{blade_id}' not found.")
-    for key, value in updates.dict(exclude_unset=True).items():
-        setattr(blade, key, value)
-    db.commit()
-    db.refresh(blade)
+    values = updates.dict(exclude_unset=True)
+    try:
+        blade, old = _update_returning(db, models.Blade, "blade_id", blade_id, values, ("turbine_id",))
+        if blade is None:
+            raise HTTPException(status_code=404, detail=f"❌ Blade '{blade_id}' not found.")
+        if blade["turbine_id"] != old["turbine_id"]:
+            # The blade's history now counts towards its new turbine's site
+            turbines = [old["turbine_id"], blade["turbine_id"]]
+            rollups.refresh_site_issue(db, set(db.scalars(
+                select(models.Turbine.site_id).where(models.Turbine.turbine_id.in_(turbines))
+            )))
+            blade_state.refresh_blades(db, [blade_id])
+        # BladeResponse carries the blade's history
+        blade["maintenance"] = [
+            dict(row) for row in db.execute(blade_maintenance_query([blade_id])).mappings()
+        ]
+        table_versions.bump(db, "blades")
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise integrity_http_error(e, duplicate=f"❌ Blade '{blade_id}' could not be updated.",
+                                   missing=f"❌ Turbine '{values.get('turbine_id')}' does not exist.")
+    result_cache.invalidate("blades")
     return blade
+def bulk_create_blades(db: Session, blades: list):
+    # One parent check for the whole batch, then one multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING
+    _check_bulk_size(blades)
+    turbine_ids = list({b.turbine_id for b in blades})
+    known = set(db.scalars(select(models.Turbine.turbine_id).where(models.Turbine.turbine_id.in_(turbine_ids))))
+    results, pending, seen = [], [], set()
+    for i, blade in enumerate(blades):
+        result = {"index": i, "id": blade.blade_id, "error": None}
+        if blade.turbine_id not in known:
+            result["error"] = f"❌ Turbine '{blade.turbine_id}' does not exist."
+        elif blade.blade_id in seen:
+            result["error"] = f"❌ Blade with ID '{blade.blade_id}' appears more than once in this request."
+        else:
+            seen.add(blade.blade_id)
+            pending.append(result)
+        results.append(result)
+
+    if pending:
+        stmt = dialect_insert(db, models.Blade).on_conflict_do_nothing(index_elements=["blade_id"])
+        try:
+            inserted = set(db.scalars(stmt.returning(models.Blade.blade_id), [blades[r["index"]].dict() for r in pending]))
+            blade_state.refresh_blades(db, inserted)
+            if inserted:
+                table_versions.bump(db, "blades")
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            inserted = set()
+            for result in pending:
+                result["error"] = f"❌ Batch rejected by the database: {e.orig}"
+        for result in pending:
+            if not result["error"] and result["id"] not in inserted:
+                result["error"] = f"❌ Blade with ID '{result['id']}' already exists."
+        if inserted:
+            result_cache.invalidate("blades")
+    return _bulk_response(results)
+
 # -----------------------------
 # Maintenance
 # -----------------------------
 
-def get_maintenance_records(db: Session):
-    return db.query(models.Maintenance).all()
+def maintenance_query(filters: MaintenanceFilters = None, limit: int = None, after=None, newest_first: bool = False):
+    # Keyset order: maintenance_id ascending, or (date, maintenance_id) descending for newest_first
+    m = models.Maintenance
+    stmt = apply_maintenance_filters(select(m), filters or MaintenanceFilters())
+    if newest_first:
+        stmt = stmt.order_by(m.date.desc(), m.maintenance_id.desc())
+        if after is not None:
+            after_date, after_id = after
+            stmt = stmt.where(or_(m.date < after_date, and_(m.date == after_date, m.maintenance_id < after_id)))
+    else:
+        stmt = stmt.order_by(m.maintenance_id)
+        if after is not None:
+            stmt = stmt.where(m.maintenance_id > after)
+    return stmt.limit(limit) if limit else stmt
+
+def get_maintenance_records(db: Session, filters: MaintenanceFilters = None, limit: int = None, after=None,
+                            newest_first: bool = False):
+    return db.scalars(maintenance_query(filters, limit, after, newest_first)).all()
 
 def get_maintenance_by_blade(db: Session, blade_id: str):
     return db.query(models.Maintenance).filter(models.Maintenance.blade_id == blade_id).all()
 
 def create_maintenance(db: Session, entry: schemas.MaintenanceCreate):
-    ensure_exists(db, models.Blade, "blade_id", entry.blade_id, "Blade")
-    db_entry = models.Maintenance(**entry.dict())
     try:
-        db.add(db_entry)
+        created = _insert_returning(db, models.Maintenance, entry.dict())
+        rollups.apply_maintenance_delta(db, None, rollups.maintenance_snapshot(created))
+        blade_state.refresh_blades(db, [created["blade_id"]])
+        table_versions.bump(db, "maintenance")
+        columnar.track(db, [created["maintenance_id"]])
         db.commit()
-        db.refresh(db_entry)
-        return db_entry
-    except IntegrityError:
+    except IntegrityError as e:
         db.rollback()
-        raise HTTPException(status_code=400, detail=f"❌ Duplicate maintenance record or foreign key constraint failed.")
+        raise integrity_http_error(
+            e,
+            duplicate="❌ Duplicate maintenance record or foreign key constraint failed.",
+            missing=f"❌ Blade '{entry.blade_id}' does not exist.",
+        )
+    result_cache.invalidate("maintenance")
+    return created
 
 def update_maintenance(db: Session, maintenance_id: int, updates: schemas.MaintenanceUpdate):
-    record = db.query(models.Maintenance).filter_by(maintenance_id=maintenance_id).first()
-    if not record:
+    record, old = _update_returning(
+        db, models.Maintenance, "maintenance_id", maintenance_id, updates.dict(exclude_unset=True), rollups.SNAPSHOT_COLUMNS
+    )
+    if record is None:
         raise HTTPException(status_code=404, detail=f"❌ Maintenance record ID '{maintenance_id}' not found.")
-    for key, value in updates.dict(exclude_unset=True).items():
-        setattr(record, key, value)
+    rollups.apply_maintenance_delta(db, old, rollups.maintenance_snapshot(record))
+    blade_state.refresh_blades(db, {old["blade_id"], record["blade_id"]})
+    table_versions.bump(db, "maintenance")
+    columnar.track(db, [maintenance_id])
     db.commit()
-    db.refresh(record)
+    result_cache.invalidate("maintenance")
     return record
+
+def bulk_create_maintenance(db: Session, entries: list):
+    # One parent check, one multi-row INSERT ... RETURNING, set-based rollup update, one commit
+    _check_bulk_size(entries)
+    m = models.Maintenance
+    blade_ids = list({e.blade_id for e in entries})
+    known = set(db.scalars(select(models.Blade.blade_id).where(models.Blade.blade_id.in_(blade_ids))))
+    results, pending = [], []
+    for i, entry in enumerate(entries):
+        result = {"index": i, "id": None, "error": None}
+        if entry.blade_id not in known:
+            result["error"] = f"❌ Blade '{entry.blade_id}' does not exist."
+        else:
+            pending.append(result)
+        results.append(result)
+
+    if pending:
+        # RETURNING rows come back unordered (asking for parameter order makes some backends insert
+        # row by row), so ids are matched to items by content; identical items are interchangeable
+        columns = (m.blade_id, m.date, m.status, m.issue, m.technician)
+        stmt = dialect_insert(db, m).returning(m.maintenance_id, *columns)
+        try:
+            inserted = db.execute(stmt, [entries[r["index"]].dict() for r in pending]).all()
+            rollups.apply_inserted_ids(db, [row[0] for row in inserted])
+            blade_state.refresh_blades(db, {row[1] for row in inserted})
+            table_versions.bump(db, "maintenance")
+            columnar.track(db, [row[0] for row in inserted])
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            for result in pending:
+                result["error"] = f"❌ Batch rejected by the database: {e.orig}"
+        else:
+            ids_by_values = {}
+            for row in sorted(inserted):
+                ids_by_values.setdefault(tuple(row[1:]), []).append(row[0])
+            for result in pending:
+                entry = entries[result["index"]]
+                key = (entry.blade_id, entry.date, entry.status, entry.issue, entry.technician)
+                result["id"] = ids_by_values[key].pop(0)
+            result_cache.invalidate("maintenance")
+    return _bulk_response(results)
+
+def bulk_update_maintenance(db: Session, updates: list):
+    # One SELECT of the current values (for rollup deltas), one executemany UPDATE by primary key
+    _check_bulk_size(updates)
+    m = models.Maintenance
+    ids = list({u.maintenance_id for u in updates})
+    current = select(m.maintenance_id, m.blade_id, m.status, m.issue, m.technician).where(m.maintenance_id.in_(ids))
+    if db.get_bind().dialect.name == "postgresql":
+        # Locked until commit, so a concurrent bulk update waits instead of taking deltas from the same
+        # old values; id order keeps two overlapping batches from deadlocking
+        current = current.order_by(m.maintenance_id).with_for_update()
+    rows = db.execute(current)
+    old = {row.maintenance_id: rollups.maintenance_snapshot(row) for row in rows}
+    new = {maintenance_id: dict(snapshot) for maintenance_id, snapshot in old.items()}
+    changes, results = {}, []
+    for i, item in enumerate(updates):
+        result = {"index": i, "id": item.maintenance_id, "error": None}
+        if item.maintenance_id not in old:
+            result["error"] = f"❌ Maintenance record ID '{item.maintenance_id}' not found."
+        else:
+            values = item.dict(exclude_unset=True, exclude={"maintenance_id"})
+            # Later items for the same record win, as if applied one by one
+            changes.setdefault(item.maintenance_id, {}).update(values)
+            new[item.maintenance_id].update(values)
+        results.append(result)
+
+    rows = [{"maintenance_id": maintenance_id, **values} for maintenance_id, values in changes.items() if values]
+    if rows:
+        db.execute(update(m), rows)
+        rollups.apply_maintenance_deltas(db, [(old[row["maintenance_id"]], new[row["maintenance_id"]]) for row in rows])
+        blade_state.refresh_blades(db, {old[row["maintenance_id"]]["blade_id"] for row in rows})
+        table_versions.bump(db, "maintenance")
+        columnar.track(db, [row["maintenance_id"] for row in rows])
+        db.commit()
+        result_cache.invalidate("maintenance")
+    return _bulk_response(results)
+
+# -----------------------------
+# Blade state (due / priority lists)
+# -----------------------------
+
+def blade_state_query(due_before=None, open_only: bool = False, site_id: str = None, limit: int = None, after=None,
+                      order_by: str = "next_due_date"):
+    # Keyset order (order_by, blade_id); each filter combination has an ix_blade_state_* index
+    s = models.BladeState
+    sort = getattr(s, order_by)
+    stmt = select(s).order_by(sort, s.blade_id)
+    if due_before is not None:
+        stmt = stmt.where(s.next_due_date < due_before)
+    if open_only:
+        stmt = stmt.where(s.open_issue_count > 0)
+    if site_id:
+        stmt = stmt.where(s.site_id == site_id)
+    if after is not None:
+        after_sort, after_id = after
+        stmt = stmt.where(or_(sort > after_sort, and_(sort == after_sort, s.blade_id > after_id)))
+    return stmt.limit(limit) if limit else stmt
+
+# -----------------------------
+# Technician profiles
+# -----------------------------
+
+# Bits of GROUPING(issue, status, month): a row has the bit of every column it is summed over set;
+# rows at the finest grain carry 0 and count towards every breakdown
+PROFILE_BITS = {"issue": 0b100, "status": 0b010, "month": 0b001}
+PROFILE_TOTAL = 0b111
+
+def technician_profile_query(dialect: str, technician: str = None, date_from=None, date_to=None):
+    # One scan of the matching rows, served by ix_maintenance_technician_date. PostgreSQL returns
+    # each breakdown as its own grouping set plus the per-technician total; other backends return
+    # the finest grouping for technician_profiles() to roll up.
+    m = models.Maintenance
+    # Inline format literal, so every occurrence of the month expression matches the grouping set
+    if dialect == "postgresql":
+        month = func.to_char(m.date, literal_column("'YYYY-MM'"))
+    else:
+        month = func.strftime(literal_column("'%Y-%m'"), m.date)
+    filters = MaintenanceFilters(technician=technician, date_from=date_from, date_to=date_to)
+    stmt = apply_maintenance_filters(select(m.technician, m.issue, m.status, month.label("month")), filters)
+    if not technician:
+        stmt = stmt.where(m.technician.isnot(None))
+    if dialect == "postgresql":
+        sets = func.grouping_sets(
+            tuple_(m.technician, m.issue), tuple_(m.technician, m.status), tuple_(m.technician, month), tuple_(m.technician)
+        )
+        return stmt.add_columns(func.grouping(m.issue, m.status, month), func.count()).group_by(sets)
+    return stmt.add_columns(literal(0), func.count()).group_by(m.technician, m.issue, m.status, month)
+
+def technician_profiles(rows) -> dict:
+    # rows: (technician, issue, status, month, grouping, count) -> technician -> {"total", "issue",
+    # "status", "month"}, the last three Counters keyed by value
+    profiles = {}
+    for technician, issue, status, month, grouping, count in rows:
+        profile = profiles.setdefault(technician, {"total": 0, **{name: Counter() for name in PROFILE_BITS}})
+        if grouping in (0, PROFILE_TOTAL):
+            profile["total"] += count
+        for name, value in (("issue", issue), ("status", status), ("month", month)):
+            if grouping in (0, PROFILE_TOTAL ^ PROFILE_BITS[name]):
+                profile[name][value] += count
+    return profiles
+
+def get_technician_profiles(db: Session, technician: str = None, date_from=None, date_to=None) -> dict:
+    stmt = technician_profile_query(db.get_bind().dialect.name, technician, date_from, date_to)
+    return technician_profiles(db.execute(stmt).all())
+
+# -----------------------------
+# Column-tuple reads (fast list serialization, ?fields= / ?include=)
+# -----------------------------
+
+class Relation(NamedTuple):
+    # Embeddable relation; key names the column on both sides (blades.turbine_id -> turbines.turbine_id)
+    model: type
+    schema: type
+    key: str
+    many: bool
+    order_by: tuple = ()
+
+class Resource(NamedTuple):
+    model: type
+    schema: type
+    key: str
+    relations: dict
+    default_include: tuple = ()
+
+    @property
+    def fields(self) -> list:
+        return [c.name for c in response_columns(self.model, self.schema)]
+
+RESOURCES = {
+    "site": Resource(models.Site, schemas.SiteResponse, "site_id", {
+        "turbines": Relation(models.Turbine, schemas.TurbineResponse, "site_id", many=True),
+    }),
+    "turbine": Resource(models.Turbine, schemas.TurbineResponse, "turbine_id", {
+        "blades": Relation(models.Blade, schemas.BladeResponse, "turbine_id", many=True),
+        "site": Relation(models.Site, schemas.SiteResponse, "site_id", many=False),
+    }),
+    # BladeResponse has always carried the maintenance history
+    "blade": Resource(models.Blade, schemas.BladeResponse, "blade_id", {
+        # Chronological per blade, straight off ix_maintenance_blade_date
+        "maintenance": Relation(models.Maintenance, schemas.MaintenanceResponse, "blade_id", many=True,
+                                order_by=("date", "maintenance_id")),
+        "turbine": Relation(models.Turbine, schemas.TurbineResponse, "turbine_id", many=False),
+    }, default_include=("maintenance",)),
+}
+
+def response_columns(model, schema, fields=None) -> list:
+    # Table columns behind the schema's scalar fields, in schema order; fields narrows them further
+    table = model.__table__
+    return [table.c[name] for name in schema.model_fields if name in table.c and (fields is None or name in fields)]
+
+def as_columns(stmt, schema, fields=None):
+    # Same filters, order and limit as the ORM statement, but selecting plain column tuples
+    model = stmt.column_descriptions[0]["entity"]
+    return stmt.with_only_columns(*response_columns(model, schema, fields))
+
+def relation_query(relation: Relation, keys: list):
+    # Every related row for a page of parents in one IN query
+    table = relation.model.__table__
+    key = table.c[relation.key]
+    stmt = select(*response_columns(relation.model, relation.schema)).where(key.in_(keys))
+    if relation.many:
+        stmt = stmt.order_by(key, *[table.c[c] for c in relation.order_by or [pk.name for pk in table.primary_key]])
+    return stmt
+
+def blade_maintenance_query(blade_ids: list):
+    return relation_query(RESOURCES["blade"].relations["maintenance"], blade_ids)
+
+# -----------------------------
+# Hierarchy rollup
+# -----------------------------
+
+def blade_activity_subquery():
+    # One row per blade with maintenance history; every level aggregates these instead of raw rows
+    m = models.Maintenance
+    return (
+        select(
+            m.blade_id,
+            func.count().label("maintenance_count"),
+            func.count(case((m.status != "Completed", 1))).label("open_issues"),
+            func.max(m.date).label("last_service"),
+        )
+        .group_by(m.blade_id)
+        .subquery("activity")
+    )
+
+def hierarchy_rollup_query(level: str, site_id: str = None, turbine_id: str = None, sort: str = "maintenance_count",
+                           descending: bool = True, limit: int = None):
+    # level: fleet | site | turbine | blade. Assets without history are included with zero counts.
+    activity = blade_activity_subquery()
+    site, turbine, blade = models.Site, models.Turbine, models.Blade
+    node = {
+        "fleet": (literal("fleet"), literal("fleet")),
+        "site": (site.site_id, site.name),
+        "turbine": (turbine.turbine_id, turbine.model),
+        "blade": (blade.blade_id, blade.type),
+    }[level]
+    totals = (
+        func.count(blade.blade_id).label("blade_count"),
+        func.coalesce(func.sum(activity.c.maintenance_count), 0).label("maintenance_count"),
+        func.coalesce(func.sum(activity.c.open_issues), 0).label("open_issues"),
+        func.max(activity.c.last_service).label("last_service"),
+    )
+    stmt = select(node[0].label("id"), node[1].label("name"), *totals)
+    if level in ("fleet", "site"):
+        stmt = stmt.select_from(site).outerjoin(turbine, turbine.site_id == site.site_id)
+    else:
+        stmt = stmt.select_from(turbine)
+    stmt = stmt.outerjoin(blade, blade.turbine_id == turbine.turbine_id).outerjoin(
+        activity, activity.c.blade_id == blade.blade_id
+    )
+    if site_id:
+        stmt = stmt.where(turbine.site_id == site_id)
+    if turbine_id:
+        stmt = stmt.where(turbine.turbine_id == turbine_id)
+    if level == "blade":
+        stmt = stmt.where(blade.blade_id.isnot(None))
+    if level != "fleet":
+        stmt = stmt.group_by(node[0], node[1])
+        order = stmt.selected_columns[sort]
+        order = order.desc() if descending else order.asc()
+        stmt = stmt.order_by(order.nulls_last(), node[0])
+    return stmt.limit(limit) if limit else stmt
+
+def get_hierarchy_rollup(db: Session, level: str, site_id: str = None, turbine_id: str = None,
+                         sort: str = "maintenance_count", descending: bool = True, limit: int = None):
+    return db.execute(hierarchy_rollup_query(level, site_id, turbine_id, sort, descending, limit)).all()
@@ -1,8 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
+from app.utils.instrumentation import TimedAsyncQueuePool, TimedQueuePool, instrument_engine
 
 
 load_dotenv()  # Load from .env
@@ -14,6 +15,78 @@ DB_URL = os.getenv("DATABASE_URL")
 if DB_URL is None:
     raise ValueError("❌ DATABASE_URL is not set. Please check your .env file.")
 
-engine = create_engine(DB_URL)
+# Pool sizing per engine and per worker process: each uvicorn worker holds up to
+# DB_POOL_SIZE + DB_MAX_OVERFLOW connections on the async engine and as many on the sync one
+POOL_SETTINGS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    # Checks connections on checkout, so a Postgres restart costs a reconnect instead of a failed request
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+}
+STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+def connect_args(driver: str) -> dict:
+    # Server-side statement timeout; only PostgreSQL has one
+    if not STATEMENT_TIMEOUT_MS or not driver.startswith("postgresql"):
+        return {}
+    if driver == "postgresql+asyncpg":
+        return {"server_settings": {"statement_timeout": str(STATEMENT_TIMEOUT_MS)}}
+    return {"options": f"-c statement_timeout={STATEMENT_TIMEOUT_MS}"}
+
+def _enforce_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores REFERENCES unless asked per connection; writes rely on FK errors for unknown parents
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+def prepare_engine(sync_engine):
+    instrument_engine(sync_engine)
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _enforce_sqlite_foreign_keys)
+
+engine = create_engine(
+    DB_URL, poolclass=TimedQueuePool, connect_args=connect_args(make_url(DB_URL).drivername), **POOL_SETTINGS
+)
+prepare_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+
+# Async path for the read-heavy routes: same database, driver swapped for its asyncio twin.
+# Built on first use so ETL scripts and other sync-only tools don't need the async drivers.
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+_async_engine = None
+_async_sessionmaker = None
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        url = make_url(DB_URL)
+        backend = url.get_backend_name()
+        if backend not in ASYNC_DRIVERS:
+            raise ValueError(f"❌ No async driver configured for '{backend}' databases.")
+        driver = ASYNC_DRIVERS[backend]
+        _async_engine = create_async_engine(
+            url.set(drivername=driver), poolclass=TimedAsyncQueuePool, connect_args=connect_args(driver), **POOL_SETTINGS
+        )
+        prepare_engine(_async_engine.sync_engine)
+    return _async_engine
+
+def engine_pools() -> dict:
+    pools = {"sync": engine.pool}
+    if _async_engine is not None:
+        pools["async"] = _async_engine.pool
+    return pools
+
+def AsyncSessionLocal():
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        _async_sessionmaker = async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+    return _async_sessionmaker()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,12 +1,24 @@
 from fastapi import FastAPI
-from app.routers import site, turbine, blade, maintenance,dashboard,technician
-from app.database import engine, Base
+from app.routers import site, turbine, blade, maintenance,dashboard,technician,export,hierarchy,metrics,search
+from app.database import engine, Base, SessionLocal
 from fastapi.middleware.cors import CORSMiddleware
+from app.utils import blade_state, partitions
+from app.utils.instrumentation import instrument_request
 
 
 Base.metadata.create_all(bind=engine)
+# create_all skips the indexes of tables that already exist
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+with SessionLocal() as db:
+    blade_state.backfill(db)
+    partitions.ensure_current(db)  # no-op unless maintenance is partitioned
 app = FastAPI()
 
+# Query count / DB time per request -> Server-Timing header and /metrics
+app.middleware("http")(instrument_request)
+
 # Allow React dev server to access FastAPI backend
 app.add_middleware(
     CORSMiddleware,
@@ -14,6 +26,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # GET, POST, PUT, etc.
     allow_headers=["*"],
+    # keyset pagination token, per-request DB timings, conditional-request validators
+    expose_headers=["X-Next-Cursor", "Server-Timing", "ETag", "Last-Modified"],
 )
 
 app.include_router(site.router, prefix="/sites", tags=["Sites"])
@@ -21,4 +35,8 @@ app.include_router(turbine.router, prefix="/turbines", tags=["Turbines"])
 app.include_router(blade.router, prefix="/blades", tags=["Blades"])
 app.include_router(maintenance.router, prefix="/maintenance", tags=["Maintenance"])
 app.include_router(dashboard.router, prefix="/api/dashboard", tags=["Dashboard"])
-app.include_router(technician.router,prefix="/api/technician", tags=["Technician"])
\ No newline at end of file
+app.include_router(technician.router,prefix="/api/technician", tags=["Technician"])
+app.include_router(hierarchy.router, prefix="/api/hierarchy", tags=["Hierarchy"])
+app.include_router(search.router, prefix="/search", tags=["Search"])
+app.include_router(export.router, prefix="/export", tags=["Export"])
+app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
\ No newline at end of file
@@ -1,37 +1,149 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Text, Boolean, DateTime, Index, func, literal_column, text
 from sqlalchemy.orm import relationship
 from app.database import Base
 
+# /search matches ID prefixes with LIKE 'B018%'; on PostgreSQL that needs text_pattern_ops unless the
+# database collation is C. Other backends search through the in-process index in app/utils/search.py.
+def id_prefix_index(name: str, column: str) -> Index:
+    return Index(name, column, postgresql_ops={column: "text_pattern_ops"}).ddl_if(dialect="postgresql")
+
+def maintenance_search_vector(issue, technician):
+    # Issue words weigh more (A) than technician names (B). Inline literals keep the expression
+    # identical between the GIN index and the /search queries, so the planner can match them.
+    def weighted(column, weight: str):
+        words = func.to_tsvector(literal_column("'simple'"), func.coalesce(column, literal_column("''")))
+        return func.setweight(words, literal_column(f"'{weight}'"))
+    return weighted(issue, "A").op("||")(weighted(technician, "B"))
+
 class Site(Base):
     __tablename__ = "sites"
     site_id = Column(String, primary_key=True, index=True)
     name = Column(String)
     location = Column(String)
+    row_hash = Column(String)
     turbines = relationship("Turbine", back_populates="site")
 
+    __table_args__ = (id_prefix_index("ix_sites_id_pattern", "site_id"),)
+
 class Turbine(Base):
     __tablename__ = "turbines"
     turbine_id = Column(String, primary_key=True, index=True)
-    site_id = Column(String, ForeignKey("sites.site_id"))
+    site_id = Column(String, ForeignKey("sites.site_id"), index=True)
     model = Column(String)
+    row_hash = Column(String)
     site = relationship("Site", back_populates="turbines")
     blades = relationship("Blade", back_populates="turbine")
 
+    __table_args__ = (id_prefix_index("ix_turbines_id_pattern", "turbine_id"),)
+
 class Blade(Base):
     __tablename__ = "blades"
     blade_id = Column(String, primary_key=True, index=True)
-    turbine_id = Column(String, ForeignKey("turbines.turbine_id"))
+    turbine_id = Column(String, ForeignKey("turbines.turbine_id"), index=True)
     type = Column(String)
     length = Column(Integer)
+    row_hash = Column(String)
     turbine = relationship("Turbine", back_populates="blades")
     maintenance = relationship("Maintenance", back_populates="blade")
 
+    __table_args__ = (id_prefix_index("ix_blades_id_pattern", "blade_id"),)
+
 class Maintenance(Base):
     __tablename__ = "maintenance"
     maintenance_id = Column(Integer, primary_key=True, index=True)
     blade_id = Column(String, ForeignKey("blades.blade_id"))
-    date = Column(Date)
+    date = Column(Date)  # nullable in older databases; every write path requires it (partition key)
     status = Column(String)
     issue = Column(Text)
     technician = Column(String)
+    row_hash = Column(String)
+    source_id = Column(String)  # maintenance_id of the source CSV row; NULL for rows created through the API
     blade = relationship("Blade", back_populates="maintenance")
+
+    # Access paths of the dashboard/technician queries; check with check_query_plans.py
+    __table_args__ = (
+        Index("ix_maintenance_blade_date", "blade_id", "date"),  # blade history, last service, blades due
+        Index("ix_maintenance_blade_issue", "blade_id", "issue"),  # recurring issues / problem blades
+        Index("ix_maintenance_technician_date", "technician", "date"),
+        Index("ix_maintenance_status_date", "status", "date"),
+        Index("ix_maintenance_date_id", "date", "maintenance_id"),  # newest-first keyset, date ranges
+        Index("ix_maintenance_source_id", "source_id"),  # ETL upserts; not unique so it fits a partitioned table
+        # Open work is a small slice of the table; the priority list reads it in order
+        Index(
+            "ix_maintenance_open_status_date", "status", "date",
+            postgresql_where=text("status != 'Completed'"),
+            sqlite_where=text("status != 'Completed'"),
+        ),
+        # Full-text search over issue and technician (PostgreSQL only)
+        Index(
+            "ix_maintenance_search", maintenance_search_vector(issue, technician), postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
+
+class EtlCheckpoint(Base):
+    __tablename__ = "etl_checkpoints"
+    file_name = Column(String, primary_key=True)
+    content_hash = Column(String)
+    rows_done = Column(Integer, default=0)
+    completed = Column(Boolean, default=False)
+    updated_at = Column(DateTime)
+
+# ---------- Dashboard rollups (kept in step with maintenance writes, see app/utils/rollups.py) ----------
+class StatusRollup(Base):
+    __tablename__ = "rollup_status_counts"
+    status = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class IssueRollup(Base):
+    __tablename__ = "rollup_issue_counts"
+    issue = Column(Text, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class SiteIssueRollup(Base):
+    __tablename__ = "rollup_site_issue_counts"
+    site_id = Column(String, primary_key=True)
+    issue = Column(Text, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class TechnicianStatusRollup(Base):
+    __tablename__ = "rollup_technician_status_counts"
+    technician = Column(String, primary_key=True)
+    status = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+# ---------- Per-blade service state (derived from maintenance, see app/utils/blade_state.py) ----------
+class BladeState(Base):
+    __tablename__ = "blade_state"
+    blade_id = Column(String, primary_key=True)
+    site_id = Column(String)
+    last_service_date = Column(Date)
+    last_status = Column(String)
+    last_issue = Column(Text)
+    last_technician = Column(String)
+    open_issue_count = Column(Integer, nullable=False, default=0)
+    # Most urgent open entry: the oldest one not Completed (all NULL without open issues;
+    # open_date is blade_state.UNDATED_OPEN when that entry has no date)
+    open_date = Column(Date)
+    open_status = Column(String)
+    open_issue = Column(Text)
+    open_technician = Column(String)
+    next_due_date = Column(Date, nullable=False)
+
+    # Due list: range scans in (next_due_date, blade_id) keyset order; priority list: open blades
+    # in (open_date, blade_id) order
+    __table_args__ = (
+        Index("ix_blade_state_due", "next_due_date", "blade_id"),
+        Index("ix_blade_state_site_due", "site_id", "next_due_date", "blade_id"),
+        Index(
+            "ix_blade_state_open_date", "open_date", "blade_id",
+            postgresql_where=text("open_issue_count > 0"),
+            sqlite_where=text("open_issue_count > 0"),
+        ),
+    )
+
+# ---------- Per-table change counters behind the read endpoints' ETags (app/utils/table_versions.py) ----------
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False)
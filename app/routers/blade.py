@@ -1,36 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session,joinedload
-from app.schemas.schemas import BladeCreate, BladeResponse, BladeUpdate, MaintenanceResponse
-from app.crud import crud
-from app import database
-from app.models.models import Blade
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.schemas import BladeCreate, BladeListing, BladeResponse, BladeUpdate, BulkResponse, MaintenanceResponse
+from app.crud import async_crud
+from app.crud.crud import RESOURCES
+from app.database import get_async_db
+from app.utils.fieldsets import Fieldset, fieldset_params
+from app.utils.filters import MaintenanceFilters
+from app.utils.pagination import MAX_PAGE_SIZE, decode_cursor, fetch_limit, page_limit, paginate
+from app.utils.serialization import json_response
+from app.utils.table_versions import conditional
 
 router = APIRouter()
+blade_fieldset = fieldset_params(RESOURCES["blade"])
 
-def get_db():
-    db = database.SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+@router.get(
+    "", response_model=list[BladeListing],
+    dependencies=[Depends(conditional("blades", "maintenance", "turbines"))],
+)
+async def list_blades(
+    response: Response,
+    turbine_id: Optional[str] = None,
+    site_id: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fieldset: Fieldset = Depends(blade_fieldset),
+    db: AsyncSession = Depends(get_async_db),
+):
+    limit = page_limit(limit, after)
+    after_id = decode_cursor(after, 1)[0] if after else None
+    blades = await async_crud.get_blade_rows(db, turbine_id=turbine_id, site_id=site_id, limit=fetch_limit(limit),
+                                             after=after_id, fieldset=fieldset)
+    return json_response(paginate(response, blades, limit, lambda b: [b["blade_id"]]), response)
 
-@router.get("", response_model=list[BladeResponse])
-async def list_blades(db: Session = Depends(get_db)):
-    blades = db.query(Blade).options(joinedload(Blade.maintenance)).all()
-    return blades
 
-
-@router.get("/{blade_id}/maintenance", response_model=list[MaintenanceResponse])
-def maintenance_by_blade(blade_id: str, db: Session = Depends(get_db)):
-    return crud.get_maintenance_by_blade(db, blade_id)
+@router.get(
+    "/{blade_id}/maintenance", response_model=list[MaintenanceResponse],
+    dependencies=[Depends(conditional("maintenance"))],
+)
+async def maintenance_by_blade(
+    blade_id: str,
+    response: Response,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    filters = MaintenanceFilters(blade_id=blade_id, date_from=date_from, date_to=date_to)
+    return json_response(await async_crud.get_maintenance_rows(db, filters), response)
 
 @router.post("", response_model=BladeResponse)
-def add_blade(blade: BladeCreate, db: Session = Depends(get_db)):
-    return crud.create_blade(db, blade)
+async def add_blade(blade: BladeCreate, db: AsyncSession = Depends(get_async_db)):
+    return await async_crud.create_blade(db, blade)
+
+@router.post("/bulk", response_model=BulkResponse)
+async def add_blades(blades: list[BladeCreate], db: AsyncSession = Depends(get_async_db)):
+    return await async_crud.bulk_create_blades(db, blades)
 
 @router.put("/{blade_id}", response_model=BladeResponse)
-def edit_blade(blade_id: str, updates: BladeUpdate, db: Session = Depends(get_db)):
-    blade = crud.update_blade(db, blade_id, updates)
+async def edit_blade(blade_id: str, updates: BladeUpdate, db: AsyncSession = Depends(get_async_db)):
+    blade = await async_crud.update_blade(db, blade_id, updates)
     if not blade:
         raise HTTPException(status_code=404, detail="Blade not found")
     return blade
@@ -1,32 +1,68 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-from app.database import SessionLocal
+import asyncio
+import calendar
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Date, text
+from app.crud import async_crud
+from app.database import AsyncSessionLocal, get_async_db
+from app.utils import blade_state, columnar
+from app.utils.cache import cached, result_cache
+from app.utils.filters import DateRange, maintenance_where, month_label
+from app.utils.pagination import MAX_PAGE_SIZE, decode_cursor, fetch_limit, page_limit, paginate
+from app.utils.rollups import NULL_KEY
+from app.utils.table_versions import conditional
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
+PRIORITY_PAGE_SIZE = 10
+
+def _group(value):
+    # rollups store NULL group values as NULL_KEY
+    return None if value == NULL_KEY else value
+
+def _state_cursor(after: Optional[str]):
+    # blade_state lists page on (next_due_date or open_date, blade_id)
+    if not after:
+        return None
+    due, blade_id = decode_cursor(after, 2)
     try:
-        yield db
-    finally:
-        db.close()
+        return date.fromisoformat(due), str(blade_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="❌ Invalid pagination cursor.")
 
-from sqlalchemy import text, extract
+def _next_due(state):
+    # Never-serviced blades are due now; their stored next_due_date is only a sort key
+    return state.next_due_date.isoformat() if state.last_service_date else None
 
-@router.get("/summary")
-def get_dashboard_summary(db: Session = Depends(get_db)):
-    total_blades = db.execute(text("SELECT COUNT(*) FROM blades")).scalar()
-    total_maintenances = db.execute(text("SELECT COUNT(*) FROM maintenance")).scalar()
-    pending = db.execute(text("SELECT COUNT(*) FROM maintenance WHERE status = 'Pending'")).scalar()
+def _year_before(day: date) -> date:
+    # day - INTERVAL '12 months' (Feb 29 -> Feb 28)
+    return day.replace(year=day.year - 1, day=min(day.day, calendar.monthrange(day.year - 1, day.month)[1]))
 
-    # Get current year dynamically
-    current_year_query = text("""
-        SELECT COUNT(DISTINCT blade_id)
-        FROM maintenance
-        WHERE EXTRACT(YEAR FROM date) = EXTRACT(YEAR FROM CURRENT_DATE)
-    """)
-    maintained_this_year = db.execute(current_year_query).scalar()
+@router.get("/summary", dependencies=[Depends(conditional("blades", "maintenance"))])
+@cached("blades", "maintenance")
+async def get_dashboard_summary(db: AsyncSession = Depends(get_async_db)):
+    year = date.today().year
+    analytics = await columnar.analytics(db)
+    if analytics:
+        return {
+            "totalBlades": await db.scalar(text("SELECT COUNT(*) FROM blades")),
+            "totalMaintenances": len(analytics),
+            "pending": analytics.count("status", "Pending"),
+            "maintainedThisYear": analytics.distinct_blades_between(date(year, 1, 1), date(year + 1, 1, 1)),
+        }
+
+    # One round trip: totals/pending come from the status rollup, the rest from scalar subqueries
+    total_blades, total_maintenances, pending, maintained_this_year = (await db.execute(text("""
+        SELECT
+            (SELECT COUNT(*) FROM blades),
+            (SELECT SUM(count) FROM rollup_status_counts),
+            (SELECT SUM(count) FROM rollup_status_counts WHERE status = 'Pending'),
+            (SELECT COUNT(DISTINCT blade_id)
+             FROM maintenance
+             WHERE date >= :year_start AND date < :next_year)
+    """), {"year_start": date(year, 1, 1), "next_year": date(year + 1, 1, 1)})).one()
 
     return {
         "totalBlades": total_blades or 0,
@@ -36,80 +72,137 @@ def get_dashboard_summary(db: Session = Depends(get_db)):
     }
 
 
-@router.get("/trends")
-def get_maintenance_trends(db: Session = Depends(get_db)):
-    status_counts = db.execute(text("SELECT status, COUNT(*) FROM maintenance GROUP BY status")).fetchall()
-    issue_counts = db.execute(text("SELECT issue, COUNT(*) FROM maintenance GROUP BY issue")).fetchall()
-    trend_data = db.execute(text("""
-        SELECT TO_CHAR(date, 'Mon') AS month, COUNT(*)
-        FROM maintenance
-        WHERE date >= CURRENT_DATE - INTERVAL '12 months'
-        GROUP BY month
-        ORDER BY MIN(date)
-    """)).fetchall()
+@router.get("/trends", dependencies=[Depends(conditional("maintenance"))])
+@cached("maintenance")
+async def get_maintenance_trends(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Unbounded: all-time status/issue counts and the last 12 months' trend by month name. With either
+    # bound, all three cover date_from (default: a year before date_to) through date_to, and the trend
+    # is per 'YYYY-MM' so ranges longer than a year keep their years apart.
+    bounded = bool(date_from or date_to)
+    dates = DateRange(date_from or _year_before(date_to or date.today()), date_to)
+    analytics = await columnar.analytics(db)
+    if analytics:
+        within = analytics.between(dates.date_from, dates.date_to) if bounded else None
+        status_counts = analytics.counts("status", within)
+        issue_counts = analytics.counts("issue", within)
+        trend_data = analytics.months(within) if bounded else analytics.month_of_year_trend(dates.date_from)
+    else:
+        if bounded:
+            where, params = maintenance_where(dates=dates)
+            status_counts = (await db.execute(text(f"SELECT status, COUNT(*) FROM maintenance {where} GROUP BY status"), params)).fetchall()
+            issue_counts = (await db.execute(text(f"SELECT issue, COUNT(*) FROM maintenance {where} GROUP BY issue"), params)).fetchall()
+        else:
+            where, params = maintenance_where(dates=DateRange(dates.date_from))
+            status_counts = (await db.execute(text("SELECT status, count FROM rollup_status_counts WHERE count > 0"))).fetchall()
+            issue_counts = (await db.execute(text("SELECT issue, count FROM rollup_issue_counts WHERE count > 0"))).fetchall()
+        month = month_label(db.get_bind().dialect.name, by_year=bounded)
+        trend_data = (await db.execute(text(f"""
+            SELECT {month} AS month, COUNT(*)
+            FROM maintenance
+            {where}
+            GROUP BY month
+            ORDER BY MIN(date)
+        """), params)).fetchall()
 
     return {
-        "statusCounts": [{"status": row[0], "count": row[1]} for row in status_counts],
-        "issueDistribution": [{"issue": row[0], "value": row[1]} for row in issue_counts],
+        "statusCounts": [{"status": _group(row[0]), "count": row[1]} for row in status_counts],
+        "issueDistribution": [{"issue": _group(row[0]), "value": row[1]} for row in issue_counts],
         "monthlyTrend": [{"month": row[0], "count": row[1]} for row in trend_data],
     }
 
-@router.get("/priority")
-def get_priority_list(db: Session = Depends(get_db)):
-    rows = db.execute(text("""
-        SELECT blade_id, issue, status, date, technician
-        FROM maintenance
-        WHERE status != 'Completed'
-        ORDER BY status ASC, date ASC
-        LIMIT 10
-    """)).fetchall()
-
+@router.get("/priority", dependencies=[Depends(conditional("maintenance", "blades", "turbines"))])
+async def get_priority_list(
+    response: Response,
+    site_id: Optional[str] = None,
+    limit: int = Query(PRIORITY_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Blades with open issues, each with its most urgent (oldest) open entry, oldest entry first
+    states = await async_crud.get_blade_states(db, open_only=True, site_id=site_id, limit=limit + 1,
+                                               after=_state_cursor(after), order_by="open_date")
+    states = paginate(response, states, limit, lambda s: [s.open_date, s.blade_id])
     return [
         {
-            "bladeId": row[0],
-            "issue": row[1],
-            "status": row[2],
-            "date": row[3].isoformat() if row[3] else None,
-            "technician": row[4]
+            "bladeId": state.blade_id,
+            "siteId": state.site_id,
+            "issue": state.open_issue,
+            "status": state.open_status,
+            "date": state.open_date.isoformat() if state.open_date not in (None, blade_state.UNDATED_OPEN) else None,
+            "technician": state.open_technician,
+            "openIssues": state.open_issue_count,
+            "nextDue": _next_due(state),
         }
-        for row in rows
+        for state in states
     ]
 
-@router.get("/issues-by-site")
-def get_issues_by_site(db: Session = Depends(get_db)):
-    rows = db.execute(text("""
-        SELECT s.site_id, m.issue, COUNT(*)
-        FROM maintenance m
-        JOIN blades b ON m.blade_id = b.blade_id
-        JOIN turbines t ON b.turbine_id = t.turbine_id
-        JOIN sites s ON t.site_id = s.site_id
-        GROUP BY s.site_id, m.issue
-    """)).fetchall()
+@router.get(
+    "/issues-by-site",
+    dependencies=[Depends(conditional("maintenance", "blades", "turbines", "sites"))],
+)
+@cached("maintenance", "blades", "turbines", "sites")
+async def get_issues_by_site(db: AsyncSession = Depends(get_async_db)):
+    rows = (await db.execute(text("""
+        SELECT site_id, issue, count
+        FROM rollup_site_issue_counts
+        WHERE count > 0
+    """))).fetchall()
     result = {}
     for site_id, issue, count in rows:
         if site_id not in result:
             result[site_id] = {}
-        result[site_id][issue] = count
+        result[site_id][_group(issue)] = count
     return result
 
-@router.get("/technician-workload")
-def get_technician_workload(db: Session = Depends(get_db)):
-    rows = db.execute(text("SELECT technician, COUNT(*) FROM maintenance GROUP BY technician")).fetchall()
-    return [{"technician": row[0], "count": row[1]} for row in rows]
+@router.get("/technician-workload", dependencies=[Depends(conditional("maintenance"))])
+@cached("maintenance")
+async def get_technician_workload(db: AsyncSession = Depends(get_async_db)):
+    analytics = await columnar.analytics(db)
+    if analytics:
+        rows = analytics.counts("technician")
+    else:
+        rows = (await db.execute(text("""
+            SELECT technician, SUM(count)
+            FROM rollup_technician_status_counts
+            GROUP BY technician
+            HAVING SUM(count) > 0
+        """))).fetchall()
+    return [{"technician": _group(row[0]), "count": row[1]} for row in rows]
 
-@router.get("/technicians")
-def get_technicians(db: Session = Depends(get_db)):
-    rows = db.execute(text("SELECT DISTINCT technician FROM maintenance WHERE technician IS NOT NULL")).fetchall()
+@router.get("/technicians", dependencies=[Depends(conditional("maintenance"))])
+@cached("maintenance")
+async def get_technicians(db: AsyncSession = Depends(get_async_db)):
+    analytics = await columnar.analytics(db)
+    if analytics:
+        return [technician for technician, _ in analytics.counts("technician") if technician is not None]
+    rows = (await db.execute(text("""
+        SELECT technician
+        FROM rollup_technician_status_counts
+        WHERE technician != :null_key
+        GROUP BY technician
+        HAVING SUM(count) > 0
+    """), {"null_key": NULL_KEY})).fetchall()
     return [row[0] for row in rows]
 
-@router.get("/technicians/{technician_name}/maintenance")
-def get_maintenance_by_technician(technician_name: str, db: Session = Depends(get_db)):
-    rows = db.execute(text("""
+@router.get("/technicians/{technician_name}/maintenance", dependencies=[Depends(conditional("maintenance"))])
+@cached("maintenance")
+async def get_maintenance_by_technician(
+    technician_name: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    where, params = maintenance_where("technician = :technician", dates=DateRange(date_from, date_to))
+    rows = (await db.execute(text(f"""
         SELECT blade_id, issue, status, date
         FROM maintenance
-        WHERE technician = :technician
+        {where}
         ORDER BY date DESC
-    """), {"technician": technician_name}).fetchall()
+    """).columns(date=Date), {"technician": technician_name, **params})).fetchall()
     return [
         {
             "bladeId": row[0],
@@ -120,42 +213,155 @@ def get_maintenance_by_technician(technician_name: str, db: Session = Depends(ge
         for row in rows
     ]
 
-@router.get("/recurring-issues")
-def get_recurring_issues(db: Session = Depends(get_db)):
-    rows = db.execute(text("""
-        SELECT blade_id, issue, COUNT(*)
-        FROM maintenance
-        GROUP BY blade_id, issue
-        HAVING COUNT(*) >= 2
-    """)).fetchall()
+@router.get("/recurring-issues", dependencies=[Depends(conditional("maintenance"))])
+@cached("maintenance")
+async def get_recurring_issues(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    analytics = await columnar.analytics(db)
+    if analytics:
+        rows = analytics.recurring_issues(min_count=2, mask=analytics.between(date_from, date_to))
+    else:
+        where, params = maintenance_where(dates=DateRange(date_from, date_to))
+        rows = (await db.execute(text(f"""
+            SELECT blade_id, issue, COUNT(*)
+            FROM maintenance
+            {where}
+            GROUP BY blade_id, issue
+            HAVING COUNT(*) >= 2
+        """), params)).fetchall()
     return [
         {"bladeId": row[0], "issue": row[1], "count": row[2]}
         for row in rows
     ]
 
-@router.get("/problem-blades")
-def get_problem_blades(db: Session = Depends(get_db)):
-    rows = db.execute(text("""
-        SELECT blade_id, COUNT(*) as maintenance_count
-        FROM maintenance
-        GROUP BY blade_id
-        ORDER BY maintenance_count DESC
-        LIMIT 5
-    """)).fetchall()
+@router.get("/problem-blades", dependencies=[Depends(conditional("maintenance"))])
+@cached("maintenance")
+async def get_problem_blades(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    analytics = await columnar.analytics(db)
+    if analytics:
+        rows = analytics.problem_blades(limit=5, mask=analytics.between(date_from, date_to))
+    else:
+        where, params = maintenance_where(dates=DateRange(date_from, date_to))
+        rows = (await db.execute(text(f"""
+            SELECT blade_id, COUNT(*) as maintenance_count
+            FROM maintenance
+            {where}
+            GROUP BY blade_id
+            ORDER BY maintenance_count DESC
+            LIMIT 5
+        """), params)).fetchall()
     return [
         {"bladeId": row[0], "maintenanceCount": row[1]}
         for row in rows
     ]
 
-@router.get("/blades-due")
-def get_blades_due_for_inspection(db: Session = Depends(get_db)):
-    rows = db.execute(text("""
-        SELECT blade_id, MAX(date) as last_date
-        FROM maintenance
-        GROUP BY blade_id
-        HAVING MAX(date) < CURRENT_DATE - INTERVAL '180 days'
-    """)).fetchall()
+@router.get("/blades-due", dependencies=[Depends(conditional("maintenance", "blades", "turbines"))])
+async def get_blades_due_for_inspection(
+    response: Response,
+    site_id: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Blades past their inspection interval (or never serviced), most overdue first
+    limit = page_limit(limit, after)
+    states = await async_crud.get_blade_states(db, due_before=date.today(), site_id=site_id, limit=fetch_limit(limit),
+                                               after=_state_cursor(after))
+    states = paginate(response, states, limit, lambda s: [s.next_due_date, s.blade_id])
     return [
-        {"bladeId": row[0], "lastMaintained": row[1].isoformat() if row[1] else None}
-        for row in rows
+        {
+            "bladeId": state.blade_id,
+            "siteId": state.site_id,
+            "lastMaintained": state.last_service_date.isoformat() if state.last_service_date else None,
+            "nextDue": _next_due(state),
+            "openIssues": state.open_issue_count,
+        }
+        for state in states
     ]
+
+@cached("maintenance")
+async def get_blade_issue_widgets(db: AsyncSession):
+    if columnar.ENABLED:
+        # Nothing to share in memory; each widget is its own vectorized pass
+        return {
+            "recurring-issues": await get_recurring_issues(db=db),
+            "problem-blades": await get_problem_blades(db=db),
+        }
+
+    # recurring-issues and problem-blades share a single GROUP BY blade_id, issue scan
+    rows = (await db.execute(text("""
+        WITH per_issue AS (
+            SELECT blade_id, issue, COUNT(*) AS cnt
+            FROM maintenance
+            GROUP BY blade_id, issue
+        ),
+        top_blades AS (
+            SELECT blade_id, SUM(cnt) AS total
+            FROM per_issue
+            GROUP BY blade_id
+            ORDER BY total DESC
+            LIMIT 5
+        )
+        SELECT 'recurring', blade_id, issue, cnt FROM per_issue WHERE cnt >= 2
+        UNION ALL
+        SELECT 'problem', blade_id, NULL, total FROM top_blades
+    """))).fetchall()
+    problem = sorted((row for row in rows if row[0] == "problem"), key=lambda row: row[3], reverse=True)
+    return {
+        "recurring-issues": [
+            {"bladeId": row[1], "issue": row[2], "count": row[3]} for row in rows if row[0] == "recurring"
+        ],
+        "problem-blades": [{"bladeId": row[1], "maintenanceCount": row[3]} for row in problem],
+    }
+
+BUNDLE_WIDGETS = {
+    "summary": get_dashboard_summary,
+    "trends": get_maintenance_trends,
+    # Paginated widgets contribute what the plain GET returns
+    "priority": lambda db: get_priority_list(Response(), site_id=None, limit=PRIORITY_PAGE_SIZE, after=None, db=db),
+    "issues-by-site": get_issues_by_site,
+    "technician-workload": get_technician_workload,
+    "problem-blades": get_problem_blades,
+    "blades-due": lambda db: get_blades_due_for_inspection(Response(), site_id=None, limit=None, after=None, db=db),
+    "recurring-issues": get_recurring_issues,
+}
+SHARED_SCANS = {frozenset({"recurring-issues", "problem-blades"}): get_blade_issue_widgets}
+
+async def _run_widget(fn):
+    # Each widget gets its own session, so the queries run side by side on separate pooled connections
+    async with AsyncSessionLocal() as db:
+        return await fn(db=db)
+
+@router.get("/bundle", dependencies=[Depends(conditional("maintenance", "blades", "turbines", "sites"))])
+async def get_dashboard_bundle(widgets: Optional[str] = Query(None, description="Comma-separated widget names (default: all)")):
+    names = [w.strip() for w in widgets.split(",") if w.strip()] if widgets else list(BUNDLE_WIDGETS)
+    unknown = [name for name in names if name not in BUNDLE_WIDGETS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"❌ Unknown widget(s): {', '.join(unknown)}")
+
+    jobs, pending = {}, set(names)
+    for group, fn in SHARED_SCANS.items():
+        if group <= pending:
+            jobs[group] = _run_widget(fn)
+            pending -= group
+    for name in pending:
+        jobs[name] = _run_widget(BUNDLE_WIDGETS[name])
+
+    results = {}
+    for job, value in zip(jobs, await asyncio.gather(*jobs.values())):
+        if isinstance(job, frozenset):
+            results.update({name: value[name] for name in job})
+        else:
+            results[job] = value
+    return {name: results[name] for name in names}
+
+@router.get("/cache-stats")
+def get_cache_stats():
+    return result_cache.stats()
@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+import zlib
+from enum import Enum
+from typing import Optional
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from app.database import SessionLocal
+from app.models.models import Blade, Maintenance, Site, Turbine
+from app.utils.filters import MaintenanceFilters, apply_maintenance_filters
+
+router = APIRouter()
+
+EXPORT_BATCH_SIZE = 2000
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+MEDIA_TYPES = {ExportFormat.ndjson: "application/x-ndjson", ExportFormat.csv: "text/csv"}
+
+def _encode(columns: list, rows, fmt: ExportFormat) -> bytes:
+    if fmt == ExportFormat.csv:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
+    return "".join(json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in rows).encode()
+
+def stream_export(stmt, fmt: ExportFormat, compress: bool):
+    # Owns its session: the request-scoped one may be closed before the body finishes streaming.
+    # yield_per turns on server-side cursors, so only one batch is ever held in memory.
+    db = SessionLocal()
+    gzip = zlib.compressobj(wbits=31) if compress else None
+    try:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        columns = list(result.keys())
+        if fmt == ExportFormat.csv:
+            header = _encode(columns, [columns], fmt)
+            yield gzip.compress(header) if gzip else header
+        for batch in result.partitions():
+            chunk = _encode(columns, batch, fmt)
+            yield gzip.compress(chunk) if gzip else chunk
+        if gzip:
+            yield gzip.flush()
+    finally:
+        db.close()
+
+def export_response(stmt, name: str, fmt: ExportFormat, compress: bool) -> StreamingResponse:
+    headers = {"Content-Disposition": f'attachment; filename="{name}.{fmt.value}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(stream_export(stmt, fmt, compress), media_type=MEDIA_TYPES[fmt], headers=headers)
+
+@router.get("/sites")
+def export_sites(format: ExportFormat = ExportFormat.ndjson, gzip: bool = False):
+    stmt = select(Site.site_id, Site.name, Site.location).order_by(Site.site_id)
+    return export_response(stmt, "sites", format, gzip)
+
+@router.get("/turbines")
+def export_turbines(site_id: Optional[str] = None, format: ExportFormat = ExportFormat.ndjson, gzip: bool = False):
+    stmt = select(Turbine.turbine_id, Turbine.site_id, Turbine.model).order_by(Turbine.turbine_id)
+    if site_id:
+        stmt = stmt.where(Turbine.site_id == site_id)
+    return export_response(stmt, "turbines", format, gzip)
+
+@router.get("/blades")
+def export_blades(turbine_id: Optional[str] = None, format: ExportFormat = ExportFormat.ndjson, gzip: bool = False):
+    stmt = select(Blade.blade_id, Blade.turbine_id, Blade.type, Blade.length).order_by(Blade.blade_id)
+    if turbine_id:
+        stmt = stmt.where(Blade.turbine_id == turbine_id)
+    return export_response(stmt, "blades", format, gzip)
+
+@router.get("/maintenance")
+def export_maintenance(
+    filters: MaintenanceFilters = Depends(),
+    format: ExportFormat = ExportFormat.ndjson,
+    gzip: bool = False,
+):
+    stmt = select(
+        Maintenance.maintenance_id, Maintenance.blade_id, Maintenance.date,
+        Maintenance.status, Maintenance.issue, Maintenance.technician,
+    ).order_by(Maintenance.maintenance_id)
+    return export_response(apply_maintenance_filters(stmt, filters), "maintenance", format, gzip)
+
+@router.get("/fleet")
+def export_fleet(site_id: Optional[str] = None, format: ExportFormat = ExportFormat.ndjson, gzip: bool = False):
+    # One flat row per maintenance record, with blades/turbines/sites that have none still listed
+    stmt = (
+        select(
+            Site.site_id, Site.name.label("site_name"), Site.location,
+            Turbine.turbine_id, Turbine.model.label("turbine_model"),
+            Blade.blade_id, Blade.type.label("blade_type"), Blade.length,
+            Maintenance.maintenance_id, Maintenance.date, Maintenance.status,
+            Maintenance.issue, Maintenance.technician,
+        )
+        .select_from(Site)
+        .outerjoin(Turbine, Turbine.site_id == Site.site_id)
+        .outerjoin(Blade, Blade.turbine_id == Turbine.turbine_id)
+        .outerjoin(Maintenance, Maintenance.blade_id == Blade.blade_id)
+        .order_by(Site.site_id, Turbine.turbine_id, Blade.blade_id, Maintenance.date)
+    )
+    if site_id:
+        stmt = stmt.where(Site.site_id == site_id)
+    return export_response(stmt, "fleet", format, gzip)
@@ -0,0 +1,52 @@
+from enum import Enum
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import async_crud
+from app.database import get_async_db
+from app.utils.cache import cached
+from app.utils.pagination import MAX_PAGE_SIZE
+from app.utils.table_versions import conditional
+
+router = APIRouter()
+
+class HierarchyLevel(str, Enum):
+    fleet = "fleet"
+    site = "site"
+    turbine = "turbine"
+    blade = "blade"
+
+class RollupSort(str, Enum):
+    maintenance_count = "maintenance_count"
+    open_issues = "open_issues"
+    last_service = "last_service"
+    blade_count = "blade_count"
+    id = "id"
+
+@router.get("/rollup", dependencies=[Depends(conditional("maintenance", "blades", "turbines", "sites"))])
+@cached("maintenance", "blades", "turbines", "sites")
+async def get_hierarchy_rollup(
+    level: HierarchyLevel = HierarchyLevel.site,
+    site_id: Optional[str] = None,
+    turbine_id: Optional[str] = None,
+    sort: RollupSort = RollupSort.maintenance_count,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    top: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows = await async_crud.get_hierarchy_rollup(
+        db, level.value, site_id=site_id, turbine_id=turbine_id,
+        sort=sort.value, descending=order == "desc", limit=top,
+    )
+    return [
+        {
+            "level": level.value,
+            "id": row.id,
+            "name": row.name,
+            "bladeCount": row.blade_count,
+            "maintenanceCount": row.maintenance_count,
+            "openIssues": row.open_issues,
+            "lastService": row.last_service.isoformat() if row.last_service else None,
+        }
+        for row in rows
+    ]
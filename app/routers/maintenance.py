@@ -1,29 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.schemas.schemas import MaintenanceCreate, MaintenanceUpdate, MaintenanceResponse
-from app.crud import crud
-from app import database
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.schemas import BulkResponse, MaintenanceBulkUpdate, MaintenanceCreate, MaintenanceUpdate, MaintenanceResponse
+from app.crud import async_crud
+from app.database import get_async_db
+from app.utils.filters import MaintenanceFilters
+from app.utils.pagination import MAX_PAGE_SIZE, decode_cursor, fetch_limit, page_limit, paginate
+from app.utils.serialization import json_response
+from app.utils.table_versions import conditional
 
 router = APIRouter()
 
-def get_db():
-    db = database.SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-@router.get("", response_model=list[MaintenanceResponse])
-def list_maintenance(db: Session = Depends(get_db)):
-    return crud.get_maintenance_records(db)
+@router.get(
+    "", response_model=list[MaintenanceResponse],
+    dependencies=[Depends(conditional("maintenance", "blades", "turbines"))],
+)
+async def list_maintenance(
+    response: Response,
+    filters: MaintenanceFilters = Depends(),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    limit = page_limit(limit, after)
+    after_id = decode_cursor(after, 1)[0] if after else None
+    records = await async_crud.get_maintenance_rows(db, filters, limit=fetch_limit(limit), after=after_id)
+    return json_response(paginate(response, records, limit, lambda m: [m["maintenance_id"]]), response)
 
 @router.post("", response_model=MaintenanceResponse)
-def add_maintenance(entry: MaintenanceCreate, db: Session = Depends(get_db)):
-    return crud.create_maintenance(db, entry)
+async def add_maintenance(entry: MaintenanceCreate, db: AsyncSession = Depends(get_async_db)):
+    return await async_crud.create_maintenance(db, entry)
+
+@router.post("/bulk", response_model=BulkResponse)
+async def add_maintenance_bulk(entries: list[MaintenanceCreate], db: AsyncSession = Depends(get_async_db)):
+    return await async_crud.bulk_create_maintenance(db, entries)
+
+@router.patch("/bulk", response_model=BulkResponse)
+async def update_maintenance_bulk(updates: list[MaintenanceBulkUpdate], db: AsyncSession = Depends(get_async_db)):
+    return await async_crud.bulk_update_maintenance(db, updates)
 
 @router.put("/{maintenance_id}", response_model=MaintenanceResponse)
-def update_maintenance_entry(maintenance_id: int, updates: MaintenanceUpdate, db: Session = Depends(get_db)):
-    record = crud.update_maintenance(db, maintenance_id, updates)
+async def update_maintenance_entry(maintenance_id: int, updates: MaintenanceUpdate, db: AsyncSession = Depends(get_async_db)):
+    record = await async_crud.update_maintenance(db, maintenance_id, updates)
     if not record:
         raise HTTPException(status_code=404, detail="Maintenance record not found")
     return record
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from app.database import POOL_SETTINGS, engine_pools
+from app.utils.cache import result_cache
+from app.utils.instrumentation import metrics, pool_status
+
+router = APIRouter()
+
+@router.get("")
+def get_metrics():
+    pools = {name: pool_status(pool, POOL_SETTINGS["max_overflow"]) for name, pool in engine_pools().items()}
+    return {**metrics.snapshot(), "pools": pools, "cache": result_cache.stats()}
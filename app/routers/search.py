@@ -0,0 +1,35 @@
+from enum import Enum
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.utils.pagination import MAX_PAGE_SIZE, decode_cursor, paginate
+from app.utils.search import KINDS, cursor_key, search
+from app.utils.serialization import json_response
+from app.utils.table_versions import conditional
+
+router = APIRouter()
+
+SEARCH_PAGE_SIZE = 20
+
+class SearchKind(str, Enum):
+    site = "site"
+    turbine = "turbine"
+    blade = "blade"
+    maintenance = "maintenance"
+
+@router.get("", dependencies=[Depends(conditional("sites", "turbines", "blades", "maintenance"))])
+async def search_fleet(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="ID prefix (e.g. B018) or issue/technician words"),
+    kind: Optional[SearchKind] = None,
+    limit: int = Query(SEARCH_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Sites/turbines/blades whose ID starts with q, then maintenance records ranked by matched words
+    after_key = cursor_key(decode_cursor(after, 3)) if after else None
+    kinds = [kind.value] if kind else list(KINDS)
+    hits = await search(db, q, kinds, limit + 1, after_key)
+    hits = paginate(response, hits, limit, lambda hit: [hit.score, hit.kind, hit.id])
+    return json_response([hit.as_json() for hit in hits], response)
@@ -1,54 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session,joinedload
-from app.schemas.schemas import SiteCreate, SiteResponse, TopSiteStats,TurbineCreate, TurbineResponse
-from collections import defaultdict
-from app.crud import crud
-from app import database
-from app.models.models import Maintenance, Site,Blade,Turbine
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.schemas import SiteCreate, SiteListing, SiteResponse, TopSiteStats, TurbineListing
+from app.crud import async_crud
+from app.crud.crud import RESOURCES
+from app.database import get_async_db
+from app.utils.fieldsets import Fieldset, fieldset_params
+from app.utils.pagination import MAX_PAGE_SIZE, decode_cursor, fetch_limit, page_limit, paginate
+from app.utils.serialization import json_response
+from app.utils.table_versions import conditional
 
 router = APIRouter()
-
-def get_db():
-    db = database.SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-@router.get("", response_model=list[SiteResponse])
-def list_sites(db: Session = Depends(get_db)):
-    return crud.get_sites(db)
+site_fieldset = fieldset_params(RESOURCES["site"])
+turbine_fieldset = fieldset_params(RESOURCES["turbine"])
+
+@router.get("", response_model=list[SiteListing], dependencies=[Depends(conditional("sites", "turbines"))])
+async def list_sites(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fieldset: Fieldset = Depends(site_fieldset),
+    db: AsyncSession = Depends(get_async_db),
+):
+    limit = page_limit(limit, after)
+    after_id = decode_cursor(after, 1)[0] if after else None
+    sites = await async_crud.get_site_rows(db, limit=fetch_limit(limit), after=after_id, fieldset=fieldset)
+    return json_response(paginate(response, sites, limit, lambda s: [s["site_id"]]), response)
 
 @router.post("", response_model=SiteResponse)
-def add_site(site: SiteCreate, db: Session = Depends(get_db)):
-    return crud.create_site(db, site)
-
-@router.get("/{site_id}/turbines", response_model=list[TurbineResponse])
-def turbines_by_site(site_id: str, db: Session = Depends(get_db)):
-    return crud.get_turbines_by_site(db, site_id)
-
-@router.get("/top_sites_by_maintenance", response_model=list[TopSiteStats])
-def top_sites_by_maintenance(db: Session = Depends(get_db)):
-    # Load all relationships via joins
-    maints = db.query(Maintenance).join(Blade).join(Turbine).join(Site).options(
-        joinedload(Maintenance.blade).joinedload(Blade.turbine).joinedload(Turbine.site)
-    ).all()
-
-    count_map = defaultdict(int)
-
-    for m in maints:
-        site_id = m.blade.turbine.site.site_id
-        count_map[site_id] += 1
-
-    site_names = {
-        s.site_id: s.name for s in db.query(Site).all()
-    }
-
-    top_sites = sorted(
-        [{"site_id": sid, "name": site_names.get(sid, sid), "total": count}
-         for sid, count in count_map.items()],
-        key=lambda x: x["total"],
-        reverse=True
-    )[:5]
-
-    return top_sites
+async def add_site(site: SiteCreate, db: AsyncSession = Depends(get_async_db)):
+    return await async_crud.create_site(db, site)
+
+@router.get(
+    "/{site_id}/turbines", response_model=list[TurbineListing],
+    dependencies=[Depends(conditional("turbines", "sites"))],
+)
+async def turbines_by_site(site_id: str, response: Response, fieldset: Fieldset = Depends(turbine_fieldset),
+                           db: AsyncSession = Depends(get_async_db)):
+    return json_response(await async_crud.get_turbine_rows(db, site_id=site_id, fieldset=fieldset), response)
+
+@router.get(
+    "/top_sites_by_maintenance", response_model=list[TopSiteStats],
+    dependencies=[Depends(conditional("maintenance", "blades", "turbines", "sites"))],
+)
+async def top_sites_by_maintenance(db: AsyncSession = Depends(get_async_db)):
+    rows = await async_crud.get_hierarchy_rollup(db, "site", limit=5)
+    return [{"site_id": row.id, "name": row.name or row.id, "total": row.maintenance_count} for row in rows if row.maintenance_count]
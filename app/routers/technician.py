@@ -1,46 +1,68 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-from app.database import SessionLocal
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Date, text
+from app.crud import async_crud
+from app.crud.crud import technician_profiles
+from app.database import get_async_db
+from app.utils import columnar
+from app.utils.cache import cached
+from app.utils.rollups import NULL_KEY
+from app.utils.filters import DateRange, MaintenanceFilters, maintenance_where, month_label
+from app.utils.pagination import MAX_PAGE_SIZE, decode_cursor, fetch_limit, page_limit, paginate
+from app.utils.table_versions import conditional
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # 1. /technicians -> list of all unique technician names
-@router.get("/technicians")
-def get_technicians(db: Session = Depends(get_db)):
-    rows = db.execute(text("""
-        SELECT DISTINCT technician FROM maintenance
-        WHERE technician IS NOT NULL
-    """)).fetchall()
+@router.get("/technicians", dependencies=[Depends(conditional("maintenance"))])
+@cached("maintenance")
+async def get_technicians(db: AsyncSession = Depends(get_async_db)):
+    analytics = await columnar.analytics(db)
+    if analytics:
+        return [technician for technician, _ in analytics.counts("technician") if technician is not None]
+    rows = (await db.execute(text("""
+        SELECT technician FROM rollup_technician_status_counts
+        WHERE technician != :null_key
+        GROUP BY technician
+        HAVING SUM(count) > 0
+    """), {"null_key": NULL_KEY})).fetchall()
     return [row[0] for row in rows]
 
 # 2. /technician-workload -> count of tasks per technician
-@router.get("/technician-workload")
-def get_technician_workload(db: Session = Depends(get_db)):
-    rows = db.execute(text("""
-        SELECT technician, COUNT(*) as task_count 
-        FROM maintenance
-        WHERE technician IS NOT NULL
-        GROUP BY technician
-    """)).fetchall()
+@router.get("/technician-workload", dependencies=[Depends(conditional("maintenance"))])
+@cached("maintenance")
+async def get_technician_workload(db: AsyncSession = Depends(get_async_db)):
+    analytics = await columnar.analytics(db)
+    if analytics:
+        rows = [row for row in analytics.counts("technician") if row[0] is not None]
+    else:
+        rows = (await db.execute(text("""
+            SELECT technician, SUM(count) as task_count
+            FROM rollup_technician_status_counts
+            WHERE technician != :null_key
+            GROUP BY technician
+            HAVING SUM(count) > 0
+        """), {"null_key": NULL_KEY})).fetchall()
     return [{"technician": row[0], "count": row[1]} for row in rows]
 
 # 3. /technicians/{technician}/maintenance
-@router.get("/technicians/{technician_name}/maintenance")
-def get_technician_maintenance(technician_name: str, db: Session = Depends(get_db)):
-    rows = db.execute(text("""
+@router.get("/technicians/{technician_name}/maintenance", dependencies=[Depends(conditional("maintenance"))])
+@cached("maintenance")
+async def get_technician_maintenance(
+    technician_name: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    where, params = maintenance_where("technician = :technician", dates=DateRange(date_from, date_to))
+    rows = (await db.execute(text(f"""
         SELECT blade_id, issue, status, date 
         FROM maintenance 
-        WHERE technician = :technician
+        {where}
         ORDER BY date DESC
-    """), {"technician": technician_name}).fetchall()
+    """).columns(date=Date), {"technician": technician_name, **params})).fetchall()
     return [
         {
             "bladeId": row[0],
@@ -51,86 +73,188 @@ def get_technician_maintenance(technician_name: str, db: Session = Depends(get_d
     ]
 
 # 4. /all-maintenance
-@router.get("/all-maintenance")
-def get_all_maintenance(db: Session = Depends(get_db)):
-    rows = db.execute(text("""
-        SELECT technician, blade_id, issue, status, date 
-        FROM maintenance
-        ORDER BY date DESC
-    """)).fetchall()
+@router.get("/all-maintenance", dependencies=[Depends(conditional("maintenance", "blades", "turbines"))])
+async def get_all_maintenance(
+    response: Response,
+    filters: MaintenanceFilters = Depends(),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    limit = page_limit(limit, after)
+    cursor = None
+    if after:
+        after_date, after_id = decode_cursor(after, 2)
+        try:
+            cursor = (date.fromisoformat(after_date), int(after_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="❌ Invalid pagination cursor.")
+    rows = await async_crud.get_maintenance_records(db, filters, limit=fetch_limit(limit), after=cursor,
+                                                    newest_first=True)
+    rows = paginate(response, rows, limit, lambda m: [m.date, m.maintenance_id])
     return [
         {
-            "technician": row[0],
-            "bladeId": row[1],
-            "issue": row[2],
-            "status": row[3],
-            "date": row[4].isoformat() if row[4] else None
+            "technician": row.technician,
+            "bladeId": row.blade_id,
+            "issue": row.issue,
+            "status": row.status,
+            "date": row.date.isoformat() if row.date else None
         } for row in rows
     ]
 
 # 5. /status-counts -> status-wise count for all technicians
-@router.get("/status-counts")
-def get_status_counts(db: Session = Depends(get_db)):
-    rows = db.execute(text("""
-        SELECT status, COUNT(*) 
-        FROM maintenance
-        WHERE technician IS NOT NULL
-        GROUP BY status
-    """)).fetchall()
-    return [{"status": row[0], "count": row[1]} for row in rows]
+@router.get("/status-counts", dependencies=[Depends(conditional("maintenance"))])
+@cached("maintenance")
+async def get_status_counts(db: AsyncSession = Depends(get_async_db)):
+    analytics = await columnar.analytics(db)
+    if analytics:
+        rows = analytics.status_counts(technicians_only=True)
+    else:
+        rows = (await db.execute(text("""
+            SELECT status, SUM(count)
+            FROM rollup_technician_status_counts
+            WHERE technician != :null_key
+            GROUP BY status
+            HAVING SUM(count) > 0
+        """), {"null_key": NULL_KEY})).fetchall()
+    return [{"status": row[0] or None, "count": row[1]} for row in rows]
 
 # 6. /technicians/{technician}/issues -> issue-wise count for radar chart
-@router.get("/technicians/{technician_name}/issues")
-def get_technician_issues(technician_name: str, db: Session = Depends(get_db)):
-    rows = db.execute(text("""
-        SELECT issue, COUNT(*) 
-        FROM maintenance
-        WHERE technician = :technician
-        GROUP BY issue
-    """), {"technician": technician_name}).fetchall()
+@router.get("/technicians/{technician_name}/issues", dependencies=[Depends(conditional("maintenance"))])
+@cached("maintenance")
+async def get_technician_issues(
+    technician_name: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    analytics = await columnar.analytics(db)
+    if analytics:
+        rows = analytics.technician_issue_counts(technician_name, analytics.between(date_from, date_to))
+    else:
+        where, params = maintenance_where("technician = :technician", dates=DateRange(date_from, date_to))
+        rows = (await db.execute(text(f"""
+            SELECT issue, COUNT(*)
+            FROM maintenance
+            {where}
+            GROUP BY issue
+        """), {"technician": technician_name, **params})).fetchall()
     return [{"issue": row[0], "count": row[1]} for row in rows]
 
 # 7. /technicians/{technician}/trend -> trend of maintenance counts over months
-@router.get("/technicians/{technician_name}/trend")
-def get_technician_trend(technician_name: str, db: Session = Depends(get_db)):
-    rows = db.execute(text("""
-        SELECT TO_CHAR(date, 'YYYY-MM') AS month, COUNT(*)
-        FROM maintenance
-        WHERE technician = :technician
-        GROUP BY month
-        ORDER BY month
-    """), {"technician": technician_name}).fetchall()
+@router.get("/technicians/{technician_name}/trend", dependencies=[Depends(conditional("maintenance"))])
+@cached("maintenance")
+async def get_technician_trend(
+    technician_name: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    analytics = await columnar.analytics(db)
+    if analytics:
+        rows = analytics.technician_months(technician_name, analytics.between(date_from, date_to))
+    else:
+        where, params = maintenance_where("technician = :technician", dates=DateRange(date_from, date_to))
+        month = month_label(db.get_bind().dialect.name)
+        rows = (await db.execute(text(f"""
+            SELECT {month} AS month, COUNT(*)
+            FROM maintenance
+            {where}
+            GROUP BY month
+            ORDER BY month
+        """), {"technician": technician_name, **params})).fetchall()
     return [{"month": row[0], "count": row[1]} for row in rows]
 
 # 8. /technicians/{technician}/status-counts -> status-wise count for specific technician
-@router.get("/technicians/{technician_name}/status-counts")
-def get_status_counts_for_technician(technician_name: str, db: Session = Depends(get_db)):
-    rows = db.execute(text("""
-        SELECT status, COUNT(*) 
-        FROM maintenance
-        WHERE technician = :technician
-        GROUP BY status
-    """), {"technician": technician_name}).fetchall()
-    
-    return [{"status": row[0], "count": row[1]} for row in rows]
-
-@router.get("/technicians/status-summary")
-def get_overall_status_summary(db: Session = Depends(get_db)):
-    rows = db.execute(text("""
-        SELECT status, COUNT(*) 
-        FROM maintenance
-        GROUP BY status
-    """)).fetchall()
-
-    return {row[0]: row[1] for row in rows}
-
-@router.get("/technicians/summary")
-def get_technician_summary(db: Session = Depends(get_db)):
-    rows = db.execute(text("""
-        SELECT technician, COUNT(*) 
-        FROM maintenance
-        WHERE technician IS NOT NULL
-        GROUP BY technician
-    """)).fetchall()
+@router.get(
+    "/technicians/{technician_name}/status-counts",
+    dependencies=[Depends(conditional("maintenance"))],
+)
+@cached("maintenance")
+async def get_status_counts_for_technician(technician_name: str, db: AsyncSession = Depends(get_async_db)):
+    analytics = await columnar.analytics(db)
+    if analytics:
+        rows = analytics.technician_status_counts(technician_name)
+    else:
+        rows = (await db.execute(text("""
+            SELECT status, count
+            FROM rollup_technician_status_counts
+            WHERE technician = :technician AND count > 0
+        """), {"technician": technician_name})).fetchall()
+
+    return [{"status": row[0] or None, "count": row[1]} for row in rows]
+
+@router.get("/technicians/status-summary", dependencies=[Depends(conditional("maintenance"))])
+@cached("maintenance")
+async def get_overall_status_summary(db: AsyncSession = Depends(get_async_db)):
+    analytics = await columnar.analytics(db)
+    if analytics:
+        rows = analytics.counts("status")
+    else:
+        rows = (await db.execute(text("""
+            SELECT status, count
+            FROM rollup_status_counts
+            WHERE count > 0
+        """))).fetchall()
+
+    return {row[0] or None: row[1] for row in rows}
+
+@router.get("/technicians/summary", dependencies=[Depends(conditional("maintenance"))])
+@cached("maintenance")
+async def get_technician_summary(db: AsyncSession = Depends(get_async_db)):
+    analytics = await columnar.analytics(db)
+    if analytics:
+        rows = [row for row in analytics.counts("technician") if row[0] is not None]
+    else:
+        rows = (await db.execute(text("""
+            SELECT technician, SUM(count)
+            FROM rollup_technician_status_counts
+            WHERE technician != :null_key
+            GROUP BY technician
+            HAVING SUM(count) > 0
+        """), {"null_key": NULL_KEY})).fetchall()
 
     return [{"technician": row[0], "count": row[1]} for row in rows]
+
+def _by_count(counts: dict) -> list:
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0] is None, item[0] or ""))
+
+def _profile(technician: str, profile: Optional[dict]) -> dict:
+    profile = profile or {"total": 0, "issue": {}, "status": {}, "month": {}}
+    months = sorted(profile["month"].items(), key=lambda item: (item[0] is None, item[0] or ""))
+    return {
+        "technician": technician,
+        "total": profile["total"],
+        "issues": [{"issue": issue, "count": count} for issue, count in _by_count(profile["issue"])],
+        "statusCounts": [{"status": status, "count": count} for status, count in _by_count(profile["status"])],
+        "trend": [{"month": month, "count": count} for month, count in months],
+    }
+
+async def _profiles(db: AsyncSession, technician: Optional[str], date_from: Optional[date], date_to: Optional[date]) -> dict:
+    analytics = await columnar.analytics(db)
+    if analytics:
+        return technician_profiles(analytics.technician_profile_rows(technician, date_from, date_to))
+    return await async_crud.get_technician_profiles(db, technician, date_from, date_to)
+
+# 9. /technicians/{technician}/profile -> issues, status counts and monthly trend in one query
+@router.get("/technicians/{technician_name}/profile", dependencies=[Depends(conditional("maintenance"))])
+@cached("maintenance")
+async def get_technician_profile(
+    technician_name: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    profiles = await _profiles(db, technician_name, date_from, date_to)
+    return _profile(technician_name, profiles.get(technician_name))
+
+# 10. /technicians/profiles -> the same for every technician, still one query
+@router.get("/technicians/profiles", dependencies=[Depends(conditional("maintenance"))])
+@cached("maintenance")
+async def get_technician_profiles(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    profiles = await _profiles(db, None, date_from, date_to)
+    return [_profile(technician, profiles[technician]) for technician in sorted(profiles)]
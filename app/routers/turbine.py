@@ -1,26 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.schemas.schemas import TurbineCreate, TurbineResponse, BladeResponse
-from app.crud import crud
-from app import database
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.schemas import TurbineCreate, TurbineListing, TurbineResponse, BladeListing
+from app.crud import async_crud
+from app.crud.crud import RESOURCES
+from app.database import get_async_db
+from app.utils.fieldsets import Fieldset, fieldset_params
+from app.utils.pagination import MAX_PAGE_SIZE, decode_cursor, fetch_limit, page_limit, paginate
+from app.utils.serialization import json_response
+from app.utils.table_versions import conditional
 
 router = APIRouter()
+turbine_fieldset = fieldset_params(RESOURCES["turbine"])
+blade_fieldset = fieldset_params(RESOURCES["blade"])
 
-def get_db():
-    db = database.SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+@router.get(
+    "", response_model=list[TurbineListing],
+    dependencies=[Depends(conditional("turbines", "sites", "blades"))],
+)
+async def list_turbines(
+    response: Response,
+    site_id: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fieldset: Fieldset = Depends(turbine_fieldset),
+    db: AsyncSession = Depends(get_async_db),
+):
+    limit = page_limit(limit, after)
+    after_id = decode_cursor(after, 1)[0] if after else None
+    turbines = await async_crud.get_turbine_rows(db, site_id=site_id, limit=fetch_limit(limit), after=after_id,
+                                                 fieldset=fieldset)
+    return json_response(paginate(response, turbines, limit, lambda t: [t["turbine_id"]]), response)
 
-@router.get("", response_model=list[TurbineResponse])
-def list_turbines(db: Session = Depends(get_db)):
-    return crud.get_turbines(db)
-
-@router.get("/{turbine_id}/blades", response_model=list[BladeResponse])
-def blades_by_turbine(turbine_id: str, db: Session = Depends(get_db)):
-    return crud.get_blades_by_turbine(db, turbine_id)
+@router.get(
+    "/{turbine_id}/blades", response_model=list[BladeListing],
+    dependencies=[Depends(conditional("blades", "maintenance", "turbines"))],
+)
+async def blades_by_turbine(turbine_id: str, response: Response, fieldset: Fieldset = Depends(blade_fieldset),
+                            db: AsyncSession = Depends(get_async_db)):
+    return json_response(await async_crud.get_blade_rows(db, turbine_id=turbine_id, fieldset=fieldset), response)
 
 @router.post("", response_model=TurbineResponse)
-def add_turbine(turbine: TurbineCreate, db: Session = Depends(get_db)):
-    return crud.create_turbine(db, turbine)
+async def add_turbine(turbine: TurbineCreate, db: AsyncSession = Depends(get_async_db)):
+    return await async_crud.create_turbine(db, turbine)
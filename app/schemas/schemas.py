@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional,List
+from typing import Optional,List,Union
 from datetime import date
 
 # -----------------------------
@@ -63,6 +63,9 @@ class MaintenanceUpdate(BaseModel):
     issue: Optional[str] = None
     technician: Optional[str] = None
 
+class MaintenanceBulkUpdate(MaintenanceUpdate):
+    maintenance_id: int
+
 class MaintenanceResponse(BaseModel):
     maintenance_id: int
     blade_id: str
@@ -90,6 +93,7 @@ class BladeCreate(BladeBase):
 class BladeUpdate(BaseModel):
     type: Optional[str] = None
     length: Optional[int] = None
+    turbine_id: Optional[str] = None  # moves the blade to another turbine
 
 class BladeResponse(BaseModel):
     blade_id: str
@@ -101,6 +105,46 @@ class BladeResponse(BaseModel):
     class Config:
         orm_mode = True
 
+# -----------------------------
+# Listing Schemas (?fields= / ?include=)
+# -----------------------------
+# What the site, turbine and blade listings return: the key always, every other field unless
+# ?fields= leaves it out, and the relations ?include= names (blades embed their maintenance
+# by default). Those routes encode their rows themselves, so these only document the shape.
+
+class SiteListing(BaseModel):
+    site_id: str
+    name: str = None
+    location: str = None
+    turbines: List[TurbineResponse] = None
+
+class TurbineListing(BaseModel):
+    turbine_id: str
+    site_id: str = None
+    model: str = None
+    blades: List[BladeBase] = None  # without their maintenance
+    site: Optional[SiteResponse] = None  # null when the site is missing
+
+class BladeListing(BaseModel):
+    blade_id: str
+    turbine_id: str = None
+    type: str = None
+    length: int = None
+    maintenance: List[MaintenanceResponse] = None
+    turbine: Optional[TurbineResponse] = None  # null when the turbine is missing
+
 
 
+# -----------------------------
+# Bulk write Schemas
+# -----------------------------
+
+class BulkItemResult(BaseModel):
+    index: int  # position in the request body
+    id: Optional[Union[int, str]] = None
+    error: Optional[str] = None
 
+class BulkResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
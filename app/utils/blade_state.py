@@ -0,0 +1,88 @@
+from datetime import date
+from sqlalchemy import Date, case, delete, exists, func, insert, or_, select, true, type_coerce
+from sqlalchemy.orm import Session, aliased
+from app.models import models
+from app.utils.utils import dialect_insert
+
+# A blade is due for inspection this long after its last service
+INSPECTION_INTERVAL_DAYS = 180
+# next_due_date of blades without any maintenance: due now, ahead of every real due date
+NEVER_SERVICED_DUE = date(1970, 1, 1)
+# open_date of blades whose open entries are all undated: an unknown age counts as the oldest
+UNDATED_OPEN = date(1970, 1, 1)
+# Maintenance rows in any other status count as open issues
+CLOSED_STATUS = "Completed"
+
+STATE_COLUMNS = [
+    "blade_id", "site_id", "last_service_date", "last_status", "last_issue", "last_technician",
+    "open_issue_count", "open_date", "open_status", "open_issue", "open_technician", "next_due_date",
+]
+
+def _due_after_service(db: Session, service_date):
+    if db.get_bind().dialect.name == "postgresql":
+        return service_date + INSPECTION_INTERVAL_DAYS
+    return type_coerce(func.date(service_date, f"+{INSPECTION_INTERVAL_DAYS} days"), Date)
+
+def _state_select(db: Session, where):
+    # One state row per matching blade: its latest maintenance row (by date, then id), its oldest
+    # open one and an open-issue count, all read per blade off the (blade_id, ...) maintenance indexes
+    b, t, m = models.Blade, models.Turbine, models.Maintenance
+    last, oldest_open = aliased(m), aliased(m)
+    latest_id = (
+        select(m.maintenance_id).where(m.blade_id == b.blade_id)
+        .order_by(m.date.desc().nulls_last(), m.maintenance_id.desc()).limit(1).scalar_subquery()
+    )
+    oldest_open_id = (
+        select(m.maintenance_id).where(m.blade_id == b.blade_id, m.status != CLOSED_STATUS)
+        .order_by(m.date.asc().nulls_first(), m.maintenance_id).limit(1).scalar_subquery()
+    )
+    open_count = (
+        select(func.count()).select_from(m).where(m.blade_id == b.blade_id, m.status != CLOSED_STATUS).scalar_subquery()
+    )
+    return (
+        select(
+            b.blade_id, t.site_id, last.date, last.status, last.issue, last.technician, open_count,
+            # open_date is the priority list's sort key, so it is never NULL while issues are open
+            case((oldest_open.maintenance_id.is_not(None), func.coalesce(oldest_open.date, UNDATED_OPEN))),
+            oldest_open.status, oldest_open.issue, oldest_open.technician,
+            func.coalesce(_due_after_service(db, last.date), NEVER_SERVICED_DUE),
+        )
+        .select_from(b)
+        .outerjoin(t, t.turbine_id == b.turbine_id)
+        .outerjoin(last, last.maintenance_id == latest_id)
+        .outerjoin(oldest_open, oldest_open.maintenance_id == oldest_open_id)
+        # SQLite needs a WHERE on INSERT ... SELECT ... ON CONFLICT, so there always is one
+        .where(where)
+    )
+
+def refresh(db: Session, where):
+    # Recomputes the state of blades matching where (on blades/turbines columns); runs in the caller's transaction
+    stmt = dialect_insert(db, models.BladeState).from_select(STATE_COLUMNS, _state_select(db, where))
+    db.execute(stmt.on_conflict_do_update(index_elements=["blade_id"], set_={c: stmt.excluded[c] for c in STATE_COLUMNS[1:]}))
+
+def refresh_blades(db: Session, blade_ids):
+    if blade_ids:
+        refresh(db, models.Blade.blade_id.in_(list(blade_ids)))
+
+def refresh_new_and_moved(db: Session, moved_sites: set):
+    # After a turbine/blade upsert: blades without a state row yet, and every blade under a site
+    # that gained or lost turbines/blades
+    conditions = [~exists().where(models.BladeState.blade_id == models.Blade.blade_id)]
+    if moved_sites:
+        conditions.append(models.Turbine.site_id.in_(list(moved_sites)))
+    refresh(db, or_(*conditions))
+
+def remove(db: Session, blade_ids):
+    # For blades deleted outside the API (incremental ETL); their state rows go with them
+    if blade_ids:
+        db.execute(delete(models.BladeState).where(models.BladeState.blade_id.in_(list(blade_ids))))
+
+def rebuild(db: Session):
+    db.execute(delete(models.BladeState))
+    db.execute(insert(models.BladeState).from_select(STATE_COLUMNS, _state_select(db, true())))
+
+def backfill(db: Session):
+    # Fills the table once for databases whose blades predate it
+    if db.scalar(select(models.BladeState.blade_id).limit(1)) is None and db.scalar(select(models.Blade.blade_id).limit(1)):
+        rebuild(db)
+        db.commit()
@@ -0,0 +1,130 @@
+import functools
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from app.utils import table_versions
+
+class ResultCache:
+    # In-process LRU + TTL cache for read endpoints. Every entry records the tables it was
+    # computed from; a write to one of those tables in this process drops exactly those entries.
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires_at, tables, value)
+        self._keys_by_table = defaultdict(set)
+        self._generations = defaultdict(int)
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[2]
+
+    def generations(self, tables) -> tuple:
+        with self._lock:
+            return tuple(self._generations[t] for t in tables)
+
+    def set(self, key, value, tables, generations: tuple = None):
+        with self._lock:
+            # A write landed while the value was being computed: it may already be stale
+            if generations is not None and generations != tuple(self._generations[t] for t in tables):
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, tuple(tables), value)
+            for table in tables:
+                self._keys_by_table[table].add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, *tables):
+        with self._lock:
+            for table in tables:
+                self._generations[table] += 1
+                for key in list(self._keys_by_table.pop(table, ())):
+                    if key in self._entries:
+                        self._drop(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_table.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _drop(self, key):
+        _, tables, _ = self._entries.pop(key)
+        for table in tables:
+            self._keys_by_table[table].discard(key)
+
+result_cache = ResultCache(
+    max_entries=int(os.getenv("RESULT_CACHE_SIZE", "512")),
+    ttl_seconds=float(os.getenv("RESULT_CACHE_TTL_SECONDS", "30")),
+)
+
+# Request plumbing that must not become part of the cache key
+UNCACHED_PARAMS = {"db", "response", "request"}
+
+def cached(*tables):
+    # Caches an endpoint's return value keyed by endpoint + query/path parameters + the table_versions
+    # counters of the tables it reads, so a write from any process (another worker, the ETL) makes
+    # older entries miss. Writes in this process also call result_cache.invalidate() to drop them early.
+    # The endpoint must take its session as the db keyword argument.
+    def decorator(fn):
+        def key_of(kwargs, versions):
+            params = sorted((k, repr(v)) for k, v in kwargs.items() if k not in UNCACHED_PARAMS)
+            return (fn.__module__, fn.__qualname__, tuple(params), versions)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                # Inside a conditional() route the counters its ETag was built from, so body and tag agree
+                versions = table_versions.pinned(tables)
+                if versions is None:
+                    versions = await table_versions.read_async(kwargs["db"], tables)
+                key = key_of(kwargs, versions)
+                found, value = result_cache.get(key)
+                if found:
+                    return value
+                generations = result_cache.generations(tables)
+                value = await fn(*args, **kwargs)
+                result_cache.set(key, value, tables, generations)
+                return value
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = key_of(kwargs, table_versions.read(kwargs["db"], tables))
+            found, value = result_cache.get(key)
+            if found:
+                return value
+            generations = result_cache.generations(tables)
+            value = fn(*args, **kwargs)
+            result_cache.set(key, value, tables, generations)
+            return value
+        return wrapper
+    return decorator
@@ -0,0 +1,293 @@
+import asyncio
+import calendar
+import logging
+import os
+import time
+from datetime import date
+import numpy as np
+import pandas as pd
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app.models import models
+from app.utils import table_versions
+
+# Opt-in: serve maintenance aggregates from an in-process NumPy copy of the table
+ENABLED = os.getenv("COLUMNAR_ANALYTICS", "false").lower() in ("1", "true", "yes")
+
+M = models.Maintenance
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+NO_DAY = np.iinfo(np.int32).min  # NULL dates
+NO_MONTH = np.iinfo(np.int64).min
+COLUMNS = (M.maintenance_id, M.blade_id, M.date, M.status, M.issue, M.technician)
+# dictionary-encoded column -> its position in a COLUMNS row
+ENCODED = {"blade": 1, "status": 3, "issue": 4, "technician": 5}
+
+def day_number(value) -> int:
+    return NO_DAY if value is None else value.toordinal() - EPOCH_ORDINAL
+
+class Dictionary:
+    # value <-> small int code; code 0 is NULL
+    def __init__(self, values=()):
+        self.values = [None, *values]
+        self.codes = {value: code for code, value in enumerate(self.values)}
+
+    @classmethod
+    def encode_all(cls, values: list):
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        return cls(uniques.tolist()), (codes + 1).astype(np.int32)
+
+    def encode(self, value) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self):
+        return len(self.values)
+
+class MaintenanceColumns:
+    # One array per column, rows in maintenance_id order. blade/status/issue/technician hold
+    # Dictionary codes; day holds days since 1970-01-01 (NO_DAY for NULL).
+    def __init__(self, rows: list):
+        columns = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+        self.id = np.array(columns[0], dtype=np.int64)
+        self.day = np.array([day_number(d) for d in columns[2]], dtype=np.int32)
+        self.dictionaries, self.codes = {}, {}
+        for name, index in ENCODED.items():
+            self.dictionaries[name], self.codes[name] = Dictionary.encode_all(list(columns[index]))
+
+    def __len__(self):
+        return len(self.id)
+
+    # ---- incremental refresh ----
+
+    def apply(self, ids: set, rows: list):
+        # rows: current values of the tracked ids; a tracked id without a row was deleted
+        current = {row[0]: row for row in rows}
+        wanted = np.array(sorted(ids), dtype=np.int64)
+        positions = np.searchsorted(self.id, wanted)
+        found = positions < len(self.id)
+        found[found] = self.id[positions[found]] == wanted[found]
+        gone = []
+        for position, maintenance_id in zip(positions[found].tolist(), wanted[found].tolist()):
+            row = current.pop(maintenance_id, None)
+            if row is None:
+                gone.append(position)
+            else:
+                self.day[position] = day_number(row[2])
+                for name, index in ENCODED.items():
+                    self.codes[name][position] = self.dictionaries[name].encode(row[index])
+        if gone:
+            self._take(np.delete(np.arange(len(self)), gone))
+        if current:
+            self._append(sorted(current.values()))
+
+    def _append(self, rows: list):
+        last_id = self.id[-1] if len(self) else None
+        self.id = np.concatenate([self.id, np.array([row[0] for row in rows], dtype=np.int64)])
+        self.day = np.concatenate([self.day, np.array([day_number(row[2]) for row in rows], dtype=np.int32)])
+        for name, index in ENCODED.items():
+            codes = np.array([self.dictionaries[name].encode(row[index]) for row in rows], dtype=np.int32)
+            self.codes[name] = np.concatenate([self.codes[name], codes])
+        # Another writer's rows can commit with lower ids than ours
+        if last_id is not None and rows[0][0] < last_id:
+            self._take(np.argsort(self.id, kind="stable"))
+
+    def _take(self, order):
+        self.id, self.day = self.id[order], self.day[order]
+        self.codes = {name: codes[order] for name, codes in self.codes.items()}
+
+    # ---- aggregates ----
+
+    def between(self, date_from: date = None, date_to: date = None):
+        # Row mask for date_from <= date <= date_to, None when unbounded; like the SQL comparisons,
+        # a bound drops undated entries
+        if not date_from and not date_to:
+            return None
+        mask = self.day != NO_DAY
+        if date_from:
+            mask &= self.day >= day_number(date_from)
+        if date_to:
+            mask &= self.day <= day_number(date_to)
+        return mask
+
+    def _code(self, name: str, value):
+        # None when the value never occurs, so callers can short-circuit to an empty result
+        return self.dictionaries[name].codes.get(value)
+
+    def _counts(self, name: str, mask=None) -> list:
+        codes = self.codes[name] if mask is None else self.codes[name][mask]
+        counts = np.bincount(codes, minlength=len(self.dictionaries[name]))
+        values = self.dictionaries[name].values
+        return [(values[code], count) for code, count in enumerate(counts.tolist()) if count]
+
+    def _technician_mask(self, technician: str, mask=None):
+        # None when the technician has no entries at all
+        code = self._code("technician", technician)
+        if code is None or technician is None:
+            return None
+        selected = self.codes["technician"] == code
+        return selected if mask is None else selected & mask
+
+    def counts(self, name: str, mask=None) -> list:
+        # (value, count) per status / issue / technician / blade, NULL as None
+        return self._counts(name, mask)
+
+    def count(self, name: str, value) -> int:
+        code = self._code(name, value)
+        return 0 if code is None else int(np.count_nonzero(self.codes[name] == code))
+
+    def status_counts(self, technicians_only: bool = False) -> list:
+        mask = self.codes["technician"] != 0 if technicians_only else None
+        return self._counts("status", mask)
+
+    def technician_status_counts(self, technician: str) -> list:
+        mask = self._technician_mask(technician)
+        return [] if mask is None else self._counts("status", mask)
+
+    def technician_issue_counts(self, technician: str, mask=None) -> list:
+        mask = self._technician_mask(technician, mask)
+        return [] if mask is None else self._counts("issue", mask)
+
+    def technician_months(self, technician: str, mask=None) -> list:
+        mask = self._technician_mask(technician, mask)
+        return [] if mask is None else self.months(mask)
+
+    def months(self, mask=None) -> list:
+        # ('YYYY-MM', count) in month order; undated entries come last as (None, count)
+        days = self.day if mask is None else self.day[mask]
+        dated = days != NO_DAY
+        months, counts = np.unique(days[dated].astype("datetime64[D]").astype("datetime64[M]"), return_counts=True)
+        rows = [(str(month), count) for month, count in zip(months, counts.tolist())]
+        undated = int(np.count_nonzero(~dated))
+        return rows + [(None, undated)] if undated else rows
+
+    def month_of_year_trend(self, since: date) -> list:
+        # ('Mon', count) for entries on or after since, grouped by calendar month across years
+        # and ordered by each group's earliest date
+        days = self.day[self.between(since, None)]
+        month = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) % 12
+        counts = np.bincount(month, minlength=12)
+        first = np.full(12, np.iinfo(np.int32).max, dtype=np.int64)
+        np.minimum.at(first, month, days)
+        return [(calendar.month_abbr[m + 1], int(counts[m])) for m in np.argsort(first, kind="stable") if counts[m]]
+
+    def distinct_blades_between(self, start: date, end: date) -> int:
+        # Blades with an entry in [start, end)
+        mask = (self.day >= day_number(start)) & (self.day < day_number(end))
+        return int(np.unique(self.codes["blade"][mask]).size)
+
+    def technician_profile_rows(self, technician: str = None, date_from: date = None, date_to: date = None) -> list:
+        # (technician, issue, status, 'YYYY-MM', 0, count) at the finest grain, the row shape
+        # crud.technician_profiles() rolls up; date bounds drop undated entries as SQL does
+        within = self.between(date_from, date_to)
+        if technician is None:
+            mask = self.codes["technician"] != 0
+            mask = mask if within is None else mask & within
+        else:
+            mask = self._technician_mask(technician, within)
+        if mask is None:
+            return []
+        days = self.day[mask]
+        month = np.where(days == NO_DAY, NO_MONTH, days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64))
+        keys = np.stack([self.codes[name][mask].astype(np.int64) for name in ("technician", "issue", "status")] + [month], axis=1)
+        if not len(keys):
+            return []
+        groups, counts = np.unique(keys, axis=0, return_counts=True)
+        values = {name: self.dictionaries[name].values for name in ("technician", "issue", "status")}
+        return [
+            (
+                values["technician"][t], values["issue"][i], values["status"][s],
+                None if m == NO_MONTH else str(np.datetime64(m, "M")), 0, count,
+            )
+            for (t, i, s, m), count in zip(groups.tolist(), counts.tolist())
+        ]
+
+    def _blade_issue_keys(self, mask=None):
+        blades, issues = (self.codes["blade"], self.codes["issue"]) if mask is None else (
+            self.codes["blade"][mask], self.codes["issue"][mask])
+        return blades.astype(np.int64) * len(self.dictionaries["issue"]) + issues
+
+    def recurring_issues(self, min_count: int = 2, mask=None) -> list:
+        # (blade_id, issue, count) for pairs seen at least min_count times
+        keys, counts = np.unique(self._blade_issue_keys(mask), return_counts=True)
+        keep = counts >= min_count
+        width = len(self.dictionaries["issue"])
+        blades, issues = self.dictionaries["blade"].values, self.dictionaries["issue"].values
+        return [
+            (blades[key // width], issues[key % width], count)
+            for key, count in zip(keys[keep].tolist(), counts[keep].tolist())
+        ]
+
+    def problem_blades(self, limit: int = 5, mask=None) -> list:
+        # (blade_id, count) of the blades with the most entries
+        blades = self.codes["blade"] if mask is None else self.codes["blade"][mask]
+        counts = np.bincount(blades, minlength=len(self.dictionaries["blade"]))
+        top = np.argsort(-counts, kind="stable")[:limit]
+        blades = self.dictionaries["blade"].values
+        return [(blades[code], int(counts[code])) for code in top.tolist() if counts[code]]
+
+class ColumnarStore:
+    # Keeps one MaintenanceColumns in step with the database. Maintenance writes made through
+    # this process are re-read by id; anything else (another worker, the ETL, hand edits) shows up
+    # as a table_versions bump nobody here tracked and triggers a full reload.
+    def __init__(self):
+        self.columns = None
+        self.version = None
+        self._pending = set()  # ids written by committed local transactions since the last refresh
+        self._commits = 0      # how many such transactions
+        self._lock = asyncio.Lock()
+
+    def committed(self, ids: set):
+        self._pending |= ids
+        self._commits += 1
+
+    def reset(self):
+        self.columns = self.version = None
+
+    async def current(self, db) -> MaintenanceColumns:
+        async with self._lock:
+            version = (await table_versions.snapshot.current()).get("maintenance", (0, None))[0]
+            pending, commits = self._pending, self._commits
+            self._pending, self._commits = set(), 0
+            if self.columns is None or version - self.version != commits:
+                started = time.perf_counter()
+                rows = (await db.execute(select(*COLUMNS).order_by(M.maintenance_id))).all()
+                self.columns = MaintenanceColumns(rows)
+                logging.info(
+                    f"✅ Columnar maintenance snapshot loaded: {len(rows)} rows "
+                    f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+                )
+            elif pending:
+                rows = (await db.execute(select(*COLUMNS).where(M.maintenance_id.in_(list(pending))))).all()
+                self.columns.apply(pending, rows)
+            self.version = version
+            return self.columns
+
+store = ColumnarStore()
+
+# Called with the ids of every committed tracked transaction: the snapshot when COLUMNAR_ANALYTICS
+# is on, and the in-process search index once it is in use
+subscribers = [store.committed] if ENABLED else []
+
+async def analytics(db):
+    # The snapshot when COLUMNAR_ANALYTICS is on, else None (callers fall back to SQL)
+    return await store.current(db) if ENABLED else None
+
+def track(db: Session, ids):
+    # Call in a maintenance write transaction that also bumps its table version; the ids are
+    # re-read by every subscriber once the transaction commits
+    if subscribers:
+        db.info.setdefault("columnar_ids", set()).update(ids)
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    ids = session.info.pop("columnar_ids", None)
+    if ids is not None:
+        for subscriber in subscribers:
+            subscriber(ids)
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("columnar_ids", None)
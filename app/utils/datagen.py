@@ -0,0 +1,113 @@
+import os
+from datetime import date
+import numpy as np
+import pandas as pd
+
+# Row counts of the sample CSVs in app/data; scale multiplies these
+BASE_COUNTS = {"sites": 50, "turbines": 200, "blades": 5000, "maintenance": 950}
+
+FILE_NAMES = {
+    "sites": "Site Table.csv",
+    "turbines": "Turbines and Blades.csv",
+    "blades": "Blade Table.csv",
+    "maintenance": "Blade Maintenance.csv",
+}
+
+SITE_NAMES = ["Wind Hill", "Storm Point", "North Ridge", "Sunny Crest", "East Side", "Green Valley"]
+LOCATIONS = ["Texas", "Nevada", "Montana", "Oregon", "California", "Kansas"]
+TURBINE_MODELS = ["Enercon-E82", "GE-123", "Nordex-N133", "Siemens-X1", "Vestas-V90"]
+BLADE_TYPES = ["Type-A", "Type-B", "Type-C", "Type-D", "Type-E"]
+BLADE_LENGTHS = [55.0, 58.0, 60.0, 61.0, 62.5]
+ISSUES = ["Crack", "Delamination", "Erosion", "Lightning Damage", "None", "Split", "Wear"]
+STATUSES = ["Completed", "In Progress", "Pending"]
+TECHNICIANS = ["Tech A", "Tech B", "Tech C", "Tech D"]
+
+# Share of rows given each kind of dirt the loaders have to cope with
+DIRT = {"duplicate": 0.03, "blank": 0.02, "lowercase": 0.05, "padded": 0.02, "orphan": 0.03}
+
+def make_ids(prefix: str, count: int, width: int) -> np.ndarray:
+    width = max(width, len(str(count)))
+    return np.array([f"{prefix}{i:0{width}d}" for i in range(1, count + 1)], dtype=object)
+
+def _mask(rng, n: int, share: float) -> np.ndarray:
+    return rng.random(n) < share
+
+def _dirty_ids(rng, ids: np.ndarray, orphan_pool: np.ndarray = None) -> np.ndarray:
+    ids = ids.copy()
+    lower = _mask(rng, len(ids), DIRT["lowercase"])
+    ids[lower] = np.char.lower(ids[lower].astype(str))
+    if orphan_pool is not None:
+        orphan = _mask(rng, len(ids), DIRT["orphan"])
+        ids[orphan] = rng.choice(orphan_pool, orphan.sum())
+    return ids
+
+def _dirty_text(rng, values: np.ndarray) -> np.ndarray:
+    values = values.copy()
+    lower = _mask(rng, len(values), DIRT["lowercase"])
+    values[lower] = np.char.lower(values[lower].astype(str))
+    padded = _mask(rng, len(values), DIRT["padded"])
+    values[padded] = np.char.add(values[padded].astype(str), " ")
+    return values
+
+def _finish(rng, df: pd.DataFrame, key_columns: list) -> pd.DataFrame:
+    # blanks in non-key columns, then duplicate a slice of rows and shuffle
+    for column in df.columns:
+        if column in key_columns:
+            continue
+        df.loc[_mask(rng, len(df), DIRT["blank"]), column] = None
+    dupes = df.sample(frac=DIRT["duplicate"], random_state=int(rng.integers(1 << 31)))
+    df = pd.concat([df, dupes], ignore_index=True)
+    return df.sample(frac=1.0, random_state=int(rng.integers(1 << 31))).reset_index(drop=True)
+
+def generate_fleet(out_dir: str, scale: float = 1, seed: int = 42, end_date: date = None) -> dict:
+    # Same output for the same (scale, seed, end_date)
+    rng = np.random.default_rng(seed)
+    end_date = end_date or date.today()
+    counts = {kind: max(1, int(round(n * scale))) for kind, n in BASE_COUNTS.items()}
+    os.makedirs(out_dir, exist_ok=True)
+
+    site_ids = make_ids("S", counts["sites"], 3)
+    turbine_ids = make_ids("T", counts["turbines"], 4)
+    blade_ids = make_ids("B", counts["blades"], 5)
+    # IDs just past the generated range never exist, so they make orphan FKs
+    missing_sites = make_ids("S", counts["sites"] + 10, 3)[counts["sites"]:]
+    missing_turbines = make_ids("T", counts["turbines"] + 20, 4)[counts["turbines"]:]
+    missing_blades = make_ids("B", counts["blades"] + 50, 5)[counts["blades"]:]
+
+    frames = {
+        "sites": _finish(rng, pd.DataFrame({
+            "site_id": _dirty_ids(rng, site_ids),
+            "site_name": _dirty_text(rng, rng.choice(SITE_NAMES, counts["sites"]).astype(object)),
+            "location": _dirty_text(rng, rng.choice(LOCATIONS, counts["sites"]).astype(object)),
+        }), ["site_id"]),
+        "turbines": _finish(rng, pd.DataFrame({
+            "turbine_id": _dirty_ids(rng, turbine_ids),
+            "site_id": _dirty_ids(rng, rng.choice(site_ids, counts["turbines"]), missing_sites),
+            "turbine_model": _dirty_text(rng, rng.choice(TURBINE_MODELS, counts["turbines"]).astype(object)),
+        }), ["turbine_id"]),
+        "blades": _finish(rng, pd.DataFrame({
+            "blade_id": _dirty_ids(rng, blade_ids),
+            "turbine_id": _dirty_ids(rng, rng.choice(turbine_ids, counts["blades"]), missing_turbines),
+            "blade_type": _dirty_text(rng, rng.choice(BLADE_TYPES, counts["blades"]).astype(object)),
+            "length_m": rng.choice(BLADE_LENGTHS, counts["blades"]),
+        }), ["blade_id"]),
+    }
+
+    # Weekly inspection slots over the three years before end_date, like the sample data
+    n = counts["maintenance"]
+    weeks = rng.integers(0, 156, n)
+    dates = (np.datetime64(end_date) - weeks.astype("timedelta64[W]").astype("timedelta64[D]")).astype(str).astype(object)
+    frames["maintenance"] = _finish(rng, pd.DataFrame({
+        "maintenance_id": make_ids("M", n, 6),
+        "blade_id": _dirty_ids(rng, rng.choice(blade_ids, n), missing_blades),
+        "date": dates,
+        "issue_found": _dirty_text(rng, rng.choice(ISSUES, n).astype(object)),
+        "repair_status": _dirty_text(rng, rng.choice(STATUSES, n).astype(object)),
+        "technician": _dirty_text(rng, rng.choice(TECHNICIANS, n).astype(object)),
+    }), ["maintenance_id"])
+
+    paths = {}
+    for kind, df in frames.items():
+        paths[kind] = os.path.join(out_dir, FILE_NAMES[kind])
+        df.to_csv(paths[kind], index=False)
+    return paths
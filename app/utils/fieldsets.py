@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from typing import Optional
+from fastapi import HTTPException, Query
+
+@dataclass
+class Fieldset:
+    fields: Optional[set] = None  # None = every field of the response schema
+    include: tuple = ()
+
+def _names(value: str, allowed: list, label: str) -> list:
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"❌ Unknown {label}: {', '.join(unknown)}. Choose from: {', '.join(allowed)}."
+        )
+    return list(dict.fromkeys(names))
+
+def fieldset_params(resource):
+    # Query dependency for ?fields= and ?include= on one resource (see crud.RESOURCES).
+    # Without either, the response keeps its full default shape; once a client asks for
+    # either one, it gets exactly what it listed. The resource key is always returned.
+    def dependency(
+        fields: Optional[str] = Query(None, description=f"Comma list of: {', '.join(resource.fields)}"),
+        include: Optional[str] = Query(None, description=f"Comma list of: {', '.join(resource.relations)}"),
+    ) -> Fieldset:
+        if fields is None and include is None:
+            return Fieldset(include=resource.default_include)
+        selected = None
+        if fields is not None:
+            selected = {resource.key, *_names(fields, resource.fields, "field(s)")}
+        return Fieldset(selected, tuple(_names(include or "", list(resource.relations), "include(s)")))
+    return dependency
@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+from app.models.models import Blade, Maintenance, Turbine
+
+@dataclass
+class MaintenanceFilters:
+    status: Optional[str] = None
+    technician: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    blade_id: Optional[str] = None
+    turbine_id: Optional[str] = None
+    site_id: Optional[str] = None
+
+def apply_maintenance_filters(stmt, filters: MaintenanceFilters):
+    if filters.status:
+        stmt = stmt.where(Maintenance.status == filters.status)
+    if filters.technician:
+        stmt = stmt.where(Maintenance.technician == filters.technician)
+    if filters.date_from:
+        stmt = stmt.where(Maintenance.date >= filters.date_from)
+    if filters.date_to:
+        stmt = stmt.where(Maintenance.date <= filters.date_to)
+    if filters.blade_id:
+        stmt = stmt.where(Maintenance.blade_id == filters.blade_id)
+    # turbine/site filters go through the blade -> turbine chain
+    if filters.turbine_id or filters.site_id:
+        stmt = stmt.join(Blade, Blade.blade_id == Maintenance.blade_id)
+        if filters.turbine_id:
+            stmt = stmt.where(Blade.turbine_id == filters.turbine_id)
+        if filters.site_id:
+            stmt = stmt.join(Turbine, Turbine.turbine_id == Blade.turbine_id).where(Turbine.site_id == filters.site_id)
+    return stmt
+
+@dataclass
+class DateRange:
+    # Bounds for the analytics routes; on a partitioned maintenance table they let PostgreSQL
+    # skip the yearly partitions outside the range
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+
+def maintenance_where(*conditions: str, dates: DateRange = None) -> tuple:
+    # (WHERE clause, bind params) for the raw-SQL routes: the given conditions plus the date bounds
+    conditions, params = list(conditions), {}
+    if dates and dates.date_from:
+        conditions.append("date >= :date_from")
+        params["date_from"] = dates.date_from
+    if dates and dates.date_to:
+        conditions.append("date <= :date_to")
+        params["date_to"] = dates.date_to
+    return ("WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+def month_label(dialect: str, by_year: bool = True) -> str:
+    # SQL for a maintenance row's month: 'YYYY-MM', or the month's English abbreviation ('Jan')
+    if dialect == "postgresql":
+        return "TO_CHAR(date, 'YYYY-MM')" if by_year else "TO_CHAR(date, 'Mon')"
+    if by_year:
+        return "strftime('%Y-%m', date)"
+    return "substr('JanFebMarAprMayJunJulAugSepOctNovDec', strftime('%m', date) * 3 - 2, 3)"
@@ -0,0 +1,214 @@
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Same statement shape this many times in one request is reported as a likely N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+class RequestStats:
+    # SQL issued while serving one request
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement = None
+        self.shapes = Counter()
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.queries += 1
+        self.db_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms, self.slowest_statement = elapsed_ms, statement
+        self.shapes[statement_shape(statement)] += 1
+
+request_stats: ContextVar = ContextVar("request_stats", default=None)
+
+_PARAM_SUFFIX = re.compile(r"(%\(\w+?)_\d+(_\d+)?\)s")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|\$\d+|%\(\w+\)s)\s*,?)+\)")
+
+def statement_shape(statement: str) -> str:
+    # Collapses whitespace and expanded IN lists so repeats of one query compare equal
+    shape = _PARAM_SUFFIX.sub(r"\1)s", " ".join(statement.split()))
+    return _PLACEHOLDER_LIST.sub("(?)", shape)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_started"].pop()) * 1000
+    stats = request_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+    if elapsed_ms > SLOW_QUERY_MS:
+        logging.warning(f"🐢 Slow query ({elapsed_ms:.0f} ms): {' '.join(statement.split())[:500]}")
+
+def instrument_engine(engine):
+    # Works for sync engines and for AsyncEngine.sync_engine
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def snapshot(self) -> dict:
+        cumulative, running = {}, 0
+        for bound, count in zip([*self.buckets, "+Inf"], self.counts):
+            running += count
+            cumulative[str(bound)] = running
+        return {
+            "count": self.count,
+            "sumMs": round(self.total, 3),
+            "avgMs": round(self.total / self.count, 3) if self.count else 0.0,
+            "buckets": cumulative,
+        }
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes = defaultdict(Histogram)
+        self.route_queries = Counter()
+        self.route_db_ms = Counter()
+        self.n_plus_one = Counter()
+        self.slowest = {}  # route -> (ms, statement) of the slowest statement seen
+        self.pool_wait = Histogram(buckets=(0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000))
+        self.pool_timeouts = 0
+
+    def observe_request(self, route: str, elapsed_ms: float, stats: RequestStats):
+        with self._lock:
+            self.routes[route].observe(elapsed_ms)
+            self.route_queries[route] += stats.queries
+            self.route_db_ms[route] += stats.db_ms
+            if stats.slowest_statement and stats.slowest_ms > self.slowest.get(route, (0.0, None))[0]:
+                self.slowest[route] = (stats.slowest_ms, statement_shape(stats.slowest_statement))
+
+    def observe_n_plus_one(self, route: str):
+        with self._lock:
+            self.n_plus_one[route] += 1
+
+    def observe_pool_wait(self, elapsed_ms: float):
+        with self._lock:
+            self.pool_wait.observe(elapsed_ms)
+
+    def observe_pool_timeout(self):
+        with self._lock:
+            self.pool_timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            routes = {}
+            for route, histogram in sorted(self.routes.items()):
+                routes[route] = {
+                    "latency": histogram.snapshot(),
+                    "queries": self.route_queries[route],
+                    "dbMs": round(self.route_db_ms[route], 3),
+                    "nPlusOneWarnings": self.n_plus_one[route],
+                }
+                if route in self.slowest:
+                    ms, statement = self.slowest[route]
+                    routes[route]["slowestStatement"] = {"ms": round(ms, 3), "sql": statement}
+            return {
+                "routes": routes,
+                "poolCheckoutWait": self.pool_wait.snapshot(),
+                "poolCheckoutTimeouts": self.pool_timeouts,
+            }
+
+metrics = Metrics()
+
+# Pools that time how long a checkout waits for a free connection
+class TimedQueuePool(QueuePool):
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            metrics.observe_pool_timeout()
+            raise
+        finally:
+            metrics.observe_pool_wait((time.perf_counter() - started) * 1000)
+
+class TimedAsyncQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    pass
+
+def pool_status(pool, max_overflow: int) -> dict:
+    # Saturation snapshot: checkedOut near size + maxOverflow means requests are about to queue.
+    # max_overflow is the configured limit (database.POOL_SETTINGS); pools don't expose it.
+    size, checked_out = pool.size(), pool.checkedout()
+    return {
+        "size": size,
+        "maxOverflow": max_overflow,
+        "checkedOut": checked_out,
+        "checkedIn": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "saturation": round(checked_out / (size + max_overflow), 4) if size + max_overflow else 0.0,
+    }
+
+def _route_name(request) -> str:
+    # Path template, so /sites/S001/turbines and /sites/S002/turbines share one series
+    route = request.scope.get("route")
+    if route is None:
+        return f"{request.method} unmatched"
+    # Routes of included routers may carry a path relative to the router prefix; prefixes here
+    # are static, so the prefix is whatever leads the concrete path
+    segments = request.scope["path"].split("/")
+    depth = route.path.count("/")
+    prefix = "/".join(segments[:len(segments) - depth]) if depth else request.scope["path"]
+    return f"{request.method} {prefix}{route.path}"
+
+def _server_timing(stats: RequestStats, total_ms: float) -> str:
+    return ", ".join([
+        f'db;dur={stats.db_ms:.2f};desc="{stats.queries} queries"',
+        f"db-slowest;dur={stats.slowest_ms:.2f}",
+        f"total;dur={total_ms:.2f}",
+    ])
+
+def _observe(route: str, total_ms: float, stats: RequestStats):
+    metrics.observe_request(route, total_ms, stats)
+    for shape, count in stats.shapes.items():
+        if count >= N_PLUS_ONE_THRESHOLD:
+            metrics.observe_n_plus_one(route)
+            logging.warning(f"⚠️ Possible N+1 in {route}: same statement ran {count} times: {shape[:300]}")
+
+async def instrument_request(request, call_next):
+    # HTTP middleware: per-request SQL stats -> Server-Timing header, N+1 warnings, route metrics.
+    # A streamed body (the exports) runs its queries after the headers are sent, so Server-Timing
+    # only covers what ran before the first byte; the route metrics wait until the body is done.
+    stats = RequestStats()
+    token = request_stats.set(stats)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        request_stats.reset(token)
+    route = _route_name(request)
+    response.headers["Server-Timing"] = _server_timing(stats, (time.perf_counter() - started) * 1000)
+
+    body = response.body_iterator
+
+    async def observed_body():
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            _observe(route, (time.perf_counter() - started) * 1000, stats)
+
+    response.body_iterator = observed_body()
+    return response
@@ -0,0 +1,39 @@
+import base64
+import json
+from typing import Optional
+from fastapi import HTTPException, Response
+
+DEFAULT_PAGE_SIZE = 100  # when a client sends a cursor without a limit
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="❌ Invalid pagination cursor.")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="❌ Invalid pagination cursor.")
+    return values
+
+def page_limit(limit: Optional[int], after: Optional[str]) -> Optional[int]:
+    # Lists that returned every row before pagination existed stay unpaged (None) until a
+    # client passes limit or after
+    if limit is None and after:
+        return DEFAULT_PAGE_SIZE
+    return limit
+
+def fetch_limit(limit: Optional[int]) -> Optional[int]:
+    # One row past the page tells paginate() whether another page exists
+    return limit + 1 if limit else None
+
+def paginate(response: Response, rows: list, limit: Optional[int], cursor_of) -> list:
+    # rows were fetched with fetch_limit(limit); the extra row only signals that another page exists
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(cursor_of(rows[-1]))
+    return rows
@@ -0,0 +1,362 @@
+import csv
+import gzip
+import logging
+import os
+import re
+from datetime import date
+from sqlalchemy import Date, and_, column, func, insert, inspect, select, table, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.models import models
+from app.utils import rollups, table_versions
+
+# maintenance can be range-partitioned by year on PostgreSQL (manage_partitions.py partition).
+# Cold years move to maintenance_archive (still queryable) or to gzipped CSV files; every other
+# backend, and PostgreSQL before the conversion, archives by moving rows instead.
+TABLE = "maintenance"
+ARCHIVE_TABLE = "maintenance_archive"
+DEFAULT_PARTITION = "maintenance_undated"  # dates outside every yearly partition
+ARCHIVE_DIR = os.getenv("MAINTENANCE_ARCHIVE_DIR", "archive")
+COLUMNS = [c.name for c in models.Maintenance.__table__.columns]
+PARTITION_NAME = re.compile(r"^maintenance_y(\d{4})$")
+
+def partition_name(year: int) -> str:
+    return f"maintenance_y{year}"
+
+def archive_file(directory: str, year: int) -> str:
+    return os.path.join(directory, f"maintenance_{year}.csv.gz")
+
+def year_bounds(year: int) -> dict:
+    return {"start": date(year, 1, 1), "end": date(year + 1, 1, 1)}
+
+def is_partitioned(db: Session, name: str = TABLE) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return db.scalar(text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"), {"table": name}) == "p"
+
+def partitions(db: Session, name: str = TABLE) -> dict:
+    # year -> partition name for the yearly partitions attached to the named table
+    names = db.scalars(text("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(:table)
+    """), {"table": name})
+    return {int(match.group(1)): match.group(0) for match in map(PARTITION_NAME.match, names) if match}
+
+def _lock(db: Session):
+    # One partition change at a time across workers and tools; released at commit
+    db.execute(text("SELECT pg_advisory_xact_lock(hashtext('maintenance_partitions'))"))
+
+def _attach(db: Session, name: str, year: int):
+    # Rows of that year already in the default partition move over first, or ATTACH would refuse
+    db.execute(text(f"""
+        WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end RETURNING *)
+        INSERT INTO {name} SELECT * FROM moved
+    """), year_bounds(year))
+    start, end = year_bounds(year).values()
+    db.execute(text(f"ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')"))
+
+def create_partition(db: Session, year: int):
+    name = partition_name(year)
+    db.execute(text(f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS)"))
+    _attach(db, name, year)
+
+def ensure_partitions(db: Session, years) -> list:
+    # Creates the missing yearly partitions; caller commits
+    _lock(db)
+    existing = set(partitions(db)) | set(partitions(db, ARCHIVE_TABLE))
+    created = [year for year in sorted(set(years)) if year not in existing]
+    for year in created:
+        create_partition(db, year)
+    return created
+
+def ensure_current(db: Session) -> list:
+    # Keeps this and next year's partitions in place so new entries never pile up in the default one.
+    # Without a partitioned table (other backends, or before `partition`) it does nothing; a failure
+    # is logged rather than raised, since new rows still fit the default partition.
+    if not is_partitioned(db):
+        return []
+    year = date.today().year
+    try:
+        created = ensure_partitions(db, [year, year + 1])
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logging.warning(f"⚠️ Could not create maintenance partitions for {year}-{year + 1}: {e}")
+        return []
+    if created:
+        logging.info(f"✅ Created maintenance partitions for {', '.join(map(str, created))}")
+    return created
+
+def partition_table(db: Session) -> int:
+    # Converts a plain maintenance table in place (one transaction): yearly partitions for every
+    # year in the data through next year, a default partition, then the model's indexes and FK.
+    # PostgreSQL only allows unique constraints that contain the partition key, so the primary key
+    # becomes (maintenance_id, date) and date NOT NULL. maintenance_id is then unique only together
+    # with date: ids still come from one sequence, but nothing rejects a reused id on another date.
+    _lock(db)
+    db.execute(text(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE"))
+    undated = db.scalar(text(f"SELECT COUNT(*) FROM {TABLE} WHERE date IS NULL"))
+    if undated:
+        raise ValueError(f"❌ {undated} maintenance row(s) have no date; date them or delete them before partitioning.")
+    sequence = db.scalar(text(f"SELECT pg_get_serial_sequence('{TABLE}', 'maintenance_id')"))
+    first, last = db.execute(text(
+        f"SELECT EXTRACT(YEAR FROM MIN(date))::int, EXTRACT(YEAR FROM MAX(date))::int FROM {TABLE}"
+    )).one()
+    this_year = date.today().year
+    db.execute(text(f"ALTER TABLE {TABLE} RENAME TO maintenance_unpartitioned"))
+    db.execute(text(
+        f"CREATE TABLE {TABLE} (LIKE maintenance_unpartitioned INCLUDING DEFAULTS, PRIMARY KEY (maintenance_id, date)) "
+        f"PARTITION BY RANGE (date)"
+    ))
+    db.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT"))
+    for year in range(min(first or this_year, this_year), max(last or this_year, this_year) + 2):
+        create_partition(db, year)
+    count = db.execute(text(f"INSERT INTO {TABLE} SELECT * FROM maintenance_unpartitioned")).rowcount
+    if sequence:
+        db.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE}.maintenance_id"))
+    db.execute(text("DROP TABLE maintenance_unpartitioned"))
+    # Built after the copy; each index on the parent cascades to every partition
+    for index in models.Maintenance.__table__.indexes:
+        index.create(db.connection())
+    db.execute(text(f"ALTER TABLE {TABLE} ADD FOREIGN KEY (blade_id) REFERENCES blades (blade_id)"))
+    db.execute(text(f"ANALYZE {TABLE}"))
+    return count
+
+# -----------------------------
+# Archival
+# -----------------------------
+
+def _dated(name: str):
+    # Typed date column, so SQLite hands back dates rather than strings
+    return table(name, column("date", Date))
+
+def _in_year(dated, year: int):
+    bounds = year_bounds(year)
+    return and_(dated.c.date >= bounds["start"], dated.c.date < bounds["end"])
+
+def _count(db: Session, name: str, year: int) -> int:
+    dated = _dated(name)
+    return db.scalar(select(func.count()).select_from(dated).where(_in_year(dated, year)))
+
+def _has_table(db: Session, name: str) -> bool:
+    return inspect(db.connection()).has_table(name)
+
+def _sync_archive_columns(db: Session):
+    # Columns added to maintenance since the archive was created (README upgrade notes) are
+    # added to it too, so rows copy and partitions attach either way
+    present = {c["name"] for c in inspect(db.connection()).get_columns(ARCHIVE_TABLE)}
+    for c in models.Maintenance.__table__.columns:
+        if c.name not in present:
+            db.execute(text(f"ALTER TABLE {ARCHIVE_TABLE} ADD COLUMN {c.name} {c.type.compile(dialect=db.get_bind().dialect)}"))
+
+def _ensure_archive_table(db: Session, partitioned: bool):
+    if _has_table(db, ARCHIVE_TABLE):
+        _sync_archive_columns(db)
+        return
+    if partitioned:
+        # Same key as the live table, so detached partitions attach with their primary key index
+        db.execute(text(
+            f"CREATE TABLE {ARCHIVE_TABLE} (LIKE {TABLE} INCLUDING DEFAULTS, PRIMARY KEY (maintenance_id, date)) "
+            f"PARTITION BY RANGE (date)"
+        ))
+    else:
+        db.execute(text(f"CREATE TABLE {ARCHIVE_TABLE} AS SELECT * FROM {TABLE} WHERE 1 = 0"))
+        db.execute(text(f"CREATE UNIQUE INDEX ix_{ARCHIVE_TABLE}_id ON {ARCHIVE_TABLE} (maintenance_id)"))
+        db.execute(text(f"CREATE INDEX ix_{ARCHIVE_TABLE}_date ON {ARCHIVE_TABLE} (date)"))
+
+def _drop_foreign_keys(db: Session, name: str):
+    # Archived history must not keep blades from being deleted
+    constraints = db.scalars(text(
+        "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:table) AND contype = 'f'"
+    ), {"table": name})
+    for constraint in list(constraints):
+        db.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"'))
+
+def _write_file(db: Session, year: int, path: str) -> int:
+    # Streams the year to a gzipped CSV with a header row; NULLs become empty fields
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    rows = db.execute(
+        text(f"SELECT {', '.join(COLUMNS)} FROM {TABLE} WHERE date >= :start AND date < :end ORDER BY maintenance_id"),
+        year_bounds(year),
+        execution_options={"yield_per": 10_000},
+    )
+    count = 0
+    with gzip.open(path, "wt", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(COLUMNS)
+        for row in rows:
+            writer.writerow(["" if value is None else value for value in row])
+            count += 1
+    return count
+
+def _read_file(path: str) -> list:
+    with gzip.open(path, "rt", newline="") as fh:
+        records = [{key: value or None for key, value in row.items()} for row in csv.DictReader(fh)]
+    for record in records:
+        record["maintenance_id"] = int(record["maintenance_id"])
+        record["date"] = date.fromisoformat(record["date"]) if record["date"] else None
+    return records
+
+def archivable_years(db: Session, before: int) -> list:
+    # Years before `before` that still have live maintenance rows
+    dated = _dated(TABLE)
+    oldest = db.scalar(select(func.min(dated.c.date)).where(dated.c.date < date(before, 1, 1)))
+    if oldest is None:
+        return []
+    return [year for year in range(oldest.year, before) if _count(db, TABLE, year)]
+
+def archive(db: Session, before: int, to_file: bool = False, directory: str = ARCHIVE_DIR) -> dict:
+    # Moves every year before `before` out of the live table; returns {year: rows}. Rollups and
+    # blade_state are rebuilt from what stays, and clients re-fetch. Commits.
+    if before > date.today().year:
+        raise ValueError("❌ Refusing to archive the current year or later.")
+    partitioned = is_partitioned(db)
+    if partitioned:
+        _lock(db)
+    moved, written = {}, []
+    try:
+        for year in archivable_years(db, before):
+            if to_file:
+                path = archive_file(directory, year)
+                if os.path.exists(path):
+                    raise ValueError(f"❌ {path} already exists; restore or move it first.")
+                moved[year] = _write_file(db, year, path)
+                written.append(path)
+            else:
+                _ensure_archive_table(db, partitioned)
+                moved[year] = _count(db, TABLE, year)
+            if partitioned:
+                name = partition_name(year)
+                if year not in partitions(db):
+                    create_partition(db, year)
+                db.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+                if to_file:
+                    db.execute(text(f"DROP TABLE {name}"))
+                else:
+                    _drop_foreign_keys(db, name)
+                    start, end = year_bounds(year).values()
+                    db.execute(text(f"ALTER TABLE {ARCHIVE_TABLE} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')"))
+            else:
+                if not to_file:
+                    db.execute(text(
+                        f"INSERT INTO {ARCHIVE_TABLE} ({', '.join(COLUMNS)}) "
+                        f"SELECT {', '.join(COLUMNS)} FROM {TABLE} WHERE date >= :start AND date < :end"
+                    ), year_bounds(year))
+                db.execute(text(f"DELETE FROM {TABLE} WHERE date >= :start AND date < :end"), year_bounds(year))
+        if moved:
+            rollups.rebuild(db)
+            table_versions.bump(db, TABLE)
+        db.commit()
+    except Exception:
+        db.rollback()
+        for path in written:
+            os.remove(path)
+        raise
+    return moved
+
+def restore(db: Session, year: int, directory: str = ARCHIVE_DIR) -> int:
+    # Brings an archived year back into the live table, from maintenance_archive or its file. Commits.
+    partitioned = is_partitioned(db)
+    if partitioned:
+        _lock(db)
+    path = archive_file(directory, year)
+    from_file = False
+    if _has_table(db, ARCHIVE_TABLE):
+        _sync_archive_columns(db)
+    if partitioned and year in partitions(db, ARCHIVE_TABLE):
+        name = partition_name(year)
+        count = _count(db, name, year)
+        db.execute(text(f"ALTER TABLE {ARCHIVE_TABLE} DETACH PARTITION {name}"))
+        if year in partitions(db):
+            # The year was re-created meanwhile (ensure_partitions); merge into it
+            db.execute(text(f"INSERT INTO {TABLE} SELECT * FROM {name}"))
+            db.execute(text(f"DROP TABLE {name}"))
+        else:
+            _attach(db, name, year)
+    elif not partitioned and _has_table(db, ARCHIVE_TABLE) and _count(db, ARCHIVE_TABLE, year):
+        count = db.execute(text(
+            f"INSERT INTO {TABLE} ({', '.join(COLUMNS)}) "
+            f"SELECT {', '.join(COLUMNS)} FROM {ARCHIVE_TABLE} WHERE date >= :start AND date < :end"
+        ), year_bounds(year)).rowcount
+        db.execute(text(f"DELETE FROM {ARCHIVE_TABLE} WHERE date >= :start AND date < :end"), year_bounds(year))
+    elif os.path.exists(path):
+        records = _read_file(path)
+        if partitioned and year not in partitions(db):
+            create_partition(db, year)
+        for start in range(0, len(records), 5000):
+            db.execute(insert(models.Maintenance), records[start:start + 5000])
+        count, from_file = len(records), True
+    else:
+        raise ValueError(f"❌ No archived maintenance for {year}.")
+    rollups.rebuild(db)
+    table_versions.bump(db, TABLE)
+    db.commit()
+    if from_file:
+        os.remove(path)
+    return count
+
+def _primary_key(db: Session, name: str) -> list:
+    return inspect(db.connection()).get_pk_constraint(name)["constrained_columns"]
+
+def verify(db: Session, directory: str = ARCHIVE_DIR) -> list:
+    # Consistency checks for the layout and the archive; returns a list of problems (empty = fine)
+    problems = []
+    duplicates = db.scalars(text(
+        f"SELECT maintenance_id FROM {TABLE} GROUP BY maintenance_id HAVING COUNT(*) > 1 LIMIT 5"
+    )).all()
+    if duplicates:
+        problems.append(f"duplicate maintenance_id in {TABLE}, e.g. {duplicates}")
+    live = db.scalar(text(f"SELECT COUNT(*) FROM {TABLE}"))
+    counted = db.scalar(text("SELECT COALESCE(SUM(count), 0) FROM rollup_status_counts"))
+    if counted != live:
+        problems.append(f"rollups count {counted} rows but {TABLE} has {live}; run rebuild_rollups.py")
+
+    live_years = {year for year, rows in _year_counts(db, TABLE) if year and rows}
+    archived = {year for where, year, _ in summary(db, directory) if where != "live"}
+    if live_years & archived:
+        problems.append(f"years both live and archived: {sorted(live_years & archived)}")
+    if _has_table(db, ARCHIVE_TABLE):
+        shared = db.scalar(text(
+            f"SELECT COUNT(*) FROM {TABLE} m JOIN {ARCHIVE_TABLE} a ON a.maintenance_id = m.maintenance_id"
+        ))
+        if shared:
+            problems.append(f"{shared} maintenance_id(s) both live and in {ARCHIVE_TABLE}")
+
+    if is_partitioned(db):
+        for name in [TABLE] + ([ARCHIVE_TABLE] if is_partitioned(db, ARCHIVE_TABLE) else []):
+            if sorted(_primary_key(db, name)) != ["date", "maintenance_id"]:
+                problems.append(f"{name} primary key is {_primary_key(db, name)}, not (maintenance_id, date)")
+        year = date.today().year
+        missing = [y for y in (year, year + 1) if y not in partitions(db)]
+        if missing:
+            problems.append(f"no partitions for {missing}; restart the app or run `create`")
+    return problems
+
+def summary(db: Session, directory: str = ARCHIVE_DIR) -> list:
+    # (where, year, rows) for live partitions / years, the archive table and archive files
+    rows = []
+    if is_partitioned(db):
+        for year, name in sorted(partitions(db).items()):
+            rows.append(("live", year, _count(db, name, year)))
+        rows.append(("live", "other", db.scalar(text(f"SELECT COUNT(*) FROM {DEFAULT_PARTITION}"))))
+        for year, name in sorted(partitions(db, ARCHIVE_TABLE).items()):
+            rows.append(("archive table", year, _count(db, name, year)))
+    else:
+        rows += [("live", year, count) for year, count in _year_counts(db, TABLE)]
+        if _has_table(db, ARCHIVE_TABLE):
+            rows += [("archive table", year, count) for year, count in _year_counts(db, ARCHIVE_TABLE)]
+    if os.path.isdir(directory):
+        for file_name in sorted(os.listdir(directory)):
+            match = re.match(r"^maintenance_(\d{4})\.csv\.gz$", file_name)
+            if match:
+                rows.append(("archive file", int(match.group(1)), os.path.join(directory, file_name)))
+    return rows
+
+def _year_counts(db: Session, name: str) -> list:
+    dated = _dated(name)
+    oldest, newest = db.execute(select(func.min(dated.c.date), func.max(dated.c.date))).one()
+    counts = [] if oldest is None else [(year, _count(db, name, year)) for year in range(oldest.year, newest.year + 1)]
+    undated = db.scalar(select(func.count()).select_from(dated).where(dated.c.date.is_(None)))
+    return [row for row in counts if row[1]] + ([(None, undated)] if undated else [])
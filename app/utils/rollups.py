@@ -0,0 +1,153 @@
+from collections import Counter
+from collections.abc import Mapping
+import pandas as pd
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from app.models import models
+from app.utils import blade_state
+from app.utils.utils import dialect_insert
+
+M = models.Maintenance
+# Rollup key columns are primary keys, so NULL group values are stored as ""
+NULL_KEY = ""
+
+# rollup model -> maintenance columns it groups by
+SIMPLE_ROLLUPS = {
+    models.StatusRollup: ["status"],
+    models.IssueRollup: ["issue"],
+    models.TechnicianStatusRollup: ["technician", "status"],
+}
+ALL_ROLLUPS = [*SIMPLE_ROLLUPS, models.SiteIssueRollup]
+
+def _key(value):
+    return NULL_KEY if value is None else value
+
+def _grouped(columns: list):
+    return [func.coalesce(getattr(M, c), NULL_KEY) for c in columns]
+
+def _site_issue_select(*where):
+    issue = func.coalesce(M.issue, NULL_KEY)
+    return (
+        select(models.Turbine.site_id, issue, func.count())
+        .select_from(M)
+        .join(models.Blade, models.Blade.blade_id == M.blade_id)
+        .join(models.Turbine, models.Turbine.turbine_id == models.Blade.turbine_id)
+        .where(*where)
+        .group_by(models.Turbine.site_id, issue)
+    )
+
+def _add_counts(db: Session, model, key_columns: list, source):
+    # source yields (*key_columns, count); counts are added onto existing rows
+    stmt = dialect_insert(db, model).from_select([*key_columns, "count"], source)
+    stmt = stmt.on_conflict_do_update(index_elements=key_columns, set_={"count": model.count + stmt.excluded["count"]})
+    db.execute(stmt)
+
+def _bump_many(db: Session, model, key_columns: list, deltas: Counter):
+    # One executemany upsert adding each delta onto its rollup row
+    rows = [{**dict(zip(key_columns, key)), "count": delta} for key, delta in deltas.items() if delta]
+    if not rows:
+        return
+    stmt = dialect_insert(db, model)
+    db.execute(stmt.on_conflict_do_update(index_elements=key_columns, set_={"count": model.count + stmt.excluded["count"]}), rows)
+
+SNAPSHOT_COLUMNS = ("blade_id", "status", "issue", "technician")
+
+def maintenance_snapshot(record) -> dict:
+    # Accepts ORM objects and RETURNING row mappings alike
+    if isinstance(record, Mapping):
+        return {c: record[c] for c in SNAPSHOT_COLUMNS}
+    return {c: getattr(record, c) for c in SNAPSHOT_COLUMNS}
+
+def apply_maintenance_deltas(db: Session, changes: list):
+    # changes: (old, new) maintenance_snapshot() pairs - (None, new) insert, (old, new) update,
+    # (old, None) delete. Deltas are netted per rollup key first. Runs inside the caller's transaction.
+    for model, columns in SIMPLE_ROLLUPS.items():
+        deltas = Counter()
+        for old, new in changes:
+            if old:
+                deltas[tuple(_key(old[c]) for c in columns)] -= 1
+            if new:
+                deltas[tuple(_key(new[c]) for c in columns)] += 1
+        _bump_many(db, model, columns, deltas)
+
+    # Status/technician-only edits leave site x issue counts alone; skip the site lookup for them
+    changes = [
+        (old, new) for old, new in changes
+        if not (old and new) or (old["blade_id"], _key(old["issue"])) != (new["blade_id"], _key(new["issue"]))
+    ]
+    blade_ids = {snap["blade_id"] for pair in changes for snap in pair if snap}
+    if not blade_ids:
+        return
+    site_of = dict(db.execute(
+        select(models.Blade.blade_id, models.Turbine.site_id)
+        .join(models.Turbine, models.Turbine.turbine_id == models.Blade.turbine_id)
+        .where(models.Blade.blade_id.in_(list(blade_ids)))
+    ).all())
+    deltas = Counter()
+    for old, new in changes:
+        for snap, delta in ((old, -1), (new, 1)):
+            if snap and snap["blade_id"] in site_of:
+                deltas[(site_of[snap["blade_id"]], _key(snap["issue"]))] += delta
+    _bump_many(db, models.SiteIssueRollup, ["site_id", "issue"], deltas)
+
+def apply_maintenance_delta(db: Session, old: dict = None, new: dict = None):
+    apply_maintenance_deltas(db, [(old, new)])
+
+def max_maintenance_id(db: Session) -> int:
+    return db.scalar(select(func.max(M.maintenance_id))) or 0
+
+def _apply_inserted(db: Session, where):
+    for model, columns in SIMPLE_ROLLUPS.items():
+        source = select(*_grouped(columns), func.count()).where(where).group_by(*_grouped(columns))
+        _add_counts(db, model, columns, source)
+    _add_counts(db, models.SiteIssueRollup, ["site_id", "issue"], _site_issue_select(where))
+
+def apply_inserted_since(db: Session, since_id: int):
+    # Folds every maintenance row with id > since_id into the rollups (bulk loads append
+    # rows, so this only reads the freshly inserted id range)
+    _apply_inserted(db, M.maintenance_id > since_id)
+
+def apply_inserted_ids(db: Session, ids: list):
+    # Same for an explicit id list, for API inserts that may interleave with other writers
+    if ids:
+        _apply_inserted(db, M.maintenance_id.in_(ids))
+
+def refresh_site_issue(db: Session, site_ids: set):
+    # Recomputes site x issue counts for sites whose turbines or blades moved
+    if not site_ids:
+        return
+    site_ids = list(site_ids)
+    db.execute(delete(models.SiteIssueRollup).where(models.SiteIssueRollup.site_id.in_(site_ids)))
+    db.execute(
+        insert(models.SiteIssueRollup).from_select(
+            ["site_id", "issue", "count"], _site_issue_select(models.Turbine.site_id.in_(site_ids))
+        )
+    )
+
+def sites_affected_by_moves(db: Session, kind: str, df: pd.DataFrame) -> set:
+    # Sites whose site x issue counts go stale once the turbines/blades in df are upserted
+    if kind == "turbines":
+        current = dict(db.execute(select(models.Turbine.turbine_id, models.Turbine.site_id)).all())
+        old_site = df["turbine_id"].map(current)
+        moved = old_site.notna() & (old_site != df["site_id"])
+        return set(old_site[moved]) | set(df.loc[moved, "site_id"])
+    if kind == "blades":
+        current = dict(db.execute(select(models.Blade.blade_id, models.Blade.turbine_id)).all())
+        old_turbine = df["blade_id"].map(current)
+        moved = old_turbine.notna() & (old_turbine != df["turbine_id"])
+        turbines = set(old_turbine[moved]) | set(df.loc[moved, "turbine_id"])
+        if not turbines:
+            return set()
+        return set(db.scalars(select(models.Turbine.site_id).where(models.Turbine.turbine_id.in_(list(turbines)))))
+    return set()
+
+def rebuild(db: Session):
+    # Recomputes every rollup and the per-blade state from raw maintenance rows; caller commits
+    db.flush()
+    for model in ALL_ROLLUPS:
+        db.execute(delete(model))
+    for model, columns in SIMPLE_ROLLUPS.items():
+        source = select(*_grouped(columns), func.count()).group_by(*_grouped(columns))
+        db.execute(insert(model).from_select([*columns, "count"], source))
+    db.execute(insert(models.SiteIssueRollup).from_select(["site_id", "issue", "count"], _site_issue_select()))
+    blade_state.rebuild(db)
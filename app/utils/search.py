@@ -0,0 +1,325 @@
+import asyncio
+import logging
+import re
+import time
+from bisect import bisect_left
+from typing import NamedTuple
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import and_, case, func, literal_column, or_, select
+from app.models import models
+from app.utils import columnar, table_versions
+
+# Result order is (score desc, kind, id); assets come before maintenance at equal score
+KINDS = ("site", "turbine", "blade", "maintenance")
+# kind -> (model, id column, extra columns -> response keys)
+ASSETS = {
+    "site": (models.Site, "site_id", {"name": "name"}),
+    "turbine": (models.Turbine, "turbine_id", {"site_id": "siteId", "model": "model"}),
+    "blade": (models.Blade, "blade_id", {"turbine_id": "turbineId", "type": "type"}),
+}
+TABLES = {"site": "sites", "turbine": "turbines", "blade": "blades", "maintenance": "maintenance"}
+MAINTENANCE_EXTRAS = {"blade_id": "bladeId", "issue": "issue", "technician": "technician", "status": "status", "date": "date"}
+MAX_TERMS = 8
+TOKEN = re.compile(r"[a-z0-9]+")
+NO_POSITIONS = np.empty(0, dtype=np.int64)
+
+def tokenize(value) -> list:
+    # Same words PostgreSQL's 'simple' text search config produces for plain IDs and names
+    return TOKEN.findall(value.lower()) if value else []
+
+class SearchQuery(NamedTuple):
+    # Scores are small integers so cursors compare exactly. Every query term adds 2 when a word of
+    # the issue starts with it and 1 when only a technician name word does; an asset whose ID starts
+    # with the whole query scores above any maintenance hit, and an exact ID one higher.
+    prefix: str
+    terms: tuple
+
+    @classmethod
+    def parse(cls, q: str):
+        terms = tuple(dict.fromkeys(tokenize(q)))[:MAX_TERMS]
+        prefix = q.strip().upper()
+        if not prefix:
+            raise HTTPException(status_code=400, detail="❌ Search query is empty.")
+        return cls(prefix, terms)
+
+    @property
+    def prefix_score(self) -> int:
+        return 2 * len(self.terms) + 1
+
+    @property
+    def exact_score(self) -> int:
+        return 2 * len(self.terms) + 2
+
+class Hit(NamedTuple):
+    score: int
+    kind: str
+    id: object
+    fields: dict
+
+    @property
+    def key(self) -> tuple:
+        return -self.score, KINDS.index(self.kind), self.id
+
+    def as_json(self) -> dict:
+        return {"kind": self.kind, "id": self.id, "score": self.score, **self.fields}
+
+def cursor_key(cursor: list) -> tuple:
+    score, kind, hit_id = cursor
+    id_type = int if kind == "maintenance" else str
+    if kind not in KINDS or not isinstance(score, int) or not isinstance(hit_id, id_type):
+        raise HTTPException(status_code=400, detail="❌ Invalid pagination cursor.")
+    return -score, KINDS.index(kind), hit_id
+
+def _after_clause(kind: str, score, id_column, after: tuple):
+    # SQL form of "(−score, kind, id) > after" for one kind
+    after_score, after_rank, after_id = -after[0], after[1], after[2]
+    rank = KINDS.index(kind)
+    if rank < after_rank:
+        return score < after_score
+    if rank > after_rank:
+        return score <= after_score
+    return or_(score < after_score, and_(score == after_score, id_column > after_id))
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+# -----------------------------
+# PostgreSQL: LIKE prefix on text_pattern_ops indexes, tsvector GIN index for maintenance
+# -----------------------------
+
+def asset_query(kind: str, query: SearchQuery, limit: int, after: tuple = None):
+    model, key, extras = ASSETS[kind]
+    column = getattr(model, key)
+    score = case((column == query.prefix, query.exact_score), else_=query.prefix_score)
+    # The exact match, if any, is also the smallest ID with the prefix, so ID order is score order
+    stmt = (
+        select(column.label("id"), score.label("score"), *[getattr(model, c) for c in extras])
+        .where(column.like(_escape_like(query.prefix) + "%", escape="\\"))
+        .order_by(column)
+    )
+    if after is not None:
+        stmt = stmt.where(_after_clause(kind, score, column, after))
+    return stmt.limit(limit)
+
+def maintenance_query(query: SearchQuery, limit: int, after: tuple = None):
+    m = models.Maintenance
+    vector = models.maintenance_search_vector(m.issue, m.technician)
+
+    def matches(expression: str):
+        return vector.op("@@")(func.to_tsquery(literal_column("'simple'"), expression))
+
+    # The OR of all terms finds candidates through ix_maintenance_search; each term is then scored
+    score = sum(case((matches(f"{term}:*A"), 2), (matches(f"{term}:*"), 1), else_=0) for term in query.terms)
+    candidates = (
+        select(m.maintenance_id.label("id"), score.label("score"), *[getattr(m, c) for c in MAINTENANCE_EXTRAS])
+        .where(matches(" | ".join(f"{term}:*" for term in query.terms)))
+        .subquery()
+    )
+    stmt = select(candidates).order_by(candidates.c.score.desc(), candidates.c.id)
+    if after is not None:
+        stmt = stmt.where(_after_clause("maintenance", candidates.c.score, candidates.c.id, after))
+    return stmt.limit(limit)
+
+def _hits(kind: str, rows, extras: dict) -> list:
+    return [Hit(row.score, kind, row.id, {extras[c]: getattr(row, c) for c in extras}) for row in rows]
+
+async def _search_sql(db, query: SearchQuery, kinds: list, limit: int, after: tuple) -> list:
+    hits = []
+    for kind in kinds:
+        if kind == "maintenance":
+            if query.terms:
+                rows = await db.execute(maintenance_query(query, limit, after))
+                hits += _hits(kind, rows, MAINTENANCE_EXTRAS)
+        else:
+            rows = await db.execute(asset_query(kind, query, limit, after))
+            hits += _hits(kind, rows, ASSETS[kind][2])
+    return hits
+
+# -----------------------------
+# Other backends: in-process inverted index
+# -----------------------------
+
+class AssetIndex:
+    def __init__(self, kind: str, rows: list):
+        extras = ASSETS[kind][2]
+        self.kind = kind
+        self.ids = [row[0] for row in rows]  # sorted
+        self.fields = [{key: value for key, value in zip(extras.values(), row[1:])} for row in rows]
+
+    def search(self, query: SearchQuery, limit: int, after: tuple) -> list:
+        start = bisect_left(self.ids, query.prefix)
+        hits = []
+        for position in range(start, len(self.ids)):
+            asset_id = self.ids[position]
+            if not asset_id.startswith(query.prefix) or len(hits) >= limit:
+                break
+            score = query.exact_score if asset_id == query.prefix else query.prefix_score
+            hit = Hit(score, self.kind, asset_id, self.fields[position])
+            if after is None or hit.key > after:
+                hits.append(hit)
+        return hits
+
+class MaintenanceIndex:
+    # Postings hold row positions. apply() rewrites changed rows in place and appends new ones, so
+    # positions follow maintenance_id order only until another writer commits a lower id.
+    def __init__(self, rows: list):
+        self.ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.rows = [row[1:] for row in rows]
+        self.positions = {row[0]: position for position, row in enumerate(rows)}
+        postings = {"issue": {}, "technician": {}}
+        for position, row in enumerate(self.rows):
+            for field, word in self._words(row):
+                postings[field].setdefault(word, []).append(position)
+        self.postings = {
+            field: {word: np.array(positions, dtype=np.int64) for word, positions in words.items()}
+            for field, words in postings.items()
+        }
+        self.vocabulary = sorted(set(self.postings["issue"]) | set(self.postings["technician"]))
+
+    @staticmethod
+    def _words(row) -> list:
+        # (field, word) pairs of a row without its id
+        return [(field, word) for field, value in (("issue", row[1]), ("technician", row[2]))
+                for word in set(tokenize(value))]
+
+    def apply(self, ids: set, rows: list):
+        # rows: current values of the tracked ids; a tracked id without a row was deleted
+        current = {row[0]: row for row in rows}
+        removed = {"issue": {}, "technician": {}}
+        added = {"issue": {}, "technician": {}}
+        appended = []
+        for maintenance_id in ids:
+            position = self.positions.get(maintenance_id)
+            row = current.get(maintenance_id)
+            if position is not None:
+                for field, word in self._words(self.rows[position]):
+                    removed[field].setdefault(word, []).append(position)
+                if row is None:
+                    # The slot stays behind with no postings, so no search reaches it
+                    del self.positions[maintenance_id]
+            if row is None:
+                continue
+            if position is None:
+                position = len(self.rows)
+                self.positions[maintenance_id] = position
+                self.rows.append(None)
+                appended.append(maintenance_id)
+            self.rows[position] = row[1:]
+            for field, word in self._words(row[1:]):
+                added[field].setdefault(word, []).append(position)
+        if appended:
+            self.ids = np.concatenate([self.ids, np.array(appended, dtype=np.int64)])
+        for field in self.postings:
+            postings = self.postings[field]
+            for word, positions in removed[field].items():
+                postings[word] = postings[word][~np.isin(postings[word], positions)]
+            for word, positions in added[field].items():
+                if word not in postings:
+                    postings[word] = NO_POSITIONS
+                    at = bisect_left(self.vocabulary, word)
+                    if self.vocabulary[at:at + 1] != [word]:
+                        self.vocabulary.insert(at, word)
+                postings[word] = np.concatenate([postings[word], np.array(positions, dtype=np.int64)])
+
+    def _words_with_prefix(self, term: str) -> list:
+        start = bisect_left(self.vocabulary, term)
+        end = bisect_left(self.vocabulary, term + "\x7f")
+        return self.vocabulary[start:end]
+
+    def search(self, query: SearchQuery, limit: int, after: tuple) -> list:
+        if not query.terms or not len(self.ids):
+            return []
+        score = np.zeros(len(self.ids), dtype=np.int32)
+        for term in query.terms:
+            term_score = np.zeros(len(self.ids), dtype=np.int32)
+            words = self._words_with_prefix(term)
+            for field, points in (("technician", 1), ("issue", 2)):
+                for word in words:
+                    term_score[self.postings[field].get(word, NO_POSITIONS)] = points
+            score += term_score
+        positions = np.flatnonzero(score)
+        if after is not None:
+            after_score, after_rank, after_id = -after[0], after[1], after[2]
+            rank = KINDS.index("maintenance")
+            keep = score[positions] < after_score
+            if rank == after_rank:
+                keep |= (score[positions] == after_score) & (self.ids[positions] > after_id)
+            elif rank > after_rank:
+                keep |= score[positions] == after_score
+            positions = positions[keep]
+        positions = positions[np.lexsort((self.ids[positions], -score[positions]))][:limit]
+        extras = MAINTENANCE_EXTRAS.values()
+        return [
+            Hit(int(score[p]), "maintenance", int(self.ids[p]), dict(zip(extras, self.rows[p])))
+            for p in positions.tolist()
+        ]
+
+class SearchIndex:
+    # One part per kind, kept in step with its table version. Maintenance rows written through this
+    # process are re-read by id and applied in place (columnar.track); any other change to a table
+    # (another worker, the ETL, hand edits) rebuilds that kind's part from a fresh read and swaps it
+    # in. Only refreshes of the same kind wait for each other; searches over current parts never wait.
+    def __init__(self):
+        self.parts = {}
+        self.versions = {}
+        self._pending = set()  # maintenance ids written by committed local transactions since the last refresh
+        self._commits = 0      # how many such transactions
+        self._locks = {kind: asyncio.Lock() for kind in KINDS}
+
+    def committed(self, ids: set):
+        self._pending |= ids
+        self._commits += 1
+
+    async def current(self, db, kinds: list) -> dict:
+        if self.committed not in columnar.subscribers:
+            columnar.subscribers.append(self.committed)
+        versions = await table_versions.snapshot.current()
+        for kind in kinds:
+            version = versions.get(TABLES[kind], (0, None))[0]
+            if self.versions.get(kind) == version:
+                continue
+            async with self._locks[kind]:
+                if self.versions.get(kind) == version:
+                    continue
+                await self._refresh(db, kind, version)
+        return self.parts
+
+    async def _refresh(self, db, kind: str, version: int):
+        if kind == "maintenance":
+            m = models.Maintenance
+            columns = [m.maintenance_id, *[getattr(m, c) for c in MAINTENANCE_EXTRAS]]
+            pending, commits = self._pending, self._commits
+            self._pending, self._commits = set(), 0
+            part = self.parts.get(kind)
+            if part is not None and version - self.versions[kind] == commits:
+                if pending:
+                    part.apply(pending, (await db.execute(select(*columns).where(m.maintenance_id.in_(list(pending))))).all())
+                self.versions[kind] = version
+                return
+            started = time.perf_counter()
+            rows = (await db.execute(select(*columns).order_by(m.maintenance_id))).all()
+            part = MaintenanceIndex(rows)
+        else:
+            started = time.perf_counter()
+            model, key, extras = ASSETS[kind]
+            columns = [getattr(model, key), *[getattr(model, c) for c in extras]]
+            rows = (await db.execute(select(*columns).order_by(getattr(model, key)))).all()
+            part = AssetIndex(kind, rows)
+        self.parts[kind], self.versions[kind] = part, version
+        logging.info(
+            f"✅ Search index for {TABLES[kind]} rebuilt: {len(rows)} rows "
+            f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+
+index = SearchIndex()
+
+async def search(db, q: str, kinds: list, limit: int, after: tuple = None) -> list:
+    # Up to limit hits in (score desc, kind, id) order, starting after the cursor key
+    query = SearchQuery.parse(q)
+    if db.get_bind().dialect.name == "postgresql":
+        hits = await _search_sql(db, query, kinds, limit, after)
+    else:
+        parts = await index.current(db, kinds)
+        hits = [hit for kind in kinds for hit in parts[kind].search(query, limit, after)]
+    return sorted(hits, key=lambda hit: hit.key)[:limit]
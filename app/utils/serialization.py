@@ -0,0 +1,36 @@
+import orjson
+from fastapi import Response
+
+# Fast path for large list responses: rows are read as column tuples, shaped into plain dicts
+# that already match the response schema, and encoded straight to JSON bytes. Returning a
+# Response makes FastAPI skip response_model validation, so the shape must be right here.
+
+def records(result) -> list:
+    # Result of a column select -> list of dicts keyed by column name
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+def attach_children(parents: list, key: str, name: str, children: list):
+    # Nests children under their parent in one pass; every parent gets a list, possibly empty
+    grouped = {}
+    for parent in parents:
+        parent[name] = grouped.setdefault(parent[key], [])
+    for child in children:
+        grouped[child[key]].append(child)
+    return parents
+
+def attach_parent(children: list, key: str, name: str, parents: list):
+    # Embeds each child's parent object (None when the child has no parent)
+    by_key = {parent[key]: parent for parent in parents}
+    for child in children:
+        child[name] = by_key.get(child[key])
+    return children
+
+def json_response(payload, template: Response = None) -> Response:
+    # template is the endpoint's injected Response; headers set on it (e.g. X-Next-Cursor) are carried over
+    response = Response(content=orjson.dumps(payload), media_type="application/json")
+    if template is not None:
+        for name, value in template.headers.items():
+            if name not in ("content-length", "content-type"):
+                response.headers[name] = value
+    return response
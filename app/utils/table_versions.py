@@ -0,0 +1,107 @@
+import hashlib
+import os
+import time
+from contextvars import ContextVar
+from datetime import date, datetime, timezone
+from email.utils import format_datetime
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models import models
+from app.utils.utils import dialect_insert
+
+# How stale a worker's view of other workers' writes may get; its own writes show up immediately
+REFRESH_SECONDS = float(os.getenv("TABLE_VERSION_REFRESH_SECONDS", "1"))
+
+class VersionSnapshot:
+    # Per-process copy of table_versions, re-read at most every REFRESH_SECONDS
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._versions = {}  # table -> (version, updated_at)
+        self._loaded_at = None
+
+    def expire(self):
+        self._loaded_at = None
+
+    async def current(self) -> dict:
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds:
+            # Imported here: app.database is only needed once a request asks for versions
+            from app.database import AsyncSessionLocal
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(select(models.TableVersion))).scalars().all()
+            self._versions = {row.table_name: (row.version, row.updated_at) for row in rows}
+            self._loaded_at = time.monotonic()
+        return self._versions
+
+snapshot = VersionSnapshot(REFRESH_SECONDS)
+
+# Counters the running request is answered at, set by conditional(); see pinned()
+_request_versions = ContextVar("request_versions", default=None)
+
+def _versions_query(tables):
+    return select(models.TableVersion.table_name, models.TableVersion.version).where(
+        models.TableVersion.table_name.in_(tables)
+    )
+
+def read(db: Session, tables) -> tuple:
+    # Current counters of tables, in order; 0 for a table nothing has written yet
+    found = dict(db.execute(_versions_query(tables)).all())
+    return tuple(found.get(table, 0) for table in tables)
+
+async def read_async(db: AsyncSession, tables) -> tuple:
+    found = dict((await db.execute(_versions_query(tables))).all())
+    return tuple(found.get(table, 0) for table in tables)
+
+def pinned(tables):
+    # The counters conditional() built this request's ETag from, or None outside such a route.
+    # Cached bodies are keyed by them, so a tag never goes out with a body older than it.
+    versions = _request_versions.get()
+    if versions is None:
+        return None
+    return tuple(versions.get(table, (0, None))[0] for table in tables)
+
+def bump(db: Session, *tables):
+    # Call inside the write transaction, before commit. The counters commit or roll back with
+    # the data, and this process drops its snapshot once the commit lands.
+    tables = sorted(set(tables))
+    if not tables:
+        return
+    now = datetime.utcnow()
+    stmt = dialect_insert(db, models.TableVersion)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["table_name"],
+            set_={"version": models.TableVersion.version + 1, "updated_at": stmt.excluded["updated_at"]},
+        ),
+        [{"table_name": table, "version": 1, "updated_at": now} for table in tables],
+    )
+    event.listen(db, "after_commit", lambda session: snapshot.expire(), once=True)
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison (RFC 9110 13.1.2)
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in tags)
+
+def conditional(*tables):
+    # Route dependency: ETag / Last-Modified from the versions of the tables a response reads,
+    # and a bodyless 304 for a matching If-None-Match before the endpoint runs any query.
+    # Use it in the route decorator's dependencies=[...] so it resolves first.
+    async def dependency(request: Request, response: Response):
+        versions = await snapshot.current()
+        _request_versions.set(versions)
+        # The URL keeps tags distinct per representation; today's date is part of the tag
+        # because several responses are relative to today
+        state = [f"{table}:{versions.get(table, (0, None))[0]}" for table in sorted(tables)]
+        parts = [str(request.url.path), str(request.url.query), *state, date.today().isoformat()]
+        digest = hashlib.sha1("|".join(parts).encode()).hexdigest()[:20]
+        headers = {"ETag": f'W/"{digest}"', "Cache-Control": "no-cache"}
+        modified = [versions[t][1] for t in tables if t in versions and versions[t][1]]
+        if modified:
+            headers["Last-Modified"] = format_datetime(max(modified).replace(tzinfo=timezone.utc), usegmt=True)
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, headers["ETag"]):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+    return dependency
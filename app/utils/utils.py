@@ -1,6 +1,21 @@
 from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
 
-def ensure_exists(db, model, key_field: str, value: str, entity_name: str):
-    if not db.query(model).filter(getattr(model, key_field) == value).first():
-        raise HTTPException(status_code=400, detail=f"❌ {entity_name} '{value}' does not exist.")
+# SQLSTATE for a foreign key violation (psycopg2 exposes pgcode, asyncpg sqlstate)
+FOREIGN_KEY_VIOLATION = "23503"
+
+def integrity_http_error(error: IntegrityError, duplicate: str, missing: str = None) -> HTTPException:
+    # Maps a constraint violation from a single-statement write onto the API's 400 responses;
+    # anything other than a missing parent is reported as a duplicate key
+    orig = error.orig
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    if missing and (code == FOREIGN_KEY_VIOLATION or "FOREIGN KEY" in str(orig)):
+        return HTTPException(status_code=400, detail=missing)
+    return HTTPException(status_code=400, detail=duplicate)
+
+def dialect_insert(db, model):
+    # INSERT construct that supports ON CONFLICT for the bound backend
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
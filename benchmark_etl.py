@@ -0,0 +1,121 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+KINDS = ["sites", "turbines", "blades", "maintenance"]
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Time every ETL loader on a synthetic fleet. Drops and recreates all tables on the target DB."
+    )
+    parser.add_argument("--scale", type=float, default=10, help="multiple of the sample data size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", default=None, help="reuse generated CSVs instead of writing new ones")
+    parser.add_argument("--db-url", default=None, help="target database (default: throwaway SQLite file)")
+    parser.add_argument("--modes", default="bulk,stream,incremental", help="comma list of row,bulk,stream,incremental")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="chunk size for stream mode")
+    parser.add_argument("--baseline", default=None, help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown before failing")
+    parser.add_argument("--save", default=None, help="write this run's results as JSON (e.g. a new baseline)")
+    return parser.parse_args()
+
+def count_rows(path: str) -> int:
+    with open(path, "rb") as fh:
+        return max(sum(1 for _ in fh) - 1, 0)
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix="blade_bench_")
+    # app.database builds its engine from DATABASE_URL at import time
+    os.environ["DATABASE_URL"] = args.db_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    from sqlalchemy import event
+    from app import database
+    from app.utils import etl
+    from app.utils.datagen import FILE_NAMES, generate_fleet
+
+    data_dir = args.data_dir or os.path.join(workdir, "data")
+    if not args.data_dir:
+        generate_fleet(data_dir, scale=args.scale, seed=args.seed, end_date=date(2025, 6, 30))
+    paths = {kind: os.path.join(data_dir, FILE_NAMES[kind]) for kind in KINDS}
+
+    row_loaders = {
+        "sites": etl.load_sites,
+        "turbines": etl.load_turbines,
+        "blades": etl.load_blades,
+        "maintenance": etl.load_maintenance,
+    }
+    loaders = {
+        "row": lambda kind, path, db: row_loaders[kind](path, db),
+        "bulk": lambda kind, path, db: etl.bulk_load(kind, path, db),
+        "stream": lambda kind, path, db: etl.stream_load(kind, path, db, chunksize=args.chunksize),
+        "incremental": lambda kind, path, db: etl.incremental_load(kind, path, db),
+    }
+
+    queries = {"count": 0}
+
+    @event.listens_for(database.engine, "before_cursor_execute")
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        queries["count"] += 1
+
+    results = []
+    for mode in args.modes.split(","):
+        database.Base.metadata.drop_all(bind=database.engine)
+        database.Base.metadata.create_all(bind=database.engine)
+        db = database.SessionLocal()
+        try:
+            for kind in KINDS:
+                rows = count_rows(paths[kind])
+                queries["count"] = 0
+                tracemalloc.start()
+                started = time.perf_counter()
+                loaders[mode](kind, paths[kind], db)
+                seconds = time.perf_counter() - started
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                results.append({
+                    "mode": mode,
+                    "kind": kind,
+                    "rows": rows,
+                    "seconds": round(seconds, 4),
+                    "rows_per_s": round(rows / seconds if seconds else 0, 1),
+                    "peak_mb": round(peak / 1e6, 2),
+                    "queries": queries["count"],
+                })
+        finally:
+            db.close()
+
+    print(f"{'mode':<12}{'loader':<13}{'rows':>10}{'seconds':>10}{'rows/s':>12}{'peak MB':>10}{'queries':>10}")
+    for r in results:
+        print(f"{r['mode']:<12}{r['kind']:<13}{r['rows']:>10}{r['seconds']:>10}{r['rows_per_s']:>12}{r['peak_mb']:>10}{r['queries']:>10}")
+
+    if args.save:
+        with open(args.save, "w") as fh:
+            json.dump({"scale": args.scale, "seed": args.seed, "results": results}, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = {(r["mode"], r["kind"]): r for r in json.load(fh)["results"]}
+        failures = []
+        for r in results:
+            base = baseline.get((r["mode"], r["kind"]))
+            if not base:
+                continue
+            if r["rows_per_s"] < base["rows_per_s"] * (1 - args.tolerance):
+                failures.append(f"{r['mode']}/{r['kind']}: {r['rows_per_s']} rows/s vs baseline {base['rows_per_s']}")
+            if r["queries"] > base["queries"] * (1 + args.tolerance):
+                failures.append(f"{r['mode']}/{r['kind']}: {r['queries']} queries vs baseline {base['queries']}")
+        if failures:
+            print("❌ Regressions against baseline:")
+            for failure in failures:
+                print(f"  - {failure}")
+            sys.exit(1)
+        print("✅ No regressions against baseline")
+
+if __name__ == "__main__":
+    main()
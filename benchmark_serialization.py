@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+KINDS = ["sites", "turbines", "blades", "maintenance"]
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare the ORM + pydantic list serialization with the column-tuple + orjson path on a "
+                    "synthetic fleet. Fails if the two produce different JSON. Drops and recreates all tables on the target DB."
+    )
+    parser.add_argument("--scale", type=float, default=20, help="multiple of the sample data size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db-url", default=None, help="target database (default: throwaway SQLite file)")
+    parser.add_argument("--limit", type=int, default=1000, help="page size requested from each list endpoint")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per path (median is reported)")
+    return parser.parse_args()
+
+def timed(fn, repeat: int):
+    timings, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix="blade_serial_")
+    # app.database builds its engine from DATABASE_URL at import time
+    os.environ["DATABASE_URL"] = args.db_url or f"sqlite:///{os.path.join(workdir, 'serial.db')}"
+
+    from pydantic import TypeAdapter
+    from app import database
+    from app.crud import async_crud
+    from app.schemas import schemas
+    from app.utils import etl
+    from app.utils.datagen import FILE_NAMES, generate_fleet
+    from app.utils.serialization import json_response
+
+    data_dir = os.path.join(workdir, "data")
+    generate_fleet(data_dir, scale=args.scale, seed=args.seed, end_date=date(2025, 6, 30))
+    database.Base.metadata.drop_all(bind=database.engine)
+    database.Base.metadata.create_all(bind=database.engine)
+    db = database.SessionLocal()
+    try:
+        for kind in KINDS:
+            etl.bulk_load(kind, os.path.join(data_dir, FILE_NAMES[kind]), db)
+    finally:
+        db.close()
+
+    limit = args.limit
+    # endpoint -> (schema, ORM reader, fast reader)
+    cases = {
+        "/sites": (schemas.SiteResponse, lambda s: async_crud.get_sites(s, limit=limit),
+                   lambda s: async_crud.get_site_rows(s, limit=limit)),
+        "/turbines": (schemas.TurbineResponse, lambda s: async_crud.get_turbines(s, limit=limit),
+                      lambda s: async_crud.get_turbine_rows(s, limit=limit)),
+        "/blades": (schemas.BladeResponse, lambda s: async_crud.get_blades(s, limit=limit, with_maintenance=True),
+                    lambda s: async_crud.get_blade_rows(s, limit=limit)),
+        "/maintenance": (schemas.MaintenanceResponse, lambda s: async_crud.get_maintenance_records(s, limit=limit),
+                         lambda s: async_crud.get_maintenance_rows(s, limit=limit)),
+    }
+
+    async def run():
+        results, mismatches = [], []
+        for url, (schema, orm_reader, fast_reader) in cases.items():
+            adapter = TypeAdapter(list[schema])
+
+            async def fetch(reader):
+                async with database.AsyncSessionLocal() as session:
+                    return await reader(session)
+
+            def orm_encode(objects):
+                # What a response_model endpoint does: validate from attributes, dump, json.dumps
+                return json.dumps(adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json")).encode()
+
+            phases = {}
+            for name, reader, encode in (
+                ("orm", orm_reader, orm_encode),
+                ("fast", fast_reader, lambda rows: json_response(rows).body),
+            ):
+                fetch_ms, rows = [], None
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    rows = await fetch(reader)
+                    fetch_ms.append((time.perf_counter() - started) * 1000)
+                encode_ms, body = timed(lambda: encode(rows), args.repeat)
+                phases[name] = {"fetch_ms": statistics.median(fetch_ms), "encode_ms": encode_ms, "body": body, "rows": len(rows)}
+
+            if json.loads(phases["orm"]["body"]) != json.loads(phases["fast"]["body"]):
+                mismatches.append(url)
+            results.append((url, phases))
+        return results, mismatches
+
+    results, mismatches = asyncio.run(run())
+
+    print(f"{'endpoint':<16}{'rows':>7}{'path':>7}{'fetch ms':>11}{'encode ms':>11}{'total ms':>11}{'speedup':>9}")
+    for url, phases in results:
+        orm_total = phases["orm"]["fetch_ms"] + phases["orm"]["encode_ms"]
+        for name in ("orm", "fast"):
+            p = phases[name]
+            total = p["fetch_ms"] + p["encode_ms"]
+            speedup = f"{orm_total / total:.1f}x" if name == "fast" and total else ""
+            print(f"{url:<16}{p['rows']:>7}{name:>7}{p['fetch_ms']:>11.2f}{p['encode_ms']:>11.2f}{total:>11.2f}{speedup:>9}")
+
+    if mismatches:
+        print(f"❌ Fast path output differs from the ORM path for: {', '.join(mismatches)}")
+        sys.exit(1)
+    print("✅ Both paths produce identical JSON")
+
+if __name__ == "__main__":
+    main()
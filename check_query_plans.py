@@ -0,0 +1,294 @@
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+KINDS = ["sites", "turbines", "blades", "maintenance"]
+
+# Tiny by construction; a full scan of these is fine
+SCAN_EXEMPT_TABLES = {
+    "rollup_status_counts",
+    "rollup_issue_counts",
+    "rollup_site_issue_counts",
+    "rollup_technician_status_counts",
+    "etl_checkpoints",
+    "table_versions",
+}
+
+# Streaming dumps and cache counters read everything / nothing on purpose;
+# the bundle only re-runs the widget endpoints checked individually; /search needs q (added below)
+SKIPPED_PREFIXES = ("/export", "/api/dashboard/cache-stats", "/api/dashboard/bundle", "/search")
+
+# maintenance partitions (manage_partitions.py) map back to their table
+PARTITION_OF = re.compile(r"^maintenance_(y\d{4}|undated)$")
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="EXPLAIN every SQL statement the GET routes run on a synthetic fleet. "
+                    "Fails on sequential scans of data tables and on latency regressions. "
+                    "Drops and recreates all tables on the target DB."
+    )
+    parser.add_argument("--scale", type=float, default=20, help="multiple of the sample data size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db-url", default=None, help="target database (default: throwaway SQLite file)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed calls per route (median is reported)")
+    parser.add_argument("--baseline", default=None, help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative slowdown before failing")
+    parser.add_argument("--save", default=None, help="write this run's results as JSON (e.g. a new baseline)")
+    parser.add_argument("--partitioned", action="store_true",
+                        help="partition maintenance by year first (PostgreSQL) and smoke-test archive/restore")
+    return parser.parse_args()
+
+def sample_urls(app, db) -> list:
+    from sqlalchemy import func, select
+    from app.models import models
+    from app.utils.pagination import DEFAULT_PAGE_SIZE, encode_cursor
+    from app.utils.search import SearchQuery
+
+    site_id = db.scalar(
+        select(models.Turbine.site_id).group_by(models.Turbine.site_id).order_by(func.count().desc()).limit(1)
+    )
+    turbine_id = db.scalar(select(models.Turbine.turbine_id).where(models.Turbine.site_id == site_id).limit(1))
+    blade_id = db.scalar(
+        select(models.Maintenance.blade_id).group_by(models.Maintenance.blade_id).order_by(func.count().desc()).limit(1)
+    )
+    technician = db.scalar(select(models.Maintenance.technician).where(models.Maintenance.technician.isnot(None)).limit(1))
+    path_values = {"site_id": site_id, "turbine_id": turbine_id, "blade_id": blade_id, "technician_name": technician}
+
+    urls = []
+    for path, operations in app.openapi()["paths"].items():
+        if "get" not in operations or path.startswith(SKIPPED_PREFIXES):
+            continue
+        url = re.sub(r"{(\w+)}", lambda match: str(path_values[match.group(1)]), path)
+        # Unpaged lists return the whole table by design; check them at one page
+        limit = [p for p in operations["get"].get("parameters", []) if p["name"] == "limit"]
+        if limit and "default" not in limit[0]["schema"]:
+            url += f"?limit={DEFAULT_PAGE_SIZE}"
+        urls.append(url)
+
+    # Filtered variants of the list endpoints
+    urls += [
+        f"/turbines?site_id={site_id}",
+        f"/blades?turbine_id={turbine_id}",
+        f"/blades?site_id={site_id}",
+        "/sites?include=turbines",
+        "/turbines?fields=model&include=blades,site",
+        "/blades?fields=type&include=maintenance,turbine",
+        "/maintenance?status=Pending",
+        f"/maintenance?technician={technician}",
+        f"/maintenance?blade_id={blade_id}",
+        f"/maintenance?site_id={site_id}",
+        f"/maintenance?date_from={date(2024, 1, 1)}&date_to={date(2024, 3, 31)}",
+        f"/api/technician/all-maintenance?technician={technician}",
+        f"/api/technician/technicians/{technician}/profile?date_from={date(2024, 1, 1)}&date_to={date(2024, 12, 31)}",
+        f"/api/technician/technicians/profiles?date_from={date(2024, 1, 1)}",
+        f"/api/hierarchy/rollup?level=turbine&site_id={site_id}",
+        f"/api/dashboard/blades-due?site_id={site_id}",
+        f"/api/dashboard/priority?site_id={site_id}",
+        f"/api/hierarchy/rollup?level=blade&turbine_id={turbine_id}",
+        f"/api/dashboard/trends?date_from={date(2025, 1, 1)}",
+        f"/api/dashboard/recurring-issues?date_from={date(2025, 1, 1)}",
+        f"/api/dashboard/problem-blades?date_from={date(2025, 1, 1)}",
+        f"/api/technician/technicians/{technician}/issues?date_from={date(2025, 1, 1)}",
+        f"/blades/{blade_id}/maintenance?date_from={date(2025, 1, 1)}",
+    ]
+    # /search needs q. Each kind runs asset_query or maintenance_query on PostgreSQL, unpaged and
+    # after a cursor; the in-process index of other backends only gets the status check.
+    issue = db.scalar(select(models.Maintenance.issue).where(models.Maintenance.issue.isnot(None)).limit(1))
+    word = issue.split()[0]
+    urls += [
+        f"/search?q={blade_id[:-2]}",
+        f"/search?q={blade_id}",
+        f"/search?q={site_id[:-1]}&kind=site",
+        f"/search?q={turbine_id[:-1]}&kind=turbine",
+        f"/search?q={word}&kind=maintenance",
+        f"/search?q={technician.split()[0]}",
+        f"/search?q={blade_id[:-2]}&kind=blade&after={encode_cursor([SearchQuery.parse(blade_id[:-2]).prefix_score, 'blade', blade_id])}",
+        f"/search?q={word}&after={encode_cursor([2, 'maintenance', 1])}",
+    ]
+    return urls
+
+def archive_round_trip(db, directory: str) -> list:
+    # Archives every year before the newest to the archive table and then to files, restoring
+    # each time; the rows must come back unchanged and manage_partitions.py verify must pass
+    # after every step. Returns failures.
+    from sqlalchemy import select
+    from app.models import models
+    from app.utils import partitions
+
+    m = models.Maintenance
+
+    def rows():
+        return db.execute(
+            select(m.maintenance_id, m.blade_id, m.date, m.status, m.issue, m.technician).order_by(m.maintenance_id)
+        ).all()
+
+    def check(step: str):
+        return [f"archive round trip, after {step}: {problem}" for problem in partitions.verify(db, directory)]
+
+    original = rows()
+    newest = max(row.date for row in original if row.date)
+    failures = check("partitioning" if partitions.is_partitioned(db) else "loading")
+    for to_file in (False, True):
+        where = "files" if to_file else partitions.ARCHIVE_TABLE
+        moved = partitions.archive(db, newest.year, to_file=to_file, directory=directory)
+        if not moved:
+            failures.append(f"archive round trip: nothing archived to {where}")
+        failures += check(f"archiving to {where}")
+        for year in moved:
+            partitions.restore(db, year, directory=directory)
+        failures += check(f"restoring from {where}")
+        if rows() != original:
+            failures.append(f"archive round trip: rows changed after archiving to and restoring from {where}")
+    return failures
+
+def plan_scans(conn, dialect: str, statement: str, parameters) -> tuple:
+    # Returns (plan text, tables read by a sequential scan)
+    if dialect == "postgresql":
+        # With seq scans priced out, any Seq Scan left in the plan has no usable index
+        conn.exec_driver_sql("SET enable_seqscan = off")
+        plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+        conn.exec_driver_sql("RESET enable_seqscan")
+        scans, nodes = set(), [plan[0]["Plan"]]
+        while nodes:
+            node = nodes.pop()
+            if node["Node Type"] == "Seq Scan":
+                # Yearly partitions count as the table they belong to
+                scans.add(PARTITION_OF.sub("maintenance", node["Relation Name"]))
+            nodes.extend(node.get("Plans", []))
+        return json.dumps(plan, indent=1), scans
+
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+    details = [row[-1] for row in rows]
+    # A bare SCAN of a rowid table walks it in primary-key order; under a LIMIT with no
+    # sort step that is the same early-stopping read an index scan would do
+    walks_pk_in_order = " LIMIT " in statement and not any("TEMP B-TREE" in d for d in details)
+    scans = set()
+    for detail in details:
+        match = re.match(r"SCAN (\w+)", detail)
+        if match and "USING" not in detail and not walks_pk_in_order:
+            scans.add(match.group(1))
+    return "\n".join(details), scans
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix="blade_plans_")
+    # app.database builds its engine from DATABASE_URL at import time
+    os.environ["DATABASE_URL"] = args.db_url or f"sqlite:///{os.path.join(workdir, 'plans.db')}"
+
+    from sqlalchemy import event
+    from fastapi.testclient import TestClient
+    from app import database
+    from app.main import app
+    from app.utils import etl, partitions
+    from app.utils.cache import result_cache
+    from app.utils.datagen import FILE_NAMES, generate_fleet
+
+    engine = database.engine
+    dialect = engine.dialect.name
+    tables = set(database.Base.metadata.tables) - SCAN_EXEMPT_TABLES
+
+    data_dir = os.path.join(workdir, "data")
+    generate_fleet(data_dir, scale=args.scale, seed=args.seed, end_date=date(2025, 6, 30))
+    database.Base.metadata.drop_all(bind=engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {partitions.ARCHIVE_TABLE}")
+    database.Base.metadata.create_all(bind=engine)
+    db = database.SessionLocal()
+    try:
+        for kind in KINDS:
+            etl.bulk_load(kind, os.path.join(data_dir, FILE_NAMES[kind]), db)
+        setup_failures = []
+        if args.partitioned:
+            if dialect == "postgresql":
+                partitions.partition_table(db)
+                db.commit()
+            else:
+                print(f"⚠️ Partitioning needs PostgreSQL; smoke-testing archive/restore on the plain {dialect} table")
+            setup_failures = archive_round_trip(db, os.path.join(workdir, "archive"))
+        urls = sample_urls(app, db)
+    finally:
+        db.close()
+    if dialect == "postgresql":
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+
+    captured = []
+    capturing = {"on": False}
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if capturing["on"] and not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    # Routes run on both the sync engine and the async one
+    for target in (engine, database.get_async_engine().sync_engine):
+        event.listen(target, "before_cursor_execute", capture)
+
+    results, failures = [], setup_failures
+    # One client for the whole run keeps the async engine's pool on a single event loop
+    with TestClient(app, raise_server_exceptions=False) as client:
+        for url in urls:
+            result_cache.clear()
+            captured.clear()
+            capturing["on"] = True
+            response = client.get(url)
+            capturing["on"] = False
+            if response.status_code != 200:
+                failures.append(f"{url}: HTTP {response.status_code}")
+                continue
+            statements = list(dict.fromkeys((s, json.dumps(p, default=str)) for s, p in captured))
+
+            timings = []
+            for _ in range(args.repeat):
+                result_cache.clear()
+                started = time.perf_counter()
+                client.get(url)
+                timings.append((time.perf_counter() - started) * 1000)
+
+            seq_scans = set()
+            # Other backends build the search index by reading whole tables on purpose
+            planned = captured if dialect == "postgresql" or not url.startswith("/search") else []
+            with engine.connect() as conn:
+                for statement, parameters in planned:
+                    plan, scans = plan_scans(conn, dialect, statement, parameters)
+                    scans &= tables
+                    if scans:
+                        seq_scans |= scans
+                        failures.append(f"{url}: sequential scan of {', '.join(sorted(scans))}\n{statement.strip()}\n{plan}")
+            results.append({
+                "url": url,
+                "statements": len(statements),
+                "median_ms": round(statistics.median(timings), 2),
+                "seq_scans": sorted(seq_scans),
+            })
+
+    print(f"{'route':<70}{'queries':>9}{'median ms':>12}  seq scans")
+    for r in results:
+        print(f"{r['url']:<70}{r['statements']:>9}{r['median_ms']:>12}  {', '.join(r['seq_scans']) or '-'}")
+
+    if args.save:
+        with open(args.save, "w") as fh:
+            json.dump({"scale": args.scale, "seed": args.seed, "dialect": dialect, "results": results}, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = {r["url"]: r for r in json.load(fh)["results"]}
+        for r in results:
+            base = baseline.get(r["url"])
+            if base and r["median_ms"] > base["median_ms"] * (1 + args.tolerance):
+                failures.append(f"{r['url']}: {r['median_ms']} ms vs baseline {base['median_ms']} ms")
+
+    if failures:
+        print("❌ Query plan check failed:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("✅ All route queries use indexes")
+
+if __name__ == "__main__":
+    main()
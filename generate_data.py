@@ -0,0 +1,15 @@
+import argparse
+from datetime import date
+from app.utils.datagen import generate_fleet
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic fleet in the four source CSV schemas")
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--scale", type=float, default=10, help="multiple of the sample data size (e.g. 10, 100, 1000)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None, help="latest maintenance date (default: today)")
+    args = parser.parse_args()
+
+    paths = generate_fleet(args.out, scale=args.scale, seed=args.seed, end_date=args.end_date)
+    for kind, path in paths.items():
+        print(f"✅ {kind}: {path}")
@@ -0,0 +1,69 @@
+import argparse
+import sys
+from app.database import Base, SessionLocal, engine
+from app.utils import partitions
+
+def main():
+    parser = argparse.ArgumentParser(description="Yearly partitions and archival of maintenance history")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("partition", help="convert maintenance to yearly range partitions (PostgreSQL, one-off)")
+    create = commands.add_parser("create", help="add yearly partitions ahead of time (PostgreSQL)")
+    create.add_argument("years", type=int, nargs="+")
+    listing = commands.add_parser("list", help="row counts per year: live, archive table, archive files")
+    listing.add_argument("--dir", default=partitions.ARCHIVE_DIR, help="archive file directory")
+    archive = commands.add_parser("archive", help="move every year before --before out of the live table")
+    archive.add_argument("--before", type=int, required=True, help="first year to keep live")
+    archive.add_argument("--to", choices=["table", "file"], default="table",
+                         help=f"table: {partitions.ARCHIVE_TABLE} (default); file: one gzipped CSV per year")
+    archive.add_argument("--dir", default=partitions.ARCHIVE_DIR, help="archive file directory")
+    restore = commands.add_parser("restore", help="bring an archived year back into the live table")
+    restore.add_argument("year", type=int)
+    restore.add_argument("--dir", default=partitions.ARCHIVE_DIR, help="archive file directory")
+    verify = commands.add_parser("verify", help="check keys, current partitions, rollups and live/archive overlap")
+    verify.add_argument("--dir", default=partitions.ARCHIVE_DIR, help="archive file directory")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if args.command in ("partition", "create") and engine.dialect.name != "postgresql":
+            sys.exit(f"❌ Partitioning needs PostgreSQL; on {engine.dialect.name} use archive/restore only.")
+        if args.command == "partition":
+            if partitions.is_partitioned(db):
+                sys.exit("⚠️ maintenance is already partitioned.")
+            print("🔄 Copying maintenance into yearly partitions...")
+            count = partitions.partition_table(db)
+            db.commit()
+            print(f"✅ maintenance partitioned: {count} rows in {len(partitions.partitions(db))} yearly partitions")
+        elif args.command == "create":
+            if not partitions.is_partitioned(db):
+                sys.exit("❌ maintenance is not partitioned; run `partition` first.")
+            created = partitions.ensure_partitions(db, args.years)
+            db.commit()
+            print(f"✅ Created partitions: {', '.join(map(str, created)) or 'none needed'}")
+        elif args.command == "list":
+            for where, year, rows in partitions.summary(db, args.dir):
+                print(f"{where:<15}{year or 'undated':>8}  {rows}")
+        elif args.command == "archive":
+            moved = partitions.archive(db, args.before, to_file=args.to == "file", directory=args.dir)
+            for year, rows in moved.items():
+                print(f"📦 {year}: {rows} rows -> {partitions.archive_file(args.dir, year) if args.to == 'file' else partitions.ARCHIVE_TABLE}")
+            print(f"✅ Archived {sum(moved.values())} rows; rollups and blade state rebuilt." if moved else "✅ Nothing to archive.")
+        elif args.command == "restore":
+            rows = partitions.restore(db, args.year, directory=args.dir)
+            print(f"✅ Restored {rows} rows for {args.year}; rollups and blade state rebuilt.")
+        elif args.command == "verify":
+            problems = partitions.verify(db, args.dir)
+            for problem in problems:
+                print(f"❌ {problem}")
+            layout = "partitioned" if partitions.is_partitioned(db) else "not partitioned"
+            if problems:
+                sys.exit(1)
+            print(f"✅ maintenance ({layout}) and its archive are consistent.")
+    except ValueError as e:
+        sys.exit(str(e))
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+from app.database import Base, SessionLocal, engine
+from app.utils import rollups, table_versions
+
+def rebuild_all():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print("🔄 Recomputing dashboard rollups and blade state from maintenance history...")
+        rollups.rebuild(db)
+        # Usually run after hand edits, which bypass the version counters; make clients re-fetch
+        table_versions.bump(db, "sites", "turbines", "blades", "maintenance")
+        db.commit()
+        print("✅ Rollups rebuilt.")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_all()
@@ -1,4 +1,18 @@
-from app.utils.etl import run_all
+import argparse
+from app.utils.etl import run_all, STREAM_CHUNK_SIZE
 
 if __name__ == "__main__":
-    run_all()
+    parser = argparse.ArgumentParser(description="Clean and ingest the blade CSVs")
+    parser.add_argument(
+        "--mode", choices=["row", "bulk", "stream", "incremental", "parallel"], default="row",
+        help="row: per-row merge (default); bulk: set-based upserts; stream: chunked bulk load with resumable checkpoints; "
+             "incremental: apply only inserted/changed/removed rows; parallel: parse every file in a process pool, "
+             "write in FK order",
+    )
+    parser.add_argument("--chunksize", type=int, default=STREAM_CHUNK_SIZE, help="rows per chunk in stream mode")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes in parallel mode (default: CPU count)")
+    parser.add_argument("--data-dir", default=None, help="directory of CSVs for parallel mode (default: app/data)")
+    args = parser.parse_args()
+    timings = run_all(mode=args.mode, chunksize=args.chunksize, workers=args.workers, data_dir=args.data_dir)
+    for t in timings or []:
+        print(f"{t['file']:<40} {t['rows']:>10} rows  parse {t['parse_s']:>7}s  wait {t['wait_s']:>7}s  write {t['write_s']:>7}s")
@@ -0,0 +1,37 @@
+import os
+import sys
+import tempfile
+from datetime import date
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix="blade_tests_")
+sys.path.insert(0, ROOT)
+# app.database builds its engine from DATABASE_URL at import time
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORKDIR, 'test.db')}"
+# Every request re-reads table_versions, so writes from other processes show up at once
+os.environ["TABLE_VERSION_REFRESH_SECONDS"] = "0"
+
+KINDS = ["sites", "turbines", "blades", "maintenance"]
+
+@pytest.fixture(scope="session")
+def data_dir():
+    from app.utils.datagen import generate_fleet
+    path = os.path.join(WORKDIR, "data")
+    generate_fleet(path, scale=1, seed=42, end_date=date(2025, 6, 30))
+    return path
+
+@pytest.fixture(scope="session")
+def client(data_dir):
+    from fastapi.testclient import TestClient
+    from app import database
+    from app.utils import etl
+    from app.utils.datagen import FILE_NAMES
+
+    database.Base.metadata.create_all(bind=database.engine)
+    with database.SessionLocal() as db:
+        for kind in KINDS:
+            etl.bulk_load(kind, os.path.join(data_dir, FILE_NAMES[kind]), db)
+    from app.main import app
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,37 @@
+import pytest
+from pydantic import TypeAdapter
+from app.schemas.schemas import BladeListing, SiteListing, TurbineListing
+
+ROUTES = [
+    ("/sites?limit=5", SiteListing),
+    ("/sites?limit=5&fields=name&include=turbines", SiteListing),
+    ("/turbines?limit=5", TurbineListing),
+    ("/turbines?limit=5&fields=model&include=blades,site", TurbineListing),
+    ("/blades?limit=5", BladeListing),
+    ("/blades?limit=5&fields=type", BladeListing),
+    ("/blades?limit=5&include=maintenance,turbine", BladeListing),
+]
+
+@pytest.mark.parametrize("url, model", ROUTES)
+def test_listing_matches_declared_model(client, url, model):
+    response = client.get(url)
+    assert response.status_code == 200
+    rows = response.json()
+    assert rows
+    TypeAdapter(list[model]).validate_python(rows)
+    # No key the schema does not declare, and the declared type of every embedded object
+    for row in rows:
+        assert set(row) <= set(model.model_fields)
+        for name, value in row.items():
+            annotation = model.model_fields[name].annotation
+            nested = getattr(annotation, "__args__", (None,))[0]
+            for item in value if isinstance(value, list) else [value] if isinstance(value, dict) else []:
+                assert set(item) == set(nested.model_fields)
+
+def test_listing_routes_declare_the_sparse_shapes(client):
+    paths = client.get("/openapi.json").json()["paths"]
+    for path, model in (("/sites", "SiteListing"), ("/sites/{site_id}/turbines", "TurbineListing"),
+                        ("/turbines", "TurbineListing"), ("/turbines/{turbine_id}/blades", "BladeListing"),
+                        ("/blades", "BladeListing")):
+        schema = paths[path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert schema["items"]["$ref"].endswith(model)
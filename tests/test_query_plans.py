@@ -0,0 +1,13 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_every_get_route_answers_and_uses_indexes():
+    # The script builds its own throwaway database, so it runs in a fresh interpreter
+    result = subprocess.run(
+        [sys.executable, "check_query_plans.py", "--scale", "1", "--repeat", "1"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout[-4000:] + result.stderr[-4000:]
@@ -0,0 +1,78 @@
+from sqlalchemy import select
+from app import database
+from app.models import models
+from app.utils import search
+from app.utils.search import AssetIndex, Hit, MaintenanceIndex, SearchQuery, cursor_key
+
+def _page(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.json(), response.headers.get("X-Next-Cursor")
+
+def _maintenance_rows(ids_and_issues):
+    return [(i, "B1", issue, "Tech A", "Pending", None) for i, issue in ids_and_issues]
+
+def test_asset_before_maintenance_at_equal_score():
+    hits = [Hit(3, "maintenance", 1, {}), Hit(3, "blade", "B1X", {}), Hit(4, "maintenance", 2, {})]
+    assert [hit.kind for hit in sorted(hits, key=lambda hit: hit.key)] == ["maintenance", "blade", "maintenance"]
+
+    # After a blade cursor, maintenance hits of the same score are still ahead
+    index = MaintenanceIndex(_maintenance_rows([(1, "crack"), (2, "crack")]))
+    after = cursor_key([2, "blade", "B1X"])
+    assert [hit.id for hit in index.search(SearchQuery.parse("crack"), 10, after)] == [1, 2]
+
+def test_exact_id_above_prefix_match(client):
+    blade = client.get("/blades?limit=1").json()[0]
+    longer = {**blade, "blade_id": blade["blade_id"] + "X"}
+    assert client.post("/blades", json={k: longer[k] for k in ("blade_id", "turbine_id", "type", "length")}).status_code == 200
+
+    hits, _ = _page(client, f"/search?q={blade['blade_id'].lower()}&kind=blade")
+    assert [hit["id"] for hit in hits[:2]] == [blade["blade_id"], longer["blade_id"]]
+    query = SearchQuery.parse(blade["blade_id"])
+    assert [hit["score"] for hit in hits[:2]] == [query.exact_score, query.prefix_score]
+
+    index = AssetIndex("blade", [("B1", "T1", "x"), ("B10", "T1", "x"), ("B11", "T1", "x")])
+    assert [hit.id for hit in index.search(SearchQuery.parse("B1"), 10, None)] == ["B1", "B10", "B11"]
+
+def test_cursor_order(client):
+    # 'T' matches turbine IDs by prefix and every "Tech ..." technician by word
+    everything, cursor = _page(client, "/search?q=T&limit=1000")
+    assert cursor is None
+    assert {hit["kind"] for hit in everything} == {"turbine", "maintenance"}
+    keys = [(-hit["score"], search.KINDS.index(hit["kind"]), hit["id"]) for hit in everything]
+    assert keys == sorted(keys)
+
+    paged, cursor = _page(client, "/search?q=T&limit=37")
+    while cursor:
+        page, cursor = _page(client, f"/search?q=T&limit=37&after={cursor}")
+        paged += page
+    assert paged == everything
+
+def test_local_writes_apply_to_the_index_in_place(client):
+    first, _ = _page(client, "/search?q=Tech&kind=maintenance&limit=1")
+    part = search.index.parts["maintenance"]
+    maintenance_id = first[0]["id"]
+    assert client.put(f"/maintenance/{maintenance_id}", json={"issue": "Zyzzyva Crack"}).status_code == 200
+
+    hits, _ = _page(client, "/search?q=zyzz&kind=maintenance")
+    assert [(hit["id"], hit["issue"]) for hit in hits] == [(maintenance_id, "Zyzzyva Crack")]
+    assert search.index.parts["maintenance"] is part
+
+    # Same answers as an index built from scratch
+    m = models.Maintenance
+    with database.SessionLocal() as db:
+        rebuilt = MaintenanceIndex(db.execute(
+            select(m.maintenance_id, *[getattr(m, c) for c in search.MAINTENANCE_EXTRAS]).order_by(m.maintenance_id)
+        ).all())
+    for q in ("zyzz", "crack tech", "erosion"):
+        query = SearchQuery.parse(q)
+        assert part.search(query, 1000, None) == rebuilt.search(query, 1000, None)
+
+def test_apply_adds_changes_and_removes_rows():
+    index = MaintenanceIndex(_maintenance_rows([(1, "crack"), (3, "erosion")]))
+    index.apply({1, 2, 3}, _maintenance_rows([(1, "wear"), (2, "crack")]))
+    assert [hit.id for hit in index.search(SearchQuery.parse("crack"), 10, None)] == [2]
+    assert [hit.id for hit in index.search(SearchQuery.parse("wear"), 10, None)] == [1]
+    assert index.search(SearchQuery.parse("erosion"), 10, None) == []
+    # Positions are no longer in id order; results still are
+    assert [hit.id for hit in index.search(SearchQuery.parse("tech"), 10, None)] == [1, 2]
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+from conftest import ROOT
+
+# Runs in a separate interpreter, like an ETL job next to the API workers: nothing it does reaches
+# this process's result cache or version snapshot.
+OUTSIDE_WRITE = """
+from sqlalchemy import select
+from app.database import SessionLocal
+from app.models import models
+from app.utils import rollups, table_versions
+
+with SessionLocal() as db:
+    row = db.scalars(
+        select(models.Maintenance).where(models.Maintenance.technician != "Outside Writer").limit(1)
+    ).one()
+    old = rollups.maintenance_snapshot(row)
+    row.technician = "Outside Writer"
+    rollups.apply_maintenance_delta(db, old, rollups.maintenance_snapshot(row))
+    table_versions.bump(db, "maintenance")
+    db.commit()
+"""
+
+def write_from_outside():
+    subprocess.run([sys.executable, "-c", OUTSIDE_WRITE], cwd=ROOT, env=os.environ, check=True)
+
+def test_conditional_get_after_outside_write(client):
+    url = "/api/dashboard/technician-workload"
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    write_from_outside()
+
+    # Neither the cached body nor the old tag survive the other process's write
+    fresh = client.get(url, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+    assert {"technician": "Outside Writer", "count": 1} in fresh.json()
+    assert client.get(url, headers={"If-None-Match": fresh.headers["ETag"]}).status_code == 304
+
+def test_cached_body_follows_outside_write(client):
+    url = "/api/technician/technicians/Outside Writer/status-counts"
+    before = client.get(url).json()
+    write_from_outside()
+    after = client.get(url).json()
+    assert sum(row["count"] for row in after) == sum(row["count"] for row in before) + 1